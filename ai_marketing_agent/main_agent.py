@@ -1,8 +1,17 @@
+import time
+_AGENT_PROCESS_START = time.perf_counter() # Taken before any other import so the startup report covers them
+
 import os
+import sys
 import yaml
 import random
+import argparse
+import threading
 import importlib # To dynamically load our scripts as modules
-import importlib.util # Required for spec_from_file_location
+import importlib.abc # Loader base class for the timed script loader
+import importlib.util # Required for spec_from_file_location and LazyLoader
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Rich imports for main agent's CLI
 from rich.console import Console
@@ -10,8 +19,10 @@ from rich.panel import Panel
 from rich.text import Text
 from rich.rule import Rule
 from rich.prompt import Confirm
+from rich.table import Table
 
 console = Console()
+_AGENT_IMPORTS_DONE = time.perf_counter()
 
 # --- Configuration ---
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'config/settings.yaml') # Relative to this file's location
@@ -37,33 +48,85 @@ def load_main_config():
 # --- Dynamically Load Agent Scripts as Modules ---
 scripts_dir = os.path.join(os.path.dirname(__file__), 'scripts')
 
-def import_script_module(script_name):
+# Script modules are registered in sys.modules under both their full dotted name and their bare file name,
+# so a script doing `import basic_content_generator` gets the same module object the agent uses.
+if scripts_dir not in sys.path:
+    sys.path.append(scripts_dir)
+
+MODULE_LOAD_STATS = {} # module full name -> {'seconds': float, 'new_imports': [top-level packages], 'error': str or None}
+_module_registry_lock = threading.RLock()
+
+class _TimedScriptLoader(importlib.abc.Loader):
+    """
+    Wraps a script's file loader. Times the real module execution (which is where heavy imports like cv2,
+    google.generativeai or googleapiclient happen), records which new top-level packages it pulled in,
+    and hooks the agent console into the module.
+    """
+    def __init__(self, loader):
+        self.loader = loader
+
+    def create_module(self, spec):
+        return None # Default module creation
+
+    def exec_module(self, module):
+        packages_before = {name.split('.')[0] for name in list(sys.modules)}
+        start_time = time.perf_counter()
+        error = None
+        try:
+            self.loader.exec_module(module)
+        except BaseException as e:
+            error = f"{type(e).__name__}: {e}"
+            # Don't leave a half-initialised module registered; the next import attempt should retry cleanly.
+            for name in (module.__name__, module.__name__.rsplit('.', 1)[-1]):
+                if sys.modules.get(name) is module:
+                    del sys.modules[name]
+            raise
+        finally:
+            packages_after = {name.split('.')[0] for name in list(sys.modules)}
+            MODULE_LOAD_STATS[module.__name__] = {
+                'seconds': time.perf_counter() - start_time,
+                # Only third-party packages are interesting here; stdlib and private extension modules are noise
+                'new_imports': sorted(name for name in packages_after - packages_before - {module.__name__.split('.')[0]} if not name.startswith('_') and name not in sys.stdlib_module_names),
+                'error': error,
+            }
+        if hasattr(module, 'console') and not isinstance(getattr(module, 'console'), Console):
+            module.console = console # Assign the main agent's console
+
+def import_script_module(script_name, lazy=True):
+    """
+    Returns the module for a script in `scripts/`, loading it at most once per process.
+
+    With `lazy=True` (default) the module is registered immediately but its code (and heavy imports) only runs
+    on first attribute access, so steps that are disabled or never reached cost nothing at startup.
+    A failed deferred load raises on that first attribute access, which the workflow steps catch and report.
+    """
+    module_bare_name = script_name.replace('.py', '')
+    module_full_name = f"ai_marketing_agent.scripts.{module_bare_name}"
     try:
-        module_full_name = f"ai_marketing_agent.scripts.{script_name.replace('.py', '')}"
-
-        # Check if already imported (e.g. by another import statement or previous call)
-        if module_full_name in globals(): # More robust check would be sys.modules
-             return globals()[module_full_name] # Or sys.modules[module_full_name]
-
-        module_path = os.path.join(scripts_dir, script_name)
-        spec = importlib.util.spec_from_file_location(module_full_name, module_path)
-
-        if spec and spec.loader:
-            module = importlib.util.module_from_spec(spec)
-            # Before execution, add to sys.modules to handle potential circular dependencies within scripts if any
-            # sys.modules[module_full_name] = module
-            spec.loader.exec_module(module)
-            # Try to set the console instance for unified output
-            if hasattr(module, 'console') and isinstance(getattr(module, 'console'), Console):
-                 # If the module already has its own console, we might not want to overwrite it,
-                 # or we ensure it's a compatible Rich console. For now, let's assume it's fine.
-                 pass # It will use its own console instance.
-            elif hasattr(module, 'console'): # If it has a console attribute but not instance of Rich Console
-                 module.console = console # Assign the main agent's console
-            return module
-        else:
-            console.print(f"[bold red]AGENT ERROR:[/bold red] Could not create spec for script module: {script_name}")
-            return None
+        with _module_registry_lock:
+            # Check if already imported (by a previous call, or by a sibling script's plain `import`)
+            for existing_name in (module_full_name, module_bare_name):
+                if existing_name in sys.modules:
+                    return sys.modules[existing_name]
+
+            module_path = os.path.join(scripts_dir, script_name)
+            if not os.path.isfile(module_path):
+                raise FileNotFoundError(module_path)
+            spec = importlib.util.spec_from_file_location(module_full_name, module_path)
+
+            if spec and spec.loader:
+                timed_loader = _TimedScriptLoader(spec.loader)
+                spec.loader = importlib.util.LazyLoader(timed_loader) if lazy else timed_loader
+                module = importlib.util.module_from_spec(spec)
+                # Register before execution so circular imports between scripts resolve to this module object
+                sys.modules[module_full_name] = module
+                sys.modules[module_bare_name] = module
+                # With LazyLoader this only installs the deferred-load hook; otherwise the script runs now
+                spec.loader.exec_module(module)
+                return module
+            else:
+                console.print(f"[bold red]AGENT ERROR:[/bold red] Could not create spec for script module: {script_name}")
+                return None
     except FileNotFoundError:
         console.print(f"[bold red]AGENT ERROR:[/bold red] Script file not found: {script_name} in {scripts_dir}")
         return None
@@ -71,22 +134,45 @@ def import_script_module(script_name):
         console.print(f"[bold red]AGENT ERROR:[/bold red] Failed to import script module '{script_name}': {e}")
         return None
 
-# --- Main Agent Workflow ---
-def run_agent_workflow():
-    console.print(Panel(" Autonomous AI Marketing Agent for ByBit ", title="[bold blue_violet]Welcome![/bold blue_violet]", style="bold bright_blue", expand=False))
-
-    config = load_main_config()
-    if not config:
-        console.print("[bold red]Agent cannot start without valid configuration. Exiting.[/bold red]")
-        return
-
+def load_module_now(module):
+    """Forces a lazily registered script module to execute. Call before sharing a module across worker threads."""
+    if module is not None:
+        getattr(module, '__name__')
+    return module
+
+def print_startup_report():
+    """Prints how long the agent's own imports and each script module (including its heavy imports) took to load."""
+    table = Table(title="[bold blue]Startup Time Report[/bold blue]", show_lines=True)
+    table.add_column("Component", style="cyan")
+    table.add_column("Seconds", justify="right", no_wrap=True)
+    table.add_column("New third-party imports", style="dim")
+    table.add_row("main_agent imports (yaml, rich, ...)", f"{_AGENT_IMPORTS_DONE - _AGENT_PROCESS_START:.3f}", "")
+    for module_name, stats in sorted(MODULE_LOAD_STATS.items(), key=lambda item: item[1]['seconds'], reverse=True):
+        label = module_name.rsplit('.', 1)[-1]
+        if stats['error']:
+            label += f" [red](failed: {stats['error']})[/red]"
+        table.add_row(label, f"{stats['seconds']:.3f}", ", ".join(stats['new_imports']))
+    not_loaded = [name.rsplit('.', 1)[-1] for name, mod in sys.modules.items() if name.startswith("ai_marketing_agent.scripts.") and name not in MODULE_LOAD_STATS]
+    if not_loaded:
+        table.add_row("[dim]never loaded (deferred)[/dim]", "0.000", ", ".join(sorted(not_loaded)))
+    console.print(table)
+    console.print(f"[blue]INFO:[/blue] Total wall-clock time since process start: {time.perf_counter() - _AGENT_PROCESS_START:.3f}s. For a per-package breakdown run with [i]python -X importtime[/i].")
+
+# --- Shared Workflow Helpers ---
+
+def load_agent_modules(config):
+    """Loads all agent script modules. Returns a dict keyed by short module name, or None if an essential module failed."""
     console.print(Rule("[b bright_cyan]Loading Agent Modules[/b bright_cyan]"))
-    idea_gen_mod = import_script_module("content_idea_generator.py")
-    strat_chooser_mod = import_script_module("strategic_content_chooser.py")
-    qr_proc_mod = import_script_module("qr_processor.py")
-    content_gen_mod = import_script_module("basic_content_generator.py")
-    post_sched_mod = import_script_module("post_scheduler.py")
-    opp_finder_mod = import_script_module("opportunity_finder.py")
+    # Lazy by default: each script (and its cv2 / google.generativeai / googleapiclient imports) runs on first use.
+    lazy = config.get('agent_workflow', {}).get('lazy_module_loading', True)
+    idea_gen_mod = import_script_module("content_idea_generator.py", lazy=lazy)
+    strat_chooser_mod = import_script_module("strategic_content_chooser.py", lazy=lazy)
+    qr_proc_mod = import_script_module("qr_processor.py", lazy=lazy)
+    content_gen_mod = import_script_module("basic_content_generator.py", lazy=lazy)
+    post_sched_mod = import_script_module("post_scheduler.py", lazy=lazy)
+    opp_finder_mod = import_script_module("opportunity_finder.py", lazy=lazy)
+    kb_index_mod = import_script_module("kb_index.py", lazy=lazy)
+    opp_enricher_mod = import_script_module("opportunity_enricher.py", lazy=lazy)
 
     essential_modules = {
         "Idea Generator": idea_gen_mod, "Strategic Chooser": strat_chooser_mod,
@@ -98,50 +184,24 @@ def run_agent_workflow():
         if not mod:
             console.print(f"[bold red]Failed to load essential module: {name}. Agent cannot continue.[/bold red]")
             modules_ok = False
-    if not modules_ok: return
+    if not modules_ok: return None
 
     if opp_finder_mod is None and config.get('agent_workflow', {}).get('enable_opportunity_finder', False):
         console.print("[yellow]WARN:[/yellow] Opportunity finder module failed to load, but is enabled in config. This step will be skipped.")
 
-    console.print("[green]All essential agent modules loaded.[/green]")
-
-    console.print(Rule("[b bright_cyan]Step 1: Content Idea Generation[/b bright_cyan]"))
-    try:
-        if hasattr(idea_gen_mod, 'generate_content_ideas') and hasattr(idea_gen_mod, 'save_content_ideas'):
-            console.print("[blue]INFO:[/blue] Generating content ideas...")
-            ideas = idea_gen_mod.generate_content_ideas(config)
-            if ideas:
-                idea_gen_mod.save_content_ideas(ideas)
-            else:
-                console.print("[yellow]WARN:[/yellow] No content ideas were generated by idea_gen_mod.")
-        else:
-            console.print("[yellow]WARN:[/yellow] `generate_content_ideas` or `save_content_ideas` not found in idea_gen_mod. Skipping direct idea generation.")
-    except Exception as e:
-        console.print(f"[red]ERROR in Idea Generation step:[/red] {e}")
-
-    console.print(Rule("[b bright_cyan]Step 2: Strategic Content Choice[/b bright_cyan]"))
-    selected_idea_for_content = "Default: Explore ByBit Today"
-    try:
-        if hasattr(strat_chooser_mod, 'load_ideas') and hasattr(strat_chooser_mod, 'choose_next_article'):
-            available_ideas = strat_chooser_mod.load_ideas()
-            if available_ideas:
-                perf_data = strat_chooser_mod.load_performance_data() if hasattr(strat_chooser_mod, 'load_performance_data') else {}
-                trends = strat_chooser_mod.load_trending_topics() if hasattr(strat_chooser_mod, 'load_trending_topics') else {}
-                chosen_idea_text = strat_chooser_mod.choose_next_article(available_ideas, perf_data, trends)
-                if chosen_idea_text and "Error:" not in chosen_idea_text:
-                    selected_idea_for_content = chosen_idea_text
-                    console.print(f"[bold green]Strategically selected idea:[/bold green] [i]'{selected_idea_for_content}'[/i]")
-                else:
-                    console.print(f"[yellow]WARN:[/yellow] Could not strategically choose an idea (Result: {chosen_idea_text}). Using fallback.")
-            else:
-                console.print("[yellow]WARN:[/yellow] No ideas available for strategic chooser. Using fallback.")
-        else:
-            console.print("[yellow]WARN:[/yellow] Core functions not found in strat_chooser_mod. Using fallback idea.")
-    except Exception as e:
-        console.print(f"[red]ERROR in Strategic Choice step:[/red] {e}")
-    console.print(f"[blue]INFO:[/blue] Idea for content generation: '[b]{selected_idea_for_content}[/b]'")
+    console.print(f"[green]All essential agent modules {'registered (loaded on first use)' if lazy else 'loaded'}.[/green]")
+    return {
+        'idea_gen': idea_gen_mod, 'strat_chooser': strat_chooser_mod, 'qr_proc': qr_proc_mod,
+        'content_gen': content_gen_mod, 'post_sched': post_sched_mod, 'opp_finder': opp_finder_mod,
+        'kb_index': kb_index_mod, 'opp_enricher': opp_enricher_mod
+    }
 
-    console.print(Rule("[b bright_cyan]Step 3: Image & QR Code Processing[/b bright_cyan]"))
+def select_image_and_affiliate_link(config, qr_proc_mod):
+    """
+    Picks a marketing image from the configured source directory, preferring images whose QR code carries a link.
+    Links come from the QR manifest (see qr_processor.build_qr_manifest), so decoding happens once per image version.
+    Returns a tuple (affiliate_link, image_path_or_None). Falls back to the configured link on any failure.
+    """
     affiliate_link_to_use = config.get('bybit_affiliate_link', 'YOUR_BYBIT_LINK_DEFAULT')
     selected_image_for_post = None # Full path to image
 
@@ -150,137 +210,500 @@ def run_agent_workflow():
     image_source_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', image_source_dir_config))
     image_extensions = config.get('agent_workflow', {}).get('image_extensions_to_scan', ['.png', '.jpg', '.jpeg'])
 
+    qr_settings = config.get('qr_code_processing', {})
+    qr_default_fallback_link = qr_settings.get('fallback_link_if_no_qr', affiliate_link_to_use)
+
     try:
         if not os.path.isdir(image_source_dir):
             console.print(f"[yellow]WARN:[/yellow] Image source directory '{image_source_dir}' not found. Skipping image selection.")
         else:
-            candidate_images = [f for f in os.listdir(image_source_dir) if os.path.isfile(os.path.join(image_source_dir, f)) and any(f.lower().endswith(ext) for ext in image_extensions) and "bybit" in f.lower()]
-            if not candidate_images:
-                 candidate_images = [f for f in os.listdir(image_source_dir) if os.path.isfile(os.path.join(image_source_dir, f)) and any(f.lower().endswith(ext) for ext in image_extensions)]
-
-            if candidate_images:
-                selected_image_name = random.choice(candidate_images)
-                selected_image_for_post = os.path.join(image_source_dir, selected_image_name)
-                console.print(f"[blue]INFO:[/blue] Selected image for QR processing: '[b]{selected_image_for_post}[/b]'")
-
-                qr_default_fallback_link = config.get('qr_code_processing', {}).get('fallback_link_if_no_qr', affiliate_link_to_use)
-                extracted_link = qr_proc_mod.extract_qr_link_from_image(selected_image_for_post, default_if_not_found=qr_default_fallback_link)
-
-                if extracted_link and extracted_link != qr_default_fallback_link:
-                    affiliate_link_to_use = extracted_link
-                    console.print(f"[bold green]SUCCESS:[/bold green] Extracted affiliate link from QR code: [link={affiliate_link_to_use}]{affiliate_link_to_use}[/link]")
-                else:
-                    affiliate_link_to_use = qr_default_fallback_link
-                    console.print(f"[yellow]WARN:[/yellow] No QR code link extracted, or error. Using fallback link: [link={affiliate_link_to_use}]{affiliate_link_to_use}[/link]")
+            qr_proc_mod.configure_qr_cache(config)
+            # Only new or modified images are decoded; everything else comes straight from the manifest
+            manifest = qr_proc_mod.build_qr_manifest(image_source_dir, qr_settings.get('manifest_path', qr_proc_mod.QR_MANIFEST_PATH),
+                                                     extensions=image_extensions, recursive=qr_settings.get('scan_recursive', False),
+                                                     max_workers=qr_settings.get('max_workers'))
+            qr_cache_stats = qr_proc_mod.get_qr_cache_stats()
+            console.print(f"[blue]INFO:[/blue] QR decode cache: {qr_cache_stats['hits']} hits / {qr_cache_stats['misses']} misses (hit rate {qr_cache_stats['hit_rate']:.0%}).")
+
+            candidate_images = list(manifest['images'])
+            catalog = qr_proc_mod.manifest_link_catalog(manifest) # [(image_path, [payloads])] for images with a QR code
+            preferred_catalog = [item for item in catalog if "bybit" in os.path.basename(item[0]).lower()] or catalog
+
+            if preferred_catalog:
+                selected_image_for_post, qr_payloads = random.choice(preferred_catalog)
+                affiliate_link_to_use = qr_payloads[0]
+                console.print(f"[blue]INFO:[/blue] Selected image for post: '[b]{selected_image_for_post}[/b]' ({len(catalog)} of {len(candidate_images)} images carry a QR code)")
+                console.print(f"[bold green]SUCCESS:[/bold green] Extracted affiliate link from QR code: [link={affiliate_link_to_use}]{affiliate_link_to_use}[/link]")
+            elif candidate_images:
+                preferred_images = [path for path in candidate_images if "bybit" in os.path.basename(path).lower()] or candidate_images
+                selected_image_for_post = os.path.join(manifest['root_dir'], random.choice(preferred_images))
+                affiliate_link_to_use = qr_default_fallback_link
+                console.print(f"[blue]INFO:[/blue] Selected image for post: '[b]{selected_image_for_post}[/b]'")
+                console.print(f"[yellow]WARN:[/yellow] None of the {len(candidate_images)} images contain a QR code link. Using fallback link: [link={affiliate_link_to_use}]{affiliate_link_to_use}[/link]")
             else:
                 console.print(f"[yellow]WARN:[/yellow] No images found in '{image_source_dir}' with extensions {image_extensions}. QR processing skipped. Using default affiliate link.")
     except Exception as e:
         console.print(f"[red]ERROR in Image/QR Processing step:[/red] {e}")
+    return affiliate_link_to_use, selected_image_for_post
+
+def publish_article(config, post_sched_mod, title, content_html, labels, affiliate_link, image_path, blogger_service=None):
+    """
+    Publishes one article to every enabled posting platform, all platforms in parallel (post_scheduler.dispatch_publish).
+    A pre-built `blogger_service` can be passed in (campaign mode) so it is not rebuilt per article.
+    With `post_queue.enabled`, posts are only queued (each platform in its next free slot) and published later by
+    `post_scheduler.py --drain/--serve`. Returns a dict of platform name -> bool success (queued counts as success).
+    """
+    results = {}
+    if config.get('post_queue', {}).get('enabled', False) and hasattr(post_sched_mod, 'schedule_post'):
+        post_sched_mod.configure_post_queue(config)
+        for platform in ('blogger', 'wordpress'):
+            if config.get('posting_platforms', {}).get(platform, {}).get('enabled', False):
+                results[platform] = bool(post_sched_mod.schedule_post(config, platform, title, content_html, labels=labels, affiliate_link=affiliate_link, image_path=image_path))
+        return results
+
+    if not hasattr(post_sched_mod, 'dispatch_publish'):
+        console.print("[red]ERROR:[/red] post_scheduler module has no dispatch_publish; cannot publish.")
+        return results
+    # Every enabled platform is published to in parallel, each with its own timeout and rate limit
+    dispatch_result = post_sched_mod.dispatch_publish(config, title, content_html, labels=labels, affiliate_link=affiliate_link, image_path=image_path, blogger_service=blogger_service)
+    return {platform: outcome['ok'] for platform, outcome in dispatch_result['platforms'].items()}
+
+# --- Main Agent Workflow ---
+# Each numbered step of the workflow is a function of the shared context dict. The step list in
+# build_workflow_steps() declares what each one reads and writes, so workflow_pipeline can checkpoint
+# results and skip steps whose inputs have not changed since the last successful run.
+
+def step_generate_ideas(ctx):
+    config, idea_gen_mod = ctx['config'], ctx['modules']['idea_gen']
+    ideas = []
+    if hasattr(idea_gen_mod, 'generate_content_ideas') and hasattr(idea_gen_mod, 'save_content_ideas'):
+        console.print("[blue]INFO:[/blue] Generating content ideas...")
+        ideas = idea_gen_mod.generate_content_ideas(config)
+        if ideas:
+            idea_gen_mod.save_content_ideas(ideas)
+        else:
+            console.print("[yellow]WARN:[/yellow] No content ideas were generated by idea_gen_mod.")
+    else:
+        console.print("[yellow]WARN:[/yellow] `generate_content_ideas` or `save_content_ideas` not found in idea_gen_mod. Skipping direct idea generation.")
+    return {'generated_ideas': ideas, '_checkpoint': bool(ideas)}
+
+def step_load_strategy_inputs(ctx):
+    strat_chooser_mod = ctx['modules']['strat_chooser']
+    if not hasattr(strat_chooser_mod, 'load_ideas'):
+        console.print("[yellow]WARN:[/yellow] Core functions not found in strat_chooser_mod. Using fallback idea.")
+        return {'available_ideas': [], 'performance_data': {}, 'trending_topics': {}}
+    available_ideas = strat_chooser_mod.load_ideas() or ctx.get('generated_ideas') or []
+    perf_data = strat_chooser_mod.load_performance_data() if hasattr(strat_chooser_mod, 'load_performance_data') else {}
+    trends = strat_chooser_mod.load_trending_topics() if hasattr(strat_chooser_mod, 'load_trending_topics') else {}
+    console.print(f"[blue]INFO:[/blue] Loaded {len(available_ideas)} ideas, {len(perf_data)} performance records and {len(trends)} trending topics.")
+    return {'available_ideas': available_ideas, 'performance_data': perf_data, 'trending_topics': trends}
+
+def step_choose_idea(ctx):
+    strat_chooser_mod = ctx['modules']['strat_chooser']
+    selected_idea_for_content = "Default: Explore ByBit Today"
+    chosen = False
+    available_ideas = ctx.get('available_ideas')
+    if available_ideas and hasattr(strat_chooser_mod, 'choose_next_article'):
+        seed = ctx['config'].get('strategic_chooser', {}).get('random_seed') # None = a fresh random tie-breaker every run
+        chosen_idea_text = strat_chooser_mod.choose_next_article(available_ideas, ctx.get('performance_data', {}), ctx.get('trending_topics', {}), seed=seed)
+        if chosen_idea_text and "Error:" not in chosen_idea_text:
+            selected_idea_for_content = chosen_idea_text
+            chosen = True
+            console.print(f"[bold green]Strategically selected idea:[/bold green] [i]'{selected_idea_for_content}'[/i]")
+        else:
+            console.print(f"[yellow]WARN:[/yellow] Could not strategically choose an idea (Result: {chosen_idea_text}). Using fallback.")
+    else:
+        console.print("[yellow]WARN:[/yellow] No ideas available for strategic chooser. Using fallback.")
+    console.print(f"[blue]INFO:[/blue] Idea for content generation: '[b]{selected_idea_for_content}[/b]'")
+    return {'selected_idea': selected_idea_for_content, '_checkpoint': chosen}
+
+def step_scan_image_sources(ctx):
+    """Fingerprints the candidate images (path, size, mtime) so QR processing only re-runs when they change."""
+    config = ctx['config']
+    workflow_config = config.get('agent_workflow', {})
+    image_source_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', workflow_config.get('image_source_directory', '.')))
+    image_extensions = workflow_config.get('image_extensions_to_scan', ['.png', '.jpg', '.jpeg'])
+    images = ctx['modules']['qr_proc'].find_images(image_source_dir, image_extensions, recursive=config.get('qr_code_processing', {}).get('scan_recursive', False)) if os.path.isdir(image_source_dir) else {}
+    fingerprint = sorted([path, size, mtime_ns] for path, (size, mtime_ns) in images.items())
+    console.print(f"[blue]INFO:[/blue] Found {len(fingerprint)} candidate image(s) in '{image_source_dir}'.")
+    return {'image_source_fingerprint': fingerprint}
+
+def step_process_qr(ctx):
+    affiliate_link_to_use, selected_image_for_post = select_image_and_affiliate_link(ctx['config'], ctx['modules']['qr_proc'])
     console.print(f"[blue]INFO:[/blue] Affiliate link to be used in content: [link={affiliate_link_to_use}]{affiliate_link_to_use}[/link]")
+    return {'affiliate_link': affiliate_link_to_use, 'selected_image': selected_image_for_post}
+
+def step_load_knowledge_base(ctx):
+    content_gen_mod = ctx['modules']['content_gen']
+    kb = {}
+    for kb_key, kb_file in (('kb_features', "kb_bybit_features.txt"), ('kb_ethics', "kb_ethical_guidelines.txt"), ('kb_programs', "kb_bybit_programs.txt")):
+        kb[kb_key] = content_gen_mod.load_knowledge_base_file(kb_file) if hasattr(content_gen_mod, 'load_knowledge_base_file') else ""
+    # Fingerprint of every indexed KB file (mtime + size), so adding or editing any KB file re-runs content generation
+    kb_index = get_shared_kb_index(ctx['config'], ctx['modules'])
+    kb['kb_index_fingerprint'] = kb_index.fingerprint() if kb_index else []
+    return kb
+
+def get_shared_kb_index(config, modules):
+    """The process-wide BM25 KB index, or None if retrieval is disabled or kb_index.py failed to load."""
+    kb_index_mod = modules.get('kb_index')
+    if kb_index_mod is None or not config.get('knowledge_base_retrieval', {}).get('enabled', True):
+        return None
+    try:
+        return kb_index_mod.get_kb_index()
+    except Exception as e:
+        console.print(f"[yellow]WARN:[/yellow] Knowledge base index unavailable ({e}). Falling back to KB summaries.")
+        return None
 
-    console.print(Rule("[b bright_cyan]Step 4: Content Generation[/b bright_cyan]"))
-    generated_blog_content_md = None # Store the actual markdown content
+def retrieve_kb_context(config, modules, idea, content_type, persona):
+    kb_index = get_shared_kb_index(config, modules)
+    content_gen_mod = modules['content_gen']
+    if kb_index is None or not hasattr(content_gen_mod, 'build_kb_context'):
+        return None
+    return content_gen_mod.build_kb_context(kb_index, idea, content_type, persona, config) or None
 
-    try:
-        personas = config.get('audience_personas', {})
-        chosen_persona_key = random.choice(list(personas.keys())) if personas else None
-        chosen_persona = personas.get(chosen_persona_key) if chosen_persona_key else None
-        persona_name_for_log = chosen_persona['name'] if chosen_persona else "General"
-        console.print(f"[blue]INFO:[/blue] Using persona: '[b]{persona_name_for_log}[/b]'")
+def step_generate_content(ctx):
+    config, content_gen_mod = ctx['config'], ctx['modules']['content_gen']
+    selected_idea_for_content, affiliate_link_to_use = ctx.get('selected_idea'), ctx.get('affiliate_link')
+    generated_blog_content_md = None # Store the actual markdown content
 
-        blog_content_type = content_gen_mod.get_content_type(selected_idea_for_content) if hasattr(content_gen_mod, 'get_content_type') else "general_article"
+    personas = config.get('audience_personas', {})
+    chosen_persona_key = random.choice(list(personas.keys())) if personas else None
+    chosen_persona = personas.get(chosen_persona_key) if chosen_persona_key else None
+    persona_name_for_log = chosen_persona['name'] if chosen_persona else "General"
+    console.print(f"[blue]INFO:[/blue] Using persona: '[b]{persona_name_for_log}[/b]'")
 
-        kb_features_summary = content_gen_mod.load_knowledge_base_file("kb_bybit_features.txt") if hasattr(content_gen_mod, 'load_knowledge_base_file') else ""
-        kb_ethics_summary = content_gen_mod.load_knowledge_base_file("kb_ethical_guidelines.txt") if hasattr(content_gen_mod, 'load_knowledge_base_file') else ""
-        kb_programs_summary = content_gen_mod.load_knowledge_base_file("kb_bybit_programs.txt") if hasattr(content_gen_mod, 'load_knowledge_base_file') else ""
+    blog_content_type = content_gen_mod.get_content_type(selected_idea_for_content) if hasattr(content_gen_mod, 'get_content_type') else "general_article"
+    if hasattr(content_gen_mod, 'configure_llm_cache'):
+        content_gen_mod.configure_llm_cache(config)
 
-        prompt_constructor_func_name = None
-        if hasattr(content_gen_mod, 'construct_blog_prompt_v4'): prompt_constructor_func_name = 'construct_blog_prompt_v4'
-        elif hasattr(content_gen_mod, 'construct_prompt_v3'): prompt_constructor_func_name = 'construct_prompt_v3'
+    prompt_constructor_func_name = None
+    if hasattr(content_gen_mod, 'construct_blog_prompt_v4'): prompt_constructor_func_name = 'construct_blog_prompt_v4'
+    elif hasattr(content_gen_mod, 'construct_prompt_v3'): prompt_constructor_func_name = 'construct_prompt_v3'
 
-        if prompt_constructor_func_name:
-            prompt_constructor = getattr(content_gen_mod, prompt_constructor_func_name)
-            blog_prompt = prompt_constructor(selected_idea_for_content, blog_content_type, chosen_persona, config, kb_features_summary, kb_ethics_summary, kb_programs_summary, affiliate_link_override=affiliate_link_to_use)
+    if prompt_constructor_func_name:
+        prompt_constructor = getattr(content_gen_mod, prompt_constructor_func_name)
+        kb_context = retrieve_kb_context(config, ctx['modules'], selected_idea_for_content, blog_content_type, chosen_persona)
+        blog_prompt = prompt_constructor(selected_idea_for_content, blog_content_type, chosen_persona, config, ctx.get('kb_features', ""), ctx.get('kb_ethics', ""), ctx.get('kb_programs', ""), affiliate_link_override=affiliate_link_to_use, kb_context=kb_context)
 
-            api_key_env_var = config.get('gemini_api_key_env_var', "GEMINI_API_KEY")
-            api_key = os.environ.get(api_key_env_var)
+        api_key_env_var = config.get('gemini_api_key_env_var', "GEMINI_API_KEY")
+        api_key = os.environ.get(api_key_env_var)
 
-            if not api_key:
-                console.print(f"[bold red]ERROR:[/bold red] Gemini API Key from env var '{api_key_env_var}' not found. Cannot generate LLM content.")
+        if not api_key:
+            console.print(f"[bold red]ERROR:[/bold red] Gemini API Key from env var '{api_key_env_var}' not found. Cannot generate LLM content.")
+        else:
+            streaming_settings = config.get('llm_streaming', {})
+            draft_filepath = None
+            if streaming_settings.get('enabled', False) and hasattr(content_gen_mod, 'generate_llm_content_streaming'):
+                blog_disclosure = config.get('compliance', {}).get('disclosure_texts', {}).get('blog', '#Ad')
+                draft_filepath = content_gen_mod.build_draft_filepath(selected_idea_for_content, blog_content_type, persona_name_for_log)
+                raw_blog_text = content_gen_mod.generate_llm_content_streaming(blog_prompt, api_key, draft_filepath, f"{blog_content_type} blog post",
+                                                                               required_first_line=blog_disclosure if streaming_settings.get('abort_on_missing_disclosure', True) else None,
+                                                                               header=content_gen_mod.build_draft_header(selected_idea_for_content, blog_content_type, persona_name_for_log))
             else:
                 raw_blog_text = content_gen_mod.generate_llm_content(blog_prompt, api_key, f"{blog_content_type} blog post")
-                if raw_blog_text and "Error:" not in raw_blog_text:
-                    generated_blog_content_md = raw_blog_text.strip() # Keep MD, scheduler might convert to HTML
-                    # (Disclosure/disclaimer logic might be needed here if not handled by basic_content_generator)
-                    content_gen_mod.save_generated_content(selected_idea_for_content, blog_content_type, persona_name_for_log, generated_blog_content_md, content_desc=f"{blog_content_type} blog post")
-                    console.print(f"[green]SUCCESS:[/green] Blog content generated for '{selected_idea_for_content}'.")
-
-                    # Social Media Snippets
-                    # ... (Social media snippet generation logic would go here, similar to basic_content_generator) ...
-                else:
-                    console.print(f"[red]ERROR:[/red] Failed to generate blog content: {raw_blog_text}")
-        else:
-            console.print("[red]ERROR:[/red] No suitable blog prompt constructor found in content_gen_mod.")
-
-    except Exception as e:
-        console.print(f"[red]ERROR in Content Generation step:[/red] {e}")
-
-    if config.get('agent_workflow', {}).get('enable_autonomous_posting', False):
-        console.print(Rule("[b bright_cyan]Step 5: Autonomous Posting[/b bright_cyan]"))
-        if generated_blog_content_md:
-            try:
-                # TODO: Convert Markdown to HTML if needed by posting platforms (e.g. Blogger)
-                # For now, assume content is HTML or platform handles MD
-                blog_html_content_for_post = generated_blog_content_md # Placeholder
-
-                blogger_config = config.get('posting_platforms', {}).get('blogger', {})
-                if blogger_config.get('enabled', False) and hasattr(post_sched_mod, 'get_blogger_service') and hasattr(post_sched_mod, 'post_to_blogger'):
-                    console.print("[blue]INFO:[/blue] Attempting to post to Blogger...")
-                    blogger_service = post_sched_mod.get_blogger_service(config)
-                    if blogger_service:
-                        post_sched_mod.post_to_blogger(blogger_service, config, title=selected_idea_for_content, content_html=blog_html_content_for_post, labels=[blog_content_type, persona_name_for_log], affiliate_link_override=affiliate_link_to_use, image_path_for_post=selected_image_for_post)
-
-                wordpress_config = config.get('posting_platforms', {}).get('wordpress', {})
-                if wordpress_config.get('enabled', False) and hasattr(post_sched_mod, 'post_to_wordpress'):
-                    console.print("[blue]INFO:[/blue] Attempting to post to WordPress (placeholder)...")
-                    post_sched_mod.post_to_wordpress(config, title=selected_idea_for_content, content_html=blog_html_content_for_post, affiliate_link_override=affiliate_link_to_use, image_path_for_post=selected_image_for_post)
-
-                # ... (Social media posting call would go here) ...
-            except Exception as e:
-                console.print(f"[red]ERROR in Autonomous Posting step:[/red] {e}")
-        else:
-            console.print("[yellow]WARN:[/yellow] No generated blog content available to post.")
+            if raw_blog_text and "Error:" not in raw_blog_text:
+                generated_blog_content_md = raw_blog_text.strip() # Keep MD, scheduler might convert to HTML
+                # (Disclosure/disclaimer logic might be needed here if not handled by basic_content_generator)
+                content_gen_mod.save_generated_content(selected_idea_for_content, blog_content_type, persona_name_for_log, generated_blog_content_md, content_desc=f"{blog_content_type} blog post", filepath=draft_filepath)
+                console.print(f"[green]SUCCESS:[/green] Blog content generated for '{selected_idea_for_content}'.")
+
+                # Social Media Snippets
+                # ... (Social media snippet generation logic would go here, similar to basic_content_generator) ...
+            else:
+                console.print(f"[red]ERROR:[/red] Failed to generate blog content: {raw_blog_text}")
     else:
+        console.print("[red]ERROR:[/red] No suitable blog prompt constructor found in content_gen_mod.")
+
+    # Only a successful (paid) generation is checkpointed; failures are retried on the next run
+    return {'blog_content_md': generated_blog_content_md, 'blog_content_type': blog_content_type, 'persona_name': persona_name_for_log, '_checkpoint': bool(generated_blog_content_md)}
+
+def step_publish(ctx):
+    config = ctx['config']
+    if not config.get('agent_workflow', {}).get('enable_autonomous_posting', False):
         console.print("[blue]INFO:[/blue] Autonomous posting is disabled in settings.")
+        return {'publish_results': {}}
+    generated_blog_content_md = ctx.get('blog_content_md')
+    if not generated_blog_content_md:
+        console.print("[yellow]WARN:[/yellow] No generated blog content available to post.")
+        return {'publish_results': {}, '_checkpoint': False}
 
-    if config.get('agent_workflow', {}).get('enable_opportunity_finder', False) and opp_finder_mod:
-        console.print(Rule("[b bright_cyan]Step 6: Opportunity Finding[/b bright_cyan]"))
-        try:
-            if hasattr(opp_finder_mod, 'search_google') and hasattr(opp_finder_mod, 'save_opportunities'):
-                console.print("[blue]INFO:[/blue] Starting online search for posting opportunities...")
-                target_keywords = config.get('target_keywords', ["crypto"])
-                primary_keyword = target_keywords[0] if target_keywords else "cryptocurrency"
-                queries_to_search = [f"{primary_keyword} blogs guest posts", f"{primary_keyword} forums", f"write for us {primary_keyword}"]
-                all_ops_found = {}
-                for q_idx, q_val in enumerate(queries_to_search):
-                    if q_idx > 0:
-                         if not Confirm.ask(f"Continue with next opportunity search query ('{q_val}')?", default=True, console=console):
-                            console.print("[blue]INFO: Skipping remaining opportunity searches by user choice.[/blue]")
-                            break
-                    raw_urls = opp_finder_mod.search_google(q_val)
-                    if raw_urls:
-                         all_ops_found[q_val] = opp_finder_mod.filter_and_analyze_urls(raw_urls)
-                    else:
-                         all_ops_found[q_val] = []
-                opp_finder_mod.save_opportunities(all_ops_found)
-            else:
-                console.print("[yellow]WARN:[/yellow] Core functions not found in opp_finder_mod. Skipping opportunity finding.")
-        except Exception as e:
-            console.print(f"[red]ERROR in Opportunity Finding step:[/red] {e}")
-    else:
+    # TODO: Convert Markdown to HTML if needed by posting platforms (e.g. Blogger)
+    # For now, assume content is HTML or platform handles MD
+    blog_html_content_for_post = generated_blog_content_md # Placeholder
+
+    publish_results = publish_article(config, ctx['modules']['post_sched'], title=ctx.get('selected_idea'), content_html=blog_html_content_for_post, labels=[ctx.get('blog_content_type'), ctx.get('persona_name')], affiliate_link=ctx.get('affiliate_link'), image_path=ctx.get('selected_image'))
+
+    # Checkpoint only when every platform succeeded, so a rerun never re-publishes a successful post
+    # but does retry after a partial failure.
+    return {'publish_results': publish_results, '_checkpoint': bool(publish_results) and all(publish_results.values())}
+
+def step_find_opportunities(ctx):
+    config, opp_finder_mod = ctx['config'], ctx['modules']['opp_finder']
+    if not (config.get('agent_workflow', {}).get('enable_opportunity_finder', False) and opp_finder_mod):
         console.print("[blue]INFO:[/blue] Online opportunity finding is disabled or module failed to load.")
+        return {'opportunities': {}}
+    if not (hasattr(opp_finder_mod, 'find_opportunities') and hasattr(opp_finder_mod, 'save_opportunities')):
+        console.print("[yellow]WARN:[/yellow] Core functions not found in opp_finder_mod. Skipping opportunity finding.")
+        return {'opportunities': {}}
+
+    console.print("[blue]INFO:[/blue] Starting online search for posting opportunities...")
+    finder_config = config.get('opportunity_finder', {})
+    opp_finder_mod.configure_search(config)
+    target_keywords = config.get('target_keywords', ["crypto"])
+    search_keywords = finder_config.get('keywords') or target_keywords[:finder_config.get('max_keywords', 3)] or ["cryptocurrency"]
+    queries_to_search = opp_finder_mod.build_search_queries(search_keywords)
+
+    # Non-interactive by default so unattended runs never block; `opportunity_finder.interactive: true` asks once up front
+    if finder_config.get('interactive', False):
+        if not Confirm.ask(f"Run {len(queries_to_search)} opportunity search queries concurrently?", default=True, console=console):
+            console.print("[blue]INFO: Skipping opportunity searches by user choice.[/blue]")
+            return {'opportunities': {}}
+
+    all_ops_found, failed_queries = opp_finder_mod.find_opportunities(queries_to_search)
+    # Only URLs never discovered before (in any run) go on to enrichment and outreach. URLs first discovered on this
+    # run date still count as new, so a re-run after failed searches does not drop what the earlier attempt found.
+    run_day_start = datetime.strptime(ctx['run_date'], '%Y-%m-%d').timestamp()
+    all_ops_found, _ = opp_finder_mod.keep_new_opportunities(all_ops_found, new_since=run_day_start)
+    opp_finder_mod.save_opportunities(all_ops_found)
+    if failed_queries:
+        console.print(f"[yellow]WARN:[/yellow] {len(failed_queries)} of {len(queries_to_search)} searches failed; this step will re-run next time.")
+    return {'opportunities': all_ops_found, '_checkpoint': not failed_queries}
+
+def step_enrich_opportunities(ctx):
+    config, opp_enricher_mod = ctx['config'], ctx['modules'].get('opp_enricher')
+    candidate_urls = [url for urls in (ctx.get('opportunities') or {}).values() for url in urls]
+    if not config.get('opportunity_enrichment', {}).get('enabled', True) or not opp_enricher_mod or not candidate_urls:
+        console.print("[blue]INFO:[/blue] Opportunity enrichment is disabled, its module failed to load, or there are no candidate URLs.")
+        return {'opportunity_records': []}
+
+    opp_enricher_mod.configure_enrichment(config)
+    records = opp_enricher_mod.enrich_opportunities(candidate_urls)
+    opp_enricher_mod.print_opportunity_records(records)
+    opp_enricher_mod.save_opportunity_records(records)
+    return {'opportunity_records': records}
+
+def build_workflow_steps(pipeline_mod):
+    """Declares the agent workflow as an ordered step graph with explicit inputs and outputs."""
+    Step = pipeline_mod.PipelineStep
+    return [
+        Step('generate_ideas', "Step 1: Content Idea Generation", step_generate_ideas,
+             inputs=['config.target_keywords'], outputs=['generated_ideas']),
+        Step('load_strategy_inputs', "Step 2a: Strategy Inputs", step_load_strategy_inputs,
+             outputs=['available_ideas', 'performance_data', 'trending_topics'], cacheable=False),
+        Step('choose_idea', "Step 2b: Strategic Content Choice", step_choose_idea,
+             inputs=['available_ideas', 'performance_data', 'trending_topics', 'config.strategic_chooser'], outputs=['selected_idea']),
+        Step('scan_image_sources', "Step 3a: Image Source Scan", step_scan_image_sources,
+             outputs=['image_source_fingerprint'], cacheable=False),
+        Step('process_qr', "Step 3b: Image & QR Code Processing", step_process_qr,
+             inputs=['image_source_fingerprint', 'config.bybit_affiliate_link', 'config.qr_code_processing', 'config.agent_workflow.image_source_directory'],
+             outputs=['affiliate_link', 'selected_image'], version=2),
+        Step('load_knowledge_base', "Step 4a: Knowledge Base", step_load_knowledge_base,
+             outputs=['kb_features', 'kb_ethics', 'kb_programs', 'kb_index_fingerprint'], cacheable=False),
+        Step('generate_content', "Step 4b: Content Generation", step_generate_content,
+             inputs=['selected_idea', 'affiliate_link', 'kb_features', 'kb_ethics', 'kb_programs', 'kb_index_fingerprint',
+                     'config.audience_personas', 'config.target_keywords', 'config.compliance', 'config.bybit_affiliate_link',
+                     'config.knowledge_base_retrieval'],
+             outputs=['blog_content_md', 'blog_content_type', 'persona_name'], version=2),
+        Step('publish', "Step 5: Autonomous Posting", step_publish,
+             inputs=['blog_content_md', 'selected_idea', 'blog_content_type', 'persona_name', 'affiliate_link', 'selected_image',
+                     'config.agent_workflow.enable_autonomous_posting', 'config.posting_platforms', 'config.post_queue'],
+             outputs=['publish_results']),
+        Step('find_opportunities', "Step 6: Opportunity Finding", step_find_opportunities,
+             inputs=['config.target_keywords', 'config.agent_workflow.enable_opportunity_finder', 'config.opportunity_finder', 'run_date'],
+             outputs=['opportunities'], version=2),
+        Step('enrich_opportunities', "Step 6b: Opportunity Enrichment", step_enrich_opportunities,
+             inputs=['opportunities', 'config.opportunity_enrichment', 'run_date'], outputs=['opportunity_records']),
+    ]
+
+def run_agent_workflow(fresh=False):
+    """
+    Runs the single-article workflow as a checkpointed step pipeline. Successful step results are persisted
+    under `checkpoints/`; after a failure, the rerun resumes at the first step whose inputs changed (e.g. a failed
+    post reuses the already generated article). A fully successful run clears them, so every new run generates
+    new ideas and a new article. Pass `fresh=True` to ignore existing checkpoints.
+    """
+    console.print(Panel(" Autonomous AI Marketing Agent for ByBit ", title="[bold blue_violet]Welcome![/bold blue_violet]", style="bold bright_blue", expand=False))
+
+    config = load_main_config()
+    if not config:
+        console.print("[bold red]Agent cannot start without valid configuration. Exiting.[/bold red]")
+        return
+
+    modules = load_agent_modules(config)
+    if not modules: return
+    pipeline_mod = import_script_module("workflow_pipeline.py", lazy=False)
+    if not pipeline_mod:
+        console.print("[bold red]Failed to load essential module: Workflow Pipeline. Agent cannot continue.[/bold red]")
+        return
+
+    context = {'config': config, 'modules': modules, 'run_date': datetime.now().strftime('%Y-%m-%d')}
+    report = pipeline_mod.run_pipeline(build_workflow_steps(pipeline_mod), context, fresh=fresh)
+    pipeline_mod.print_pipeline_report(report)
 
     console.print(Panel(" Agent Workflow Completed ", style="bold bright_green", title="[bold blue_violet]Finished![/bold blue_violet]", expand=False))
 
+# --- Campaign Mode (N ideas x M personas, concurrent) ---
+def load_campaign_shared_state(config, qr_proc_mod, content_gen_mod, post_sched_mod, modules=None):
+    """
+    Loads everything the campaign jobs share exactly once: KB text, API key, QR-derived affiliate link and the Blogger service.
+    Jobs only read from the returned dict, so it is safe to share across worker threads.
+    """
+    affiliate_link, image_path = select_image_and_affiliate_link(config, qr_proc_mod)
+
+    if hasattr(content_gen_mod, 'configure_llm_cache'):
+        content_gen_mod.configure_llm_cache(config)
+    kb = {}
+    for kb_key, kb_file in (('features', "kb_bybit_features.txt"), ('ethics', "kb_ethical_guidelines.txt"), ('programs', "kb_bybit_programs.txt")):
+        kb[kb_key] = content_gen_mod.load_knowledge_base_file(kb_file) if hasattr(content_gen_mod, 'load_knowledge_base_file') else ""
+
+    api_key_env_var = config.get('gemini_api_key_env_var', "GEMINI_API_KEY")
+    api_key = os.environ.get(api_key_env_var)
+    if not api_key:
+        console.print(f"[bold red]ERROR:[/bold red] Gemini API Key from env var '{api_key_env_var}' not found. Campaign cannot generate LLM content.")
+
+    blogger_service = None
+    posting_enabled = config.get('agent_workflow', {}).get('enable_autonomous_posting', False)
+    publishes_directly = not config.get('post_queue', {}).get('enabled', False)
+    if posting_enabled and publishes_directly and config.get('posting_platforms', {}).get('blogger', {}).get('enabled', False) and hasattr(post_sched_mod, 'get_blogger_service'):
+        blogger_service = post_sched_mod.get_blogger_service(config)
+
+    return {
+        'config': config, 'kb': kb, 'api_key': api_key, 'modules': modules or {'content_gen': content_gen_mod},
+        'affiliate_link': affiliate_link, 'image_path': image_path,
+        'posting_enabled': posting_enabled, 'blogger_service': blogger_service,
+    }
+
+def run_campaign_job(shared, idea, persona, content_gen_mod, post_sched_mod):
+    """Generates (and optionally publishes) one article for a single idea/persona pair. Never raises; errors are reported in the result dict."""
+    config = shared['config']
+    persona_name = persona['name'] if persona else "General"
+    result = {'idea': idea, 'persona': persona_name, 'generated': False, 'posted': {}, 'error': None, 'seconds': 0.0}
+    start_time = time.perf_counter()
+    try:
+        content_type = content_gen_mod.get_content_type(idea)
+        kb_context = retrieve_kb_context(config, shared['modules'], idea, content_type, persona)
+        prompt = content_gen_mod.construct_prompt_v3(idea, content_type, persona, config, shared['kb']['features'], shared['kb']['ethics'], shared['kb']['programs'], affiliate_link_override=shared['affiliate_link'], kb_context=kb_context)
+        raw_text = content_gen_mod.generate_llm_content(prompt, shared['api_key'], f"{content_type} blog post ({persona_name})", show_status=False)
+        if not raw_text or "Error:" in raw_text:
+            result['error'] = raw_text or "Empty LLM response"
+            return result
+
+        content_md = raw_text.strip()
+        content_gen_mod.save_generated_content(idea, content_type, persona_name, content_md, content_desc=f"{content_type} blog post")
+        result['generated'] = True
+
+        if shared['posting_enabled']:
+            result['posted'] = publish_article(config, post_sched_mod, title=idea, content_html=content_md, labels=[content_type, persona_name], affiliate_link=shared['affiliate_link'], image_path=shared['image_path'], blogger_service=shared['blogger_service'])
+    except Exception as e:
+        result['error'] = str(e)
+    finally:
+        result['seconds'] = time.perf_counter() - start_time
+    return result
+
+def run_campaign(num_ideas=None, persona_keys=None, max_workers=None):
+    """
+    Campaign mode: takes the top N strategically ranked ideas x M audience personas and generates/publishes
+    all of them in one process with a bounded worker pool. Settings come from `agent_workflow.campaign` in
+    settings.yaml (`ideas_count`, `personas`, `max_workers`); explicit arguments override them.
+    """
+    console.print(Panel(" Autonomous AI Marketing Agent for ByBit - Campaign Mode ", title="[bold blue_violet]Welcome![/bold blue_violet]", style="bold bright_blue", expand=False))
+
+    config = load_main_config()
+    if not config:
+        console.print("[bold red]Agent cannot start without valid configuration. Exiting.[/bold red]")
+        return None
+
+    modules = load_agent_modules(config)
+    if not modules: return None
+    strat_chooser_mod, content_gen_mod, post_sched_mod = modules['strat_chooser'], modules['content_gen'], modules['post_sched']
+
+    campaign_config = config.get('agent_workflow', {}).get('campaign', {})
+    num_ideas = num_ideas or campaign_config.get('ideas_count', 5)
+    max_workers = max_workers or campaign_config.get('max_workers', 4)
+    persona_keys = persona_keys or campaign_config.get('personas')
+
+    console.print(Rule("[b bright_cyan]Campaign: Selecting Ideas & Personas[/b bright_cyan]"))
+    available_ideas = strat_chooser_mod.load_ideas()
+    if not available_ideas:
+        idea_gen_mod = modules['idea_gen']
+        available_ideas = idea_gen_mod.generate_content_ideas(config)
+        if available_ideas:
+            idea_gen_mod.save_content_ideas(available_ideas)
+    if not available_ideas:
+        console.print("[bold red]ERROR:[/bold red] No content ideas available for the campaign. Exiting.")
+        return None
+
+    perf_data = strat_chooser_mod.load_performance_data()
+    trends = strat_chooser_mod.load_trending_topics()
+    selected_ideas = [idea for idea, _ in strat_chooser_mod.rank_ideas(available_ideas, perf_data, trends, top_k=num_ideas, seed=config.get('strategic_chooser', {}).get('random_seed'))]
+
+    all_personas = config.get('audience_personas', {}) or {}
+    if persona_keys:
+        unknown_keys = [key for key in persona_keys if key not in all_personas]
+        if unknown_keys:
+            console.print(f"[yellow]WARN:[/yellow] Unknown persona keys ignored: {', '.join(unknown_keys)}")
+        selected_personas = [all_personas[key] for key in persona_keys if key in all_personas]
+    else:
+        selected_personas = list(all_personas.values())
+    if not selected_personas:
+        selected_personas = [None] # Fall back to the generic persona used by construct_prompt_v3
+
+    console.print(f"[blue]INFO:[/blue] Campaign size: [b]{len(selected_ideas)}[/b] ideas x [b]{len(selected_personas)}[/b] personas = [b]{len(selected_ideas) * len(selected_personas)}[/b] articles, {max_workers} workers.")
+
+    console.print(Rule("[b bright_cyan]Campaign: Loading Shared State[/b bright_cyan]"))
+    shared = load_campaign_shared_state(config, modules['qr_proc'], content_gen_mod, post_sched_mod, modules)
+    if not shared['api_key']:
+        return None
+
+    console.print(Rule("[b bright_cyan]Campaign: Generating & Publishing[/b bright_cyan]"))
+    # Finish any deferred module loads before the modules are shared across worker threads
+    load_module_now(content_gen_mod)
+    if shared['posting_enabled']:
+        load_module_now(post_sched_mod)
+    campaign_start = time.perf_counter()
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(run_campaign_job, shared, idea, persona, content_gen_mod, post_sched_mod) for idea in selected_ideas for persona in selected_personas]
+        for future in as_completed(futures):
+            job_result = future.result()
+            results.append(job_result)
+            status_text = "[green]OK[/green]" if job_result['generated'] else f"[red]FAILED[/red] ({job_result['error']})"
+            console.print(f"[blue]CAMPAIGN:[/blue] [{len(results)}/{len(futures)}] '{job_result['idea']}' / {job_result['persona']}: {status_text} in {job_result['seconds']:.1f}s")
+    elapsed = time.perf_counter() - campaign_start
+
+    table = Table(title="[bold blue]Campaign Results[/bold blue]", show_lines=True)
+    table.add_column("Idea", style="magenta")
+    table.add_column("Persona", style="cyan")
+    table.add_column("Generated", no_wrap=True)
+    table.add_column("Posted", no_wrap=True)
+    table.add_column("Seconds", style="dim", no_wrap=True)
+    for job_result in results:
+        posted_text = ", ".join(f"{platform}:{'yes' if ok else 'no'}" for platform, ok in job_result['posted'].items()) or "-"
+        table.add_row(job_result['idea'], job_result['persona'], "yes" if job_result['generated'] else "[red]no[/red]", posted_text, f"{job_result['seconds']:.1f}")
+    console.print(table)
+
+    generated_count = sum(1 for job_result in results if job_result['generated'])
+    if hasattr(content_gen_mod, 'get_llm_cache_stats'):
+        cache_stats = content_gen_mod.get_llm_cache_stats()
+        console.print(f"[blue]INFO:[/blue] LLM cache: {cache_stats['hits']} hit(s), {cache_stats['misses']} miss(es) (hit rate {cache_stats['hit_rate']:.0%}).")
+    console.print(Panel(f" Campaign Completed: {generated_count}/{len(results)} articles generated in {elapsed:.1f}s ", style="bold bright_green", title="[bold blue_violet]Finished![/bold blue_violet]", expand=False))
+    return results
+
 if __name__ == "__main__":
-    run_agent_workflow()
+    parser = argparse.ArgumentParser(description="Autonomous AI Marketing Agent for ByBit")
+    parser.add_argument("--campaign", action="store_true", help="Run campaign mode: top N ideas x M personas, generated concurrently.")
+    parser.add_argument("--ideas", type=int, default=None, help="Campaign mode: number of top-ranked ideas to use.")
+    parser.add_argument("--personas", default=None, help="Campaign mode: comma-separated audience_personas keys (default: all).")
+    parser.add_argument("--workers", type=int, default=None, help="Campaign mode: maximum concurrent generation/posting jobs.")
+    parser.add_argument("--fresh", action="store_true", help="Ignore workflow checkpoints and run every step from scratch.")
+    parser.add_argument("--startup-report", action="store_true", help="Print how long each import and script module took to load.")
+    args = parser.parse_args()
+
+    try:
+        if args.campaign:
+            run_campaign(num_ideas=args.ideas, persona_keys=args.personas.split(",") if args.personas else None, max_workers=args.workers)
+        else:
+            run_agent_workflow(fresh=args.fresh)
+    finally:
+        if args.startup_report:
+            print_startup_report()
@@ -0,0 +1,312 @@
+import asyncio
+import random
+import time
+
+# Rich library imports
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+# Initialize Rich Console
+console = Console()
+
+def _content_gen():
+    """
+    Sibling script basic_content_generator (model settings, response interpretation, on-disk response cache),
+    imported on first use: it needs google.generativeai, which the fake transport and the limiters do not.
+    """
+    import basic_content_generator
+    return basic_content_generator
+
+DEFAULT_RATE_LIMITS = {
+    'requests_per_minute': 60,
+    'tokens_per_minute': 120000,
+    'max_concurrency': 8,
+    'initial_concurrency': 2,
+    'max_retries': 5,
+    'base_retry_delay': 1.0,   # seconds
+    'max_retry_delay': 30.0,   # seconds
+    'expected_output_tokens': 1000, # ~700 words; reserved from the TPM budget up front
+}
+
+def estimate_tokens(text):
+    """Rough token estimate (~4 characters per token). Only used for budgeting, so it errs on the high side."""
+    return len(text) // 4 + 1
+
+def is_rate_limit_error(exc):
+    """
+    True for 429 / quota-exhausted errors from google.api_core or the fake transport, judged by exception type
+    and status code only (an error message that merely mentions "429" or "quota" is not throttling).
+    """
+    if type(exc).__name__ in ("ResourceExhausted", "TooManyRequests"):
+        return True
+    code = getattr(exc, 'code', None)
+    if code == 429 or getattr(code, 'value', None) == 429 or getattr(code, 'name', None) == "RESOURCE_EXHAUSTED":
+        return True
+    return getattr(getattr(exc, 'response', None), 'status_code', None) == 429
+
+def is_transient_error(exc):
+    """Server-side or network hiccups worth retrying (without treating them as throttling)."""
+    if isinstance(exc, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    if type(exc).__name__ in ("ServiceUnavailable", "InternalServerError", "DeadlineExceeded", "GatewayTimeout", "Aborted"):
+        return True
+    code = getattr(exc, 'code', None)
+    return isinstance(code, int) and 500 <= code < 600
+
+class TokenBucket:
+    """Async token bucket refilled continuously at `rate_per_minute`. acquire(n) waits until n tokens are available."""
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate_per_second)
+        self.updated_at = now
+
+    async def acquire(self, amount=1):
+        amount = min(amount, self.capacity) # A single oversized request must still be able to run eventually
+        async with self._lock: # Serialises waiters so large requests are not starved by small ones
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate_per_second)
+
+class AIMDConcurrencyLimiter:
+    """
+    Concurrency limit that grows additively (+1 per `limit` successes) and halves on throttling,
+    like TCP congestion control. Halving happens at most once per `decrease_cooldown` seconds so a burst of
+    429s from requests already in flight counts as one congestion event.
+    """
+    def __init__(self, initial, maximum, minimum=1, decrease_cooldown=0.5):
+        self.limit = float(max(minimum, min(initial, maximum)))
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease_cooldown = decrease_cooldown
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self):
+        self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+
+    def on_throttle(self):
+        now = time.monotonic()
+        if now - self._last_decrease >= self.decrease_cooldown:
+            self.limit = max(self.minimum, self.limit / 2.0)
+            self._last_decrease = now
+
+class GeminiAsyncTransport:
+    """Calls Gemini with `generate_content_async`, reusing the configured model from basic_content_generator."""
+    def __init__(self, api_key, model_name=None):
+        content_gen = _content_gen()
+        self.api_key = api_key
+        self.model_name = model_name or content_gen.LLM_MODEL_NAME
+
+    async def generate(self, prompt_text, content_description="content"):
+        content_gen = _content_gen()
+        model = content_gen.get_llm_model(self.api_key, self.model_name)
+        response = await model.generate_content_async(prompt_text, safety_settings=content_gen.LLM_SAFETY_SETTINGS)
+        return content_gen.interpret_llm_response(response, content_description)
+
+class FakeRateLimitError(Exception):
+    code = 429
+
+class FakeGeminiTransport:
+    """
+    Local stand-in for Gemini used for tests and benchmarks: random latency, and 429s whenever more than
+    `max_concurrent` requests overlap or (optionally) at a random `throttle_probability`.
+    """
+    def __init__(self, latency_range=(0.05, 0.25), max_concurrent=4, throttle_probability=0.0, seed=None):
+        self.latency_range = latency_range
+        self.max_concurrent = max_concurrent
+        self.throttle_probability = throttle_probability
+        self.rng = random.Random(seed)
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.calls = 0
+        self.throttled = 0
+
+    async def generate(self, prompt_text, content_description="content"):
+        self.calls += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            if self.in_flight > self.max_concurrent or self.rng.random() < self.throttle_probability:
+                self.throttled += 1
+                await asyncio.sleep(0.01)
+                raise FakeRateLimitError("429 Resource has been exhausted (e.g. check quota).")
+            await asyncio.sleep(self.rng.uniform(*self.latency_range))
+            return f"#Ad #BybitAffiliate\nFake article for: {prompt_text[:40]}", True
+        finally:
+            self.in_flight -= 1
+
+class AsyncLLMClient:
+    """
+    Keeps many LLM requests in flight within a requests-per-minute and tokens-per-minute budget.
+    Concurrency adapts with AIMD on 429/quota errors; retries use exponential backoff with full jitter.
+    Results follow generate_llm_content's convention: generated text, or a string containing "Error:".
+    """
+    def __init__(self, transport, rate_limits=None, use_cache=True):
+        settings = dict(DEFAULT_RATE_LIMITS)
+        settings.update(rate_limits or {})
+        self.settings = settings
+        self.transport = transport
+        self.use_cache = use_cache
+        self.request_bucket = TokenBucket(settings['requests_per_minute'])
+        self.token_bucket = TokenBucket(settings['tokens_per_minute'])
+        self.limiter = AIMDConcurrencyLimiter(settings['initial_concurrency'], settings['max_concurrency'])
+        self.stats = {'requests': 0, 'successes': 0, 'failures': 0, 'throttled': 0, 'retries': 0, 'cache_hits': 0}
+
+    def _retry_delay(self, attempt):
+        ceiling = min(self.settings['max_retry_delay'], self.settings['base_retry_delay'] * (2 ** attempt))
+        return random.uniform(0, ceiling) # "Full jitter" spreads retries so clients don't re-synchronise
+
+    async def generate(self, prompt_text, content_description="content"):
+        content_gen = _content_gen() if self.use_cache else None
+        cache_key = None
+        if content_gen and content_gen.LLM_CACHE_SETTINGS.get('enabled', True):
+            cache_key = content_gen.llm_cache_key(prompt_text, getattr(self.transport, 'model_name', content_gen.LLM_MODEL_NAME))
+            cached_text = content_gen.load_cached_llm_response(cache_key)
+            if cached_text is not None:
+                self.stats['cache_hits'] += 1
+                return cached_text
+
+        token_cost = estimate_tokens(prompt_text) + self.settings['expected_output_tokens']
+        last_error = None
+        for attempt in range(self.settings['max_retries'] + 1):
+            await self.request_bucket.acquire(1)
+            await self.token_bucket.acquire(token_cost)
+            async with self.limiter:
+                self.stats['requests'] += 1
+                try:
+                    text, complete = await self.transport.generate(prompt_text, content_description)
+                except Exception as e:
+                    last_error = e
+                    if is_rate_limit_error(e):
+                        self.stats['throttled'] += 1
+                        self.limiter.on_throttle()
+                    elif not is_transient_error(e):
+                        break # Bad request, auth error, etc.: retrying will not help
+                else:
+                    self.limiter.on_success()
+                    if "Error:" in text:
+                        self.stats['failures'] += 1
+                        return text
+                    self.stats['successes'] += 1
+                    if complete and cache_key:
+                        content_gen.store_cached_llm_response(cache_key, text, getattr(self.transport, 'model_name', content_gen.LLM_MODEL_NAME))
+                    return text
+            if attempt < self.settings['max_retries']:
+                self.stats['retries'] += 1
+                await asyncio.sleep(self._retry_delay(attempt))
+
+        self.stats['failures'] += 1
+        return f"Error during LLM call for {content_description}: {last_error}"
+
+    async def generate_many(self, prompts, content_description="content"):
+        """Runs all prompts concurrently (within the client's limits) and returns results in input order."""
+        return await asyncio.gather(*(self.generate(prompt, f"{content_description} #{i + 1}") for i, prompt in enumerate(prompts)))
+
+def generate_llm_content_batch(prompts, api_key, config=None, content_description="content"):
+    """Synchronous entry point: generates all prompts concurrently. Limits come from `llm_rate_limits` in settings.yaml."""
+    rate_limits = (config or {}).get('llm_rate_limits', {})
+    client = AsyncLLMClient(GeminiAsyncTransport(api_key), rate_limits)
+    results = asyncio.run(client.generate_many(prompts, content_description))
+    return results, client.stats
+
+async def run_limit_checks():
+    """
+    Local checks of the token bucket, the AIMD limiter, error classification and the client against the fake
+    Gemini transport; needs no API key or google.generativeai. Returns [(check, passed, detail)].
+    """
+    checks = []
+
+    bucket = TokenBucket(600, capacity=5) # 10 tokens/s after a burst of 5
+    start_time = time.perf_counter()
+    for _ in range(15):
+        await bucket.acquire(1)
+    elapsed = time.perf_counter() - start_time
+    checks.append(("token bucket: burst of 5, then 10/s", 0.85 <= elapsed <= 1.3, f"15 tokens in {elapsed:.2f}s (expected ~1.0s)"))
+
+    limiter = AIMDConcurrencyLimiter(initial=8, maximum=16, decrease_cooldown=0.5)
+    limiter.on_throttle()
+    limiter.on_throttle() # Same congestion event: within the cooldown
+    halved = limiter.limit
+    for _ in range(4):
+        limiter.on_success()
+    checks.append(("AIMD: one halving per congestion event", halved == 4.0, f"8 -> {halved:g} after two 429s within the cooldown"))
+    checks.append(("AIMD: about +1 per window of successes", 4.8 < limiter.limit <= 5.0, f"{halved:g} -> {limiter.limit:.2f} after 4 successes"))
+
+    class QuotaWordingError(Exception):
+        pass
+    class ServerError(Exception):
+        code = 503
+    checks.append(("429 classified by type/status only",
+                   is_rate_limit_error(FakeRateLimitError()) and not is_rate_limit_error(QuotaWordingError("prompt mentions 429 and quota")),
+                   "FakeRateLimitError throttles; a message containing '429' does not"))
+    checks.append(("5xx is transient, not throttling", is_transient_error(ServerError()) and not is_rate_limit_error(ServerError()), "code 503"))
+
+    fake_transport = FakeGeminiTransport(latency_range=(0.02, 0.05), max_concurrent=4, seed=7)
+    client = AsyncLLMClient(fake_transport, {'requests_per_minute': 6000, 'max_concurrency': 16, 'initial_concurrency': 8,
+                                             'base_retry_delay': 0.05, 'max_retry_delay': 0.2}, use_cache=False)
+    lowest_limit, on_throttle = [client.limiter.limit], client.limiter.on_throttle
+    def tracking_on_throttle():
+        on_throttle()
+        lowest_limit[0] = min(lowest_limit[0], client.limiter.limit)
+    client.limiter.on_throttle = tracking_on_throttle
+    results = await client.generate_many([f"check prompt {i}" for i in range(30)])
+    errors = sum(1 for result in results if "Error:" in result)
+    checks.append(("client backs off to the server's capacity", lowest_limit[0] <= fake_transport.max_concurrent and errors == 0,
+                   f"{fake_transport.throttled} 429s; concurrency limit 8 -> low of {lowest_limit[0]:g} (server allows {fake_transport.max_concurrent}), {errors} errors"))
+    return checks
+
+if __name__ == "__main__":
+    console.print(Panel("Async LLM Client (fake Gemini transport)", title="[bold magenta]Agent Script[/bold magenta]"))
+
+    fake_transport = FakeGeminiTransport(max_concurrent=4, throttle_probability=0.05, seed=42)
+    demo_client = AsyncLLMClient(fake_transport, {'requests_per_minute': 600, 'max_concurrency': 16, 'initial_concurrency': 2, 'base_retry_delay': 0.1, 'max_retry_delay': 1.0}, use_cache=False)
+    demo_prompts = [f"Write about Bybit topic {i}" for i in range(40)]
+
+    start_time = time.perf_counter()
+    demo_results = asyncio.run(demo_client.generate_many(demo_prompts, "demo article"))
+    elapsed = time.perf_counter() - start_time
+
+    table = Table(title="[bold blue]Async LLM Client Stats[/bold blue]")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", justify="right")
+    for metric, value in demo_client.stats.items():
+        table.add_row(metric, str(value))
+    table.add_row("final concurrency limit", f"{demo_client.limiter.limit:.2f}")
+    table.add_row("peak in-flight (fake server)", str(fake_transport.peak_in_flight))
+    table.add_row("errors returned", str(sum(1 for r in demo_results if "Error" in r)))
+    table.add_row("wall-clock seconds", f"{elapsed:.2f}")
+    console.print(table)
+
+    check_table = Table(title="[bold blue]Limiter Checks (fake Gemini)[/bold blue]")
+    check_table.add_column("Check", style="cyan")
+    check_table.add_column("Result", justify="center")
+    check_table.add_column("Detail")
+    limit_checks = asyncio.run(run_limit_checks())
+    for check_name, passed, detail in limit_checks:
+        check_table.add_row(check_name, "[green]pass[/green]" if passed else "[bold red]FAIL[/bold red]", detail)
+    console.print(check_table)
+    if not all(passed for _, passed, _ in limit_checks):
+        raise SystemExit(1)
@@ -4,6 +4,12 @@ import random
 from datetime import datetime
 import google.generativeai as genai
 import re
+import json
+import time
+import hashlib
+import argparse
+import threading
+from contextlib import nullcontext
 
 # Rich library imports
 from rich.console import Console
@@ -21,6 +27,28 @@ IDEAS_FILE = "ai_marketing_agent/generated_content/content_ideas.txt" # Fallback
 NEXT_IDEA_FILE = "ai_marketing_agent/generated_content/next_article_to_generate.txt"
 OUTPUT_DIR = "ai_marketing_agent/generated_content"
 
+LLM_MODEL_NAME = "gemini-1.0-pro"
+LLM_SAFETY_SETTINGS = [
+    {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+    {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+    {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
+    {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+]
+
+# On-disk LLM response cache. Override via the `llm_cache` section of settings.yaml (see configure_llm_cache).
+LLM_CACHE_SETTINGS = {
+    'enabled': True,
+    'directory': "ai_marketing_agent/cache/llm_responses",
+    'ttl_hours': 24 * 7,
+    'max_entries': 500,
+    'max_megabytes': 50,
+}
+LLM_CACHE_STATS = {'hits': 0, 'misses': 0, 'writes': 0, 'expired': 0, 'evictions': 0}
+_llm_cache_lock = threading.Lock()
+_llm_client_lock = threading.Lock()
+_configured_api_key = None
+_llm_models = {} # model name -> GenerativeModel, reused across calls
+
 def load_config():
     '''Loads configuration from YAML file with enhanced error handling.'''
     try:
@@ -94,57 +122,303 @@ def get_content_type(idea_text):
     if "news" in idea_lower or "update" in idea_lower or "latest" in idea_lower: return "news_update"
     return "general_article"
 
-def generate_llm_content(prompt_text, api_key, content_description="content"): # Added content_description for spinner
-    with console.status(f"[b blue]Communicating with LLM for {content_description}...[/b blue]", spinner="dots") as status:
+def configure_llm_cache(config):
+    """Applies the optional `llm_cache` settings (enabled, directory, ttl_hours, max_entries, max_megabytes)."""
+    llm_cache = (config or {}).get('llm_cache')
+    if isinstance(llm_cache, dict):
+        for key in LLM_CACHE_SETTINGS:
+            if key in llm_cache:
+                LLM_CACHE_SETTINGS[key] = llm_cache[key]
+
+def llm_cache_key(prompt_text, model_name=LLM_MODEL_NAME, safety_settings=LLM_SAFETY_SETTINGS):
+    """Cache key = model name + safety settings + SHA-256 of the exact prompt text."""
+    prompt_hash = hashlib.sha256(prompt_text.encode('utf-8')).hexdigest()
+    key_material = json.dumps({'model': model_name, 'safety': safety_settings, 'prompt_sha256': prompt_hash}, sort_keys=True)
+    return hashlib.sha256(key_material.encode('utf-8')).hexdigest()
+
+def _llm_cache_path(cache_key):
+    return os.path.join(LLM_CACHE_SETTINGS['directory'], f"{cache_key}.json")
+
+def load_cached_llm_response(cache_key):
+    """Returns the cached response text for `cache_key`, or None on a miss. Expired entries are deleted."""
+    path = _llm_cache_path(cache_key)
+    try:
+        with open(path, 'r') as f:
+            entry = json.load(f)
+    except (FileNotFoundError, ValueError, OSError):
+        with _llm_cache_lock:
+            LLM_CACHE_STATS['misses'] += 1
+        return None
+
+    now = time.time()
+    if now - entry.get('created_at', 0) > LLM_CACHE_SETTINGS['ttl_hours'] * 3600:
+        with _llm_cache_lock:
+            LLM_CACHE_STATS['expired'] += 1
+            LLM_CACHE_STATS['misses'] += 1
+        try: os.remove(path)
+        except OSError: pass
+        return None
+
+    # Mark as recently used for LRU eviction: atime is the last use, mtime stays the creation time the TTL is measured from
+    try: os.utime(path, (now, entry.get('created_at', now)))
+    except OSError: pass
+    with _llm_cache_lock:
+        LLM_CACHE_STATS['hits'] += 1
+    return entry.get('text')
+
+def store_cached_llm_response(cache_key, text, model_name=LLM_MODEL_NAME):
+    cache_dir = LLM_CACHE_SETTINGS['directory']
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        path = _llm_cache_path(cache_key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        created_at = time.time()
+        with open(tmp_path, 'w') as f:
+            json.dump({'key': cache_key, 'model': model_name, 'created_at': created_at, 'text': text}, f)
+        os.utime(tmp_path, (created_at, created_at))
+        os.replace(tmp_path, path) # Atomic, so concurrent readers never see a partial entry
+    except OSError as e:
+        console.print(f"[yellow]Warning:[/yellow] Could not write LLM cache entry: {e}")
+        return
+    with _llm_cache_lock:
+        LLM_CACHE_STATS['writes'] += 1
+        _evict_llm_cache_entries()
+
+def _evict_llm_cache_entries():
+    """
+    Drops expired entries, then least-recently-used ones until the entry and size caps are met. Caller holds the lock.
+    An entry file's mtime is its `created_at` (so expiry matches load_cached_llm_response) and its atime its last use.
+    """
+    cache_dir = LLM_CACHE_SETTINGS['directory']
+    entries = []
+    now = time.time()
+    ttl_seconds = LLM_CACHE_SETTINGS['ttl_hours'] * 3600
+    with os.scandir(cache_dir) as it:
+        for dir_entry in it:
+            if not dir_entry.name.endswith('.json'): continue
+            try:
+                stat = dir_entry.stat()
+            except OSError:
+                continue
+            if now - stat.st_mtime > ttl_seconds:
+                try:
+                    os.remove(dir_entry.path)
+                    LLM_CACHE_STATS['expired'] += 1
+                except OSError: pass
+                continue
+            entries.append((stat.st_atime, stat.st_size, dir_entry.path))
+
+    entries.sort() # Oldest (least recently used) first
+    total_bytes = sum(size for _, size, _ in entries)
+    max_bytes = LLM_CACHE_SETTINGS['max_megabytes'] * 1024 * 1024
+    while entries and (len(entries) > LLM_CACHE_SETTINGS['max_entries'] or total_bytes > max_bytes):
+        _, size, path = entries.pop(0)
         try:
+            os.remove(path)
+            LLM_CACHE_STATS['evictions'] += 1
+        except OSError: pass
+        total_bytes -= size
+
+def get_llm_cache_stats():
+    with _llm_cache_lock:
+        stats = dict(LLM_CACHE_STATS)
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+    return stats
+
+def get_llm_model(api_key, model_name=LLM_MODEL_NAME):
+    """Configures the Gemini client once per API key and reuses one GenerativeModel per model name."""
+    global _configured_api_key
+    with _llm_client_lock:
+        if api_key != _configured_api_key:
             genai.configure(api_key=api_key)
-            model_name = "gemini-1.0-pro"
-            model = genai.GenerativeModel(model_name)
+            _configured_api_key = api_key
+            _llm_models.clear()
+        if model_name not in _llm_models:
+            _llm_models[model_name] = genai.GenerativeModel(model_name)
+        return _llm_models[model_name]
+
+def interpret_llm_response(response, content_description="content"):
+    """
+    Turns a Gemini response into text. Returns (text, complete): `complete` is True only for a normal STOP
+    finish with content, i.e. the only case worth caching. Failures come back as "Error: ..." strings.
+    """
+    if response.prompt_feedback and response.prompt_feedback.block_reason:
+        return f"Error: Prompt for {content_description} blocked by API ({response.prompt_feedback.block_reason}). Review prompt or safety settings.", False
+    if not response.candidates:
+         return f"Error: No candidates from LLM for {content_description}. Prompt may be too restrictive or issue with API. Response details: {response}", False
+
+    candidate = response.candidates[0]
+    if candidate.finish_reason.name != "STOP":
+         finish_reason_message = f"Warning: LLM generation for {content_description} finished with reason: {candidate.finish_reason.name}."
+         if candidate.finish_reason.name == "SAFETY":
+              safety_info = " Safety details: "
+              if candidate.safety_ratings:
+                  for rating in candidate.safety_ratings:
+                      if rating.probability.name != "NEGLIGIBLE":
+                          safety_info += f" {rating.category.name} - {rating.probability.name};"
+              return f"Error: Generation of {content_description} stopped by safety filter.{safety_info if safety_info != ' Safety details: ' else ''}", False
+
+         if candidate.content and candidate.content.parts:
+             console.print(f"[yellow]{finish_reason_message}[/yellow] Partial content might be returned for {content_description}.")
+             return "".join(part.text for part in candidate.content.parts), False
+         return f"Error: Generation of {content_description} finished with reason '{candidate.finish_reason.name}' but no content. {finish_reason_message}", False
+
+    if candidate.content and candidate.content.parts:
+        console.print(f"[green]LLM generation for {content_description} successful.[/green]")
+        return "".join(part.text for part in candidate.content.parts), True
+
+    return f"Error: No valid content parts in LLM response for {content_description} despite 'STOP' reason.", False
+
+def generate_llm_content(prompt_text, api_key, content_description="content", show_status=True, use_cache=True): # Added content_description for spinner
+    cache_key = None
+    if use_cache and LLM_CACHE_SETTINGS.get('enabled', True):
+        cache_key = llm_cache_key(prompt_text)
+        cached_text = load_cached_llm_response(cache_key)
+        if cached_text is not None:
+            console.print(f"[green]LLM cache hit for {content_description}[/green] [dim](key {cache_key[:12]}, no API call made)[/dim]")
+            return cached_text
+
+    # Rich allows only one live display at a time, so concurrent callers (campaign workers) pass show_status=False.
+    status_ctx = console.status(f"[b blue]Communicating with LLM for {content_description}...[/b blue]", spinner="dots") if show_status else nullcontext()
+    with status_ctx as status:
+        try:
+            model_name = LLM_MODEL_NAME
+            model = get_llm_model(api_key, model_name)
             # console.print(f"\nAttempting LLM generation (model: {model_name})...") # Replaced by status
-            safety_settings = [
-                {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-                {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-                {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
-                {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-            ]
-            response = model.generate_content(prompt_text, safety_settings=safety_settings)
-
-            if response.prompt_feedback and response.prompt_feedback.block_reason:
-                return f"Error: Prompt for {content_description} blocked by API ({response.prompt_feedback.block_reason}). Review prompt or safety settings."
-            if not response.candidates:
-                 return f"Error: No candidates from LLM for {content_description}. Prompt may be too restrictive or issue with API. Response details: {response}"
-
-            candidate = response.candidates[0]
-            if candidate.finish_reason.name != "STOP":
-                 finish_reason_message = f"Warning: LLM generation for {content_description} finished with reason: {candidate.finish_reason.name}."
-                 if candidate.finish_reason.name == "SAFETY":
-                      safety_info = " Safety details: "
-                      if candidate.safety_ratings:
-                          for rating in candidate.safety_ratings:
-                              if rating.probability.name != "NEGLIGIBLE":
-                                  safety_info += f" {rating.category.name} - {rating.probability.name};"
-                      return f"Error: Generation of {content_description} stopped by safety filter.{safety_info if safety_info != ' Safety details: ' else ''}"
-
-                 if candidate.content and candidate.content.parts:
-                     console.print(f"[yellow]{finish_reason_message}[/yellow] Partial content might be returned for {content_description}.")
-                     return "".join(part.text for part in candidate.content.parts)
-                 return f"Error: Generation of {content_description} finished with reason '{candidate.finish_reason.name}' but no content. {finish_reason_message}"
-
-            if candidate.content and candidate.content.parts:
-                console.print(f"[green]LLM generation for {content_description} successful.[/green]")
-                return "".join(part.text for part in candidate.content.parts)
-
-            return f"Error: No valid content parts in LLM response for {content_description} despite 'STOP' reason."
+            response = model.generate_content(prompt_text, safety_settings=LLM_SAFETY_SETTINGS)
+            generated_text, complete = interpret_llm_response(response, content_description)
+            if complete and cache_key:
+                store_cached_llm_response(cache_key, generated_text, model_name) # Only complete (STOP) responses are cached
+            return generated_text
         except Exception as e:
             console.print(f"[bold red]Exception during LLM call for {content_description}:[/bold red] {e}")
             return f"Error during LLM call for {content_description}: {e}" # Return error message for main block to handle
 
-def construct_prompt_v3(idea, content_type, persona, config, kb_features_summary, kb_ethics_summary, kb_programs_summary, affiliate_link_override=None):
+def _chunk_text(chunk):
+    """Text of a streamed chunk; empty for chunks without parts (chunk.text raises ValueError on those)."""
+    try:
+        return chunk.text
+    except (ValueError, AttributeError, IndexError):
+        return ""
+
+def _close_llm_stream(response):
+    """Cancels an abandoned streaming response (gRPC call or REST generator) so the server stops generating and the connection is released."""
+    stream = getattr(response, '_iterator', response)
+    for method_name in ('cancel', 'close'):
+        method = getattr(stream, method_name, None)
+        if callable(method):
+            try:
+                method()
+            except Exception as e:
+                console.print(f"[yellow]Warning:[/yellow] Could not close the LLM response stream: {e}")
+            return
+
+def generate_llm_content_streaming(prompt_text, api_key, output_path, content_description="content", required_first_line=None, header="", use_cache=True):
+    """
+    Streams the LLM response into `output_path` (after `header`) as chunks arrive and reports time-to-first-token.
+
+    If `required_first_line` is given (the blog disclosure), the first complete line is checked as soon as it
+    arrives; a non-compliant generation is abandoned at that point instead of paying for the whole article,
+    the response stream is cancelled and the partial draft is removed. The draft is also removed if the call
+    fails midway. Returns the full text, or an "Error: ..." string like generate_llm_content.
+    """
+    cache_key = llm_cache_key(prompt_text) if use_cache and LLM_CACHE_SETTINGS.get('enabled', True) else None
+    cached_text = load_cached_llm_response(cache_key) if cache_key else None
+    if cached_text is not None:
+        console.print(f"[green]LLM cache hit for {content_description}[/green] [dim](key {cache_key[:12]}, no API call made)[/dim]")
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        with open(output_path, 'w') as f: f.write(header + cached_text)
+        return cached_text
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    start_time = time.perf_counter()
+    first_token_at = None
+    received = []
+    first_line = None
+    response, draft_started = None, False
+    full_text, complete = None, False
+    try:
+        model = get_llm_model(api_key, LLM_MODEL_NAME)
+        response = model.generate_content(prompt_text, safety_settings=LLM_SAFETY_SETTINGS, stream=True)
+        with open(output_path, 'w') as draft_file:
+            draft_started = True
+            draft_file.write(header)
+            for chunk in response:
+                text = _chunk_text(chunk)
+                if not text:
+                    continue
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+                    console.print(f"[blue]INFO:[/blue] Time to first token for {content_description}: [b]{first_token_at - start_time:.2f}s[/b]")
+                received.append(text)
+                draft_file.write(text)
+                draft_file.flush()
+
+                if required_first_line and first_line is None:
+                    so_far = "".join(received).lstrip()
+                    if "\n" in so_far:
+                        first_line = so_far.split("\n", 1)[0].strip()
+                        if not first_line.startswith(required_first_line):
+                            break # Stop consuming the stream: the rest of the article would be paid for and discarded
+            else: # The stream ran to the end, so the response can be interpreted
+                full_text, complete = interpret_llm_response(response, content_description)
+
+        # An empty or blocked stream is reported with its real cause (block reason, no candidates, safety stop),
+        # before the disclosure check could misreport it as a missing disclosure
+        if full_text is not None and "Error:" in full_text:
+            os.remove(output_path)
+            console.print(f"[bold red]LLM stream for {content_description} ended without usable content:[/bold red] {full_text}")
+            return full_text
+
+        if required_first_line:
+            if first_line is None: # Whole response arrived without a newline
+                first_line = "".join(received).strip()
+            if not first_line.startswith(required_first_line):
+                _close_llm_stream(response)
+                os.remove(output_path)
+                console.print(f"[yellow]Warning:[/yellow] First line '{first_line[:60]}' is missing the required disclosure '{required_first_line}'. Generation cancelled.")
+                return f"Error: Generation of {content_description} aborted after {time.perf_counter() - start_time:.2f}s: first line did not contain the required disclosure '{required_first_line}'."
+
+        console.print(f"[blue]INFO:[/blue] Streamed {len(full_text)} characters for {content_description} in {time.perf_counter() - start_time:.2f}s.")
+        if complete and cache_key:
+            store_cached_llm_response(cache_key, full_text)
+        return full_text
+    except Exception as e:
+        console.print(f"[bold red]Exception during streaming LLM call for {content_description}:[/bold red] {e}")
+        if response is not None:
+            _close_llm_stream(response)
+        if draft_started: # Never leave a partial draft behind
+            try: os.remove(output_path)
+            except OSError: pass
+        return f"Error during LLM call for {content_description}: {e}"
+
+KB_ETHICS_FILE = "kb_ethical_guidelines.txt"
+
+def build_kb_context(kb_index, idea, content_type, persona, config):
+    """
+    Retrieves the KB chunks most relevant to this idea/persona from a kb_index.KnowledgeBaseIndex,
+    limited by `knowledge_base_retrieval.top_k` and `.token_budget` in settings.yaml.
+    The ethics file is excluded because construct_prompt_v3 always includes it in full.
+    """
+    retrieval_settings = config.get('knowledge_base_retrieval', {})
+    query_parts = [idea, content_type]
+    if persona:
+        query_parts += [persona.get('name', ''), persona.get('description', ''), " ".join(persona.get('keywords', []))]
+    return kb_index.build_context(" ".join(query_parts),
+                                  top_k=retrieval_settings.get('top_k', 6),
+                                  token_budget=retrieval_settings.get('token_budget', 600),
+                                  exclude_sources={KB_ETHICS_FILE})
+
+def construct_prompt_v3(idea, content_type, persona, config, kb_features_summary, kb_ethics_summary, kb_programs_summary, affiliate_link_override=None, kb_context=None):
     target_keywords_list = config.get('target_keywords', [])
-    default_primary_keyword = random.choice(target_keywords_list) if target_keywords_list else "Bybit trading"
+    # Keyword choice is seeded by idea + persona so the same inputs always yield a byte-identical prompt
+    # (and therefore an LLM cache hit), while different ideas still rotate through the keywords.
+    keyword_rng = random.Random(f"{idea}|{persona['name'] if persona else ''}")
+    default_primary_keyword = keyword_rng.choice(target_keywords_list) if target_keywords_list else "Bybit trading"
 
     if persona and persona.get('keywords'):
-        primary_keyword = random.choice(persona['keywords'])
+        primary_keyword = keyword_rng.choice(persona['keywords'])
     else:
         primary_keyword = default_primary_keyword
 
@@ -189,12 +463,23 @@ The tone of the article should be: {persona_tone}.
         prompt += f"- Discuss the topic '{idea}' and its current relevance to '{persona_name}' in the crypto space.\n"
         prompt += f"- Naturally integrate Bybit's role, related platform features, or services where appropriate.\n"
 
-    prompt += f'''
+    if kb_context:
+        # Retrieved excerpts replace the fixed "first N lines" summaries of the features/programs files
+        prompt += f'''
+**Knowledge Base Context (Most relevant excerpts - use these to inform your writing):**
+{kb_context}
+
+*   Ethical Marketing Rules (Strictly Follow): ...{kb_ethics_summary}... (Crucial: No profit guarantees, be truthful, avoid hype)
+'''
+    else:
+        prompt += f'''
 **Knowledge Base Context (Summaries - use these to inform your writing):**
 *   Key Bybit Features (for reference): ...{kb_features_summary}...
 *   Ethical Marketing Rules (Strictly Follow): ...{kb_ethics_summary}... (Crucial: No profit guarantees, be truthful, avoid hype)
 *   Bybit Programs Overview (for background context): ...{kb_programs_summary}...
+'''
 
+    prompt += f'''
 **Mandatory Compliance Requirements:**
 1.  **Disclosure First:** The VERY FIRST line of the blog post MUST be: {blog_disclosure}
 2.  **Risk Disclaimer Last:** The VERY LAST line of the blog post MUST be: {risk_disclaimer}
@@ -204,20 +489,27 @@ Output ONLY the Markdown content for the blog post. Do not add any other text, c
 '''
     return prompt
 
-def save_generated_content(idea, content_type, persona_name, content_body, content_desc="content"): # Added content_desc
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+def build_draft_filepath(idea, content_type, persona_name):
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     persona_tag = persona_name.replace(" ", "_").lower() if persona_name else "general"
     sanitized_idea = re.sub(r'[^a-zA-Z0-9_\-]', '_', idea[:30])
     filename = f"llm_draft_{content_type}_{persona_tag}_{sanitized_idea}_{timestamp}.md"
-    filepath = os.path.join(OUTPUT_DIR, filename)
+    return os.path.join(OUTPUT_DIR, filename)
 
+def build_draft_header(idea, content_type, persona_name):
     header = f"--- Generated Content (LLM) ---\n"
     header += f"Type: {content_type.capitalize()}\n"
     header += f"Idea: {idea}\n"
     header += f"Persona: {persona_name if persona_name else 'N/A'}\n"
     header += f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
     header += f"--- \n\n"
+    return header
+
+def save_generated_content(idea, content_type, persona_name, content_body, content_desc="content", filepath=None): # Added content_desc
+    """Saves a draft with the standard header. Pass `filepath` to overwrite an existing draft (e.g. a streamed one)."""
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    filepath = filepath or build_draft_filepath(idea, content_type, persona_name)
+    header = build_draft_header(idea, content_type, persona_name)
 
     try:
         with open(filepath, 'w') as f: f.write(header + content_body)
@@ -226,6 +518,10 @@ def save_generated_content(idea, content_type, persona_name, content_body, conte
         console.print(f"[red]Error saving {content_desc} to {filepath}:[/red] {e}")
 
 if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Generate one LLM blog draft for the strategically chosen idea.")
+    arg_parser.add_argument("--stream", action="store_true", help="Stream the response into the draft file and abort early if the disclosure line is missing.")
+    args = arg_parser.parse_args()
+
     console.print(Panel("Enhanced LLM Content Generator (V3 - With Personas & Strategy Input)",
                       title="[bold magenta]Agent Script[/bold magenta]",
                       subtitle="[dim]Initializing...[/dim]"))
@@ -234,6 +530,7 @@ if __name__ == "__main__":
     if config_data is None:
         console.print("[bold red]Exiting script due to critical configuration loading error.[/bold red]")
         exit(1)
+    configure_llm_cache(config_data)
 
     simulated_qr_link = "https://www.bybit.com/invite?ref=SIMULATEDQR"
     console.print(f"[blue]MAIN_EXEC:[/blue] Using simulated QR link for testing: [link={simulated_qr_link}]{simulated_qr_link}[/link]")
@@ -268,27 +565,42 @@ if __name__ == "__main__":
         console.print(Panel(f"Selected idea: '[b]{selected_idea}[/b]'\nType: [cyan]{content_type_val}[/cyan]\nPersona: [italic green]{persona_name_for_log}[/italic green]", title="[bold blue]Content Generation Task[/bold blue]"))
 
         kb_features_full = load_knowledge_base_file("kb_bybit_features.txt")
-        kb_ethics_full = load_knowledge_base_file("kb_ethical_guidelines.txt")
+        kb_ethics_full = load_knowledge_base_file(KB_ETHICS_FILE)
         kb_programs_full = load_knowledge_base_file("kb_bybit_programs.txt")
 
         features_summary = "\n".join(kb_features_full.split('\n')[:20])
         ethics_summary = "\n".join(kb_ethics_full.split('\n')[:25])
         programs_summary = "\n".join(kb_programs_full.split('\n')[:15])
 
+        kb_context = None
+        if config_data.get('knowledge_base_retrieval', {}).get('enabled', True):
+            import kb_index # Sibling script (the scripts directory is on sys.path when run directly)
+            kb_context = build_kb_context(kb_index.get_kb_index(), selected_idea, content_type_val, chosen_persona, config_data)
+            console.print(f"[blue]INFO:[/blue] Retrieved {len(kb_context)} chars of relevant KB context for the prompt.")
+
         prompt = construct_prompt_v3(selected_idea, content_type_val, chosen_persona, config_data,
                                      features_summary, ethics_summary, programs_summary,
-                                     affiliate_link_override=simulated_qr_link)
-
-        # Pass content_description to generate_llm_content
-        generated_text_raw = generate_llm_content(prompt, api_key, content_description=f"{content_type_val} blog post")
+                                     affiliate_link_override=simulated_qr_link, kb_context=kb_context)
+
+        blog_disclosure = config_data.get('compliance', {}).get('disclosure_texts', {}).get('blog', '#Ad')
+        risk_disclaimer = config_data.get('compliance', {}).get('risk_disclaimer', 'Trade crypto responsibly.')
+
+        streaming_settings = config_data.get('llm_streaming', {})
+        draft_filepath = None
+        if args.stream or streaming_settings.get('enabled', False):
+            # Stream straight into the draft file; a missing disclosure on line 1 cancels the generation early
+            draft_filepath = build_draft_filepath(selected_idea, content_type_val, persona_name_for_log)
+            generated_text_raw = generate_llm_content_streaming(prompt, api_key, draft_filepath, content_description=f"{content_type_val} blog post",
+                                                                required_first_line=blog_disclosure if streaming_settings.get('abort_on_missing_disclosure', True) else None,
+                                                                header=build_draft_header(selected_idea, content_type_val, persona_name_for_log))
+        else:
+            # Pass content_description to generate_llm_content
+            generated_text_raw = generate_llm_content(prompt, api_key, content_description=f"{content_type_val} blog post")
 
 
         if "Error:" not in generated_text_raw: # Check if error message was returned
             final_text = generated_text_raw.strip()
 
-            blog_disclosure = config_data.get('compliance', {}).get('disclosure_texts', {}).get('blog', '#Ad')
-            risk_disclaimer = config_data.get('compliance', {}).get('risk_disclaimer', 'Trade crypto responsibly.')
-
             current_first_line = final_text.split('\n')[0].strip()
             if not current_first_line.startswith(blog_disclosure):
                 console.print(f"[yellow]Warning:[/yellow] Disclosure '{blog_disclosure}' not at the very start. Prepending.")
@@ -301,7 +613,7 @@ if __name__ == "__main__":
                  if final_text.endswith("---"): final_text = final_text[:-3].strip()
                  final_text = f"{final_text}\n\n---\n{risk_disclaimer}"
 
-            save_generated_content(selected_idea, content_type_val, persona_name_for_log, final_text, content_desc=f"{content_type_val} blog post")
+            save_generated_content(selected_idea, content_type_val, persona_name_for_log, final_text, content_desc=f"{content_type_val} blog post", filepath=draft_filepath)
 
             console.print("\n[blue]INFO:[/blue] Social media prompt generation skipped as 'construct_social_media_prompt_v1' was not found in this version of the script.")
 
@@ -321,4 +633,6 @@ if __name__ == "__main__":
             except Exception as e_debug:
                 console.print(f"[bold red]Error saving debug file:[/bold red] {e_debug}")
 
+    cache_stats = get_llm_cache_stats()
+    console.print(f"[blue]INFO:[/blue] LLM cache: {cache_stats['hits']} hit(s), {cache_stats['misses']} miss(es), {cache_stats['writes']} write(s), {cache_stats['evictions']} eviction(s) (hit rate {cache_stats['hit_rate']:.0%}).")
     console.print(Panel("[bold green]Enhanced Content Generator script (V3 with personas) finished.[/bold green]",padding=(1,2)))
@@ -0,0 +1,188 @@
+import json
+import time
+import random
+import argparse
+import threading
+from email.parser import BytesParser
+from email.policy import HTTP
+from urllib.parse import urlsplit, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Rich library imports
+from rich.console import Console
+from rich.panel import Panel
+
+# Initialize Rich Console
+console = Console()
+
+MOCK_BLOG_ID = "1000"
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 503: "Service Unavailable"}
+
+class MockBloggerHandler(BaseHTTPRequestHandler):
+    """Answers the Blogger v3 post endpoints the agent uses (insert, patch, publish, list) and the /batch endpoint."""
+    server_version = "BloggerMock/1.0"
+
+    def _api_response(self, method, path, body):
+        """(status, JSON-able body) for one API call, shared by direct requests and batch sub-requests."""
+        server = self.server
+        with server.mock_lock:
+            server.mock_stats['api_calls'] += 1
+            if server.mock_rng.random() < server.mock_settings['fail_probability']:
+                server.mock_stats['failures_injected'] += 1
+                return 503, {"error": {"code": 503, "message": "Backend Error"}}
+            status, payload = self._apply(method, path, body)
+            if method != "GET" and status == 200 and server.mock_rng.random() < server.mock_settings['fail_after_write_probability']:
+                server.mock_stats['failures_after_write_injected'] += 1 # The change is kept, as when a real backend times out late
+                return 503, {"error": {"code": 503, "message": "Backend Error"}}
+        return status, payload
+
+    def _apply(self, method, path, body):
+        """Carries out one API call on the mock's posts. Caller holds mock_lock."""
+        server = self.server
+        parts = urlsplit(path)
+        segments = parts.path.strip("/").split("/")
+        if segments[:2] != ["v3", "blogs"] or len(segments) < 4 or segments[3] != "posts":
+            return 404, {"error": {"code": 404, "message": "Not Found"}}
+        posts = server.mock_posts
+        post_id = segments[4] if len(segments) > 4 else None
+        if method == "POST" and post_id is None: # insert
+            server.mock_next_id += 1
+            new_id = str(server.mock_next_id)
+            is_draft = parse_qs(parts.query).get("isDraft", ["false"])[0] == "true"
+            posts[new_id] = dict(body or {}, id=new_id, status="DRAFT" if is_draft else "LIVE",
+                                 url=f"https://mock-blog.example/{new_id}.html")
+            return 200, posts[new_id]
+        if method == "GET" and post_id is None: # list
+            wanted = parse_qs(parts.query).get("status")
+            items = [post for post in posts.values() if not wanted or post["status"] in wanted]
+            return 200, {"kind": "blogger#postList", "items": items[-int(parse_qs(parts.query).get("maxResults", ["500"])[0]):]}
+        if post_id not in posts:
+            return 404, {"error": {"code": 404, "message": f"Post {post_id} not found"}}
+        if method == "PATCH":
+            posts[post_id].update(body or {})
+            return 200, posts[post_id]
+        if method == "POST" and segments[5:] == ["publish"]:
+            posts[post_id]["status"] = "LIVE"
+            return 200, posts[post_id]
+        return 400, {"error": {"code": 400, "message": f"Unsupported {method} {parts.path}"}}
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, method):
+        with self.server.mock_lock:
+            self.server.mock_stats['http_requests'] += 1
+        time.sleep(self.server.mock_settings['latency_seconds'])
+        raw_body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if urlsplit(self.path).path == "/batch":
+            self._handle_batch(raw_body)
+            return
+        status, payload = self._api_response(method, self.path, json.loads(raw_body) if raw_body else None)
+        self._send_json(status, payload)
+
+    def _handle_batch(self, raw_body):
+        """Splits a multipart/mixed batch into its application/http sub-requests and answers each one in a matching part."""
+        message = BytesParser(policy=HTTP).parsebytes(f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode('utf-8') + raw_body)
+        response_parts = []
+        for part in message.iter_parts():
+            request_line, _, rest = part.get_payload().partition("\n")
+            method, path, _ = request_line.split(" ", 2)
+            sub_body = rest.replace("\r\n", "\n").partition("\n\n")[2].strip()
+            status, payload = self._api_response(method, path, json.loads(sub_body) if sub_body else None)
+            content_id = part['Content-ID'].strip("<>")
+            response_parts.append(
+                f"Content-Type: application/http\r\nContent-ID: <response-{content_id}>\r\n\r\n"
+                f"HTTP/1.1 {status} {HTTP_REASONS.get(status, 'Error')}\r\nContent-Type: application/json; charset=UTF-8\r\n\r\n"
+                f"{json.dumps(payload)}\r\n")
+        with self.server.mock_lock:
+            self.server.mock_stats['batch_requests'] += 1
+            self.server.mock_stats['batched_sub_requests'] += len(response_parts)
+        boundary = f"batch_mock_{random.getrandbits(48):x}"
+        body = "".join(f"--{boundary}\r\n{part}" for part in response_parts) + f"--{boundary}--\r\n"
+        body = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", f"multipart/mixed; boundary={boundary}")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PATCH(self):
+        self._handle("PATCH")
+
+    def log_message(self, format, *args):
+        pass # Keep test output clean
+
+def create_mock_server(host="127.0.0.1", port=0, latency_seconds=0.05, fail_probability=0.0, fail_after_write_probability=0.0, seed=None):
+    """
+    Local mock of the Blogger v3 API, for checking bulk publishing without a Google account.
+    Every API call (direct or inside a batch) fails with 503 with probability `fail_probability`, before it is
+    carried out. A successful write (insert, patch, publish) is then answered with 503 anyway with probability
+    `fail_after_write_probability`, so retry logic can be checked for posting the same article twice.
+    """
+    server = ThreadingHTTPServer((host, port), MockBloggerHandler)
+    server.daemon_threads = True
+    server.mock_settings = {'latency_seconds': latency_seconds, 'fail_probability': fail_probability, 'fail_after_write_probability': fail_after_write_probability}
+    server.mock_rng = random.Random(seed)
+    server.mock_lock = threading.Lock()
+    server.mock_posts = {}
+    server.mock_next_id = 0
+    server.mock_stats = {'http_requests': 0, 'batch_requests': 0, 'batched_sub_requests': 0, 'api_calls': 0, 'failures_injected': 0, 'failures_after_write_injected': 0}
+    return server
+
+def start_in_background(**kwargs):
+    """Starts a mock server on a free port in a daemon thread. Returns (server, base_url); call server.shutdown() when done."""
+    server = create_mock_server(**kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+def build_mock_blogger_service(base_url):
+    """A googleapiclient Blogger v3 service (from the bundled discovery document) that talks to the mock at `base_url`."""
+    import httplib2
+    from googleapiclient.discovery import build_from_document
+    from googleapiclient.discovery_cache import get_static_doc
+    document = json.loads(get_static_doc("blogger", "v3"))
+    document.update(rootUrl=f"{base_url}/", baseUrl=f"{base_url}/", batchPath="batch")
+    return build_from_document(document, http=httplib2.Http())
+
+if __name__ == "__main__":
+    # Publishes the same posts one request at a time and in batches against the mock, and compares round-trips
+    import post_scheduler
+
+    parser = argparse.ArgumentParser(description="Local Blogger API mock; compares one-by-one vs. batched publishing.")
+    parser.add_argument("--posts", type=int, default=120)
+    parser.add_argument("--batch-size", type=int, default=post_scheduler.BLOGGER_BATCH_SIZE)
+    parser.add_argument("--fail", type=float, default=0.05, help="Probability that an API call answers 503.")
+    parser.add_argument("--fail-after-write", type=float, default=0.05, help="Probability that a write is applied but still answers 503.")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds of latency per HTTP round-trip.")
+    args = parser.parse_args()
+
+    console.print(Panel("Blogger bulk publishing against a local mock", title="[bold magenta]Agent Script[/bold magenta]"))
+    # Both modes publish the same articles to a fresh mock, so the posting ledger would turn the second run into no-ops
+    mock_settings = {'posting_platforms': {'blogger': {'blog_id': MOCK_BLOG_ID}}, 'posting_ledger': {'enabled': False}}
+    bulk_items = [{'title': f"Mock post {i}", 'content_html': f"<p>Post {i}</p>", 'labels': ["crypto", "bybit"]} for i in range(args.posts)]
+
+    for mode in ("one-by-one", "batched"):
+        mock, mock_url = start_in_background(latency_seconds=args.latency, fail_probability=args.fail, fail_after_write_probability=args.fail_after_write, seed=0)
+        mock_service = build_mock_blogger_service(mock_url)
+        start_time = time.perf_counter()
+        if mode == "batched":
+            results = post_scheduler.post_batch_to_blogger(mock_service, mock_settings, bulk_items, args.batch_size, base_retry_delay=0.1)
+            published = sum(1 for result in results if result['ok'])
+        else:
+            published = sum(1 for item in bulk_items if post_scheduler.post_to_blogger(mock_service, mock_settings, item['title'], item['content_html'], item['labels']))
+        console.print(f"[green]{mode}:[/green] {published}/{args.posts} published, {len(mock.mock_posts)} posts on the blog, "
+                      f"{mock.mock_stats['http_requests']} HTTP round-trips, {mock.mock_stats['failures_injected']} + "
+                      f"{mock.mock_stats['failures_after_write_injected']} (after write) injected failures, {time.perf_counter() - start_time:.2f}s")
+        mock.shutdown()
@@ -0,0 +1,149 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Rich library imports
+from rich.console import Console
+
+# Initialize Rich Console
+console = Console()
+
+DEFAULT_HTTP_CACHE_SETTINGS = {
+    'enabled': True,
+    'path': os.path.join(os.path.dirname(__file__), '../cache/http_cache.sqlite3'),
+    'ttl_hours': 24,      # Default freshness of a stored response; a same-day rerun is served without network calls
+    'max_megabytes': 200, # Least recently used entries are evicted beyond this
+}
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+def normalize_url(url, params=None):
+    """Lowercases scheme and host, drops default ports and the fragment, and sorts query parameters (plus any `params`)."""
+    parts = urlsplit(url)
+    scheme, host = parts.scheme.lower(), (parts.hostname or "").lower()
+    netloc = host if parts.port in (None, DEFAULT_PORTS.get(scheme)) else f"{host}:{parts.port}"
+    query_items = parse_qsl(parts.query, keep_blank_values=True) + list((params or {}).items())
+    return urlunsplit((scheme, netloc, parts.path or "/", urlencode(sorted(query_items)), ""))
+
+def http_cache_key(url, headers=None, params=None):
+    """SHA-256 of the normalized URL plus the request headers (names lowercased, sorted)."""
+    normalized_headers = sorted((name.lower(), str(value).strip()) for name, value in (headers or {}).items())
+    key_material = json.dumps({'url': normalize_url(url, params), 'headers': normalized_headers})
+    return hashlib.sha256(key_material.encode('utf-8')).hexdigest()
+
+class HttpResponseCache:
+    """
+    Persistent (SQLite) cache of successful GET responses.
+    Each entry has its own expiry; expired entries that carry an ETag or Last-Modified are kept so the fetcher can
+    revalidate them with a conditional request (a 304 refreshes the entry without re-downloading the body).
+    Total body size is capped; the least recently used entries are evicted first. Safe to share between threads.
+    """
+    def __init__(self, settings=None):
+        self.settings = dict(DEFAULT_HTTP_CACHE_SETTINGS)
+        self.settings.update(settings or {})
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+        self.stats = {'hits': 0, 'misses': 0, 'stale': 0, 'revalidated': 0, 'stores': 0, 'evictions': 0}
+
+    def _db(self):
+        """The SQLite connection for this process, created (with the schema) on first use. Call with self._lock held."""
+        if self._connection is None or self._pid != os.getpid():
+            os.makedirs(os.path.dirname(self.settings['path']) or '.', exist_ok=True)
+            self._connection = sqlite3.connect(self.settings['path'], timeout=30, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS http_responses ("
+                " cache_key TEXT PRIMARY KEY, url TEXT NOT NULL, status INTEGER NOT NULL, headers TEXT NOT NULL,"
+                " body BLOB NOT NULL, etag TEXT, last_modified TEXT, stored_at REAL NOT NULL, expires_at REAL NOT NULL,"
+                " last_access REAL NOT NULL, size INTEGER NOT NULL)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS http_responses_lru ON http_responses (last_access)")
+            self._connection.commit()
+            self._pid = os.getpid()
+        return self._connection
+
+    def lookup(self, url, headers=None, params=None):
+        """
+        Returns the cached entry dict ({'key', 'url', 'status', 'headers', 'text', 'etag', 'last_modified', 'fresh'})
+        or None. A stale entry is only returned if it can be revalidated (has an ETag or Last-Modified).
+        """
+        cache_key = http_cache_key(url, headers, params)
+        now = time.time()
+        try:
+            with self._lock:
+                db = self._db()
+                row = db.execute("SELECT url, status, headers, body, etag, last_modified, expires_at FROM http_responses WHERE cache_key = ?", (cache_key,)).fetchone()
+                if row is None or (row[6] <= now and not (row[4] or row[5])):
+                    self.stats['misses'] += 1
+                    return None
+                db.execute("UPDATE http_responses SET last_access = ? WHERE cache_key = ?", (now, cache_key))
+                db.commit()
+                fresh = row[6] > now
+                self.stats['hits' if fresh else 'stale'] += 1
+        except sqlite3.Error as e:
+            console.print(f"[yellow]HTTP CACHE WARN:[/yellow] Lookup failed: {e}")
+            return None
+        return {'key': cache_key, 'url': row[0], 'status': row[1], 'headers': json.loads(row[2]), 'text': row[3].decode('utf-8', errors='replace'),
+                'etag': row[4], 'last_modified': row[5], 'fresh': fresh}
+
+    def store(self, url, headers, status, response_headers, text, params=None, ttl_seconds=None):
+        cache_key = http_cache_key(url, headers, params)
+        body = text.encode('utf-8')
+        now = time.time()
+        ttl_seconds = self.settings['ttl_hours'] * 3600 if ttl_seconds is None else ttl_seconds
+        lowered_headers = {name.lower(): value for name, value in response_headers.items()}
+        try:
+            with self._lock:
+                db = self._db()
+                db.execute("INSERT OR REPLACE INTO http_responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                           (cache_key, url, status, json.dumps(response_headers), body, lowered_headers.get('etag'),
+                            lowered_headers.get('last-modified'), now, now + ttl_seconds, now, len(body)))
+                db.commit()
+                self.stats['stores'] += 1
+                self._evict_over_cap(db)
+        except sqlite3.Error as e:
+            console.print(f"[yellow]HTTP CACHE WARN:[/yellow] Store failed: {e}")
+
+    def mark_revalidated(self, entry, ttl_seconds=None):
+        """The server answered 304 for `entry`: extend its freshness without touching the body."""
+        now = time.time()
+        ttl_seconds = self.settings['ttl_hours'] * 3600 if ttl_seconds is None else ttl_seconds
+        try:
+            with self._lock:
+                db = self._db()
+                db.execute("UPDATE http_responses SET expires_at = ?, last_access = ? WHERE cache_key = ?", (now + ttl_seconds, now, entry['key']))
+                db.commit()
+                self.stats['revalidated'] += 1
+        except sqlite3.Error as e:
+            console.print(f"[yellow]HTTP CACHE WARN:[/yellow] Revalidation update failed: {e}")
+
+    def _evict_over_cap(self, db):
+        max_bytes = self.settings['max_megabytes'] * 1024 * 1024
+        total_bytes = db.execute("SELECT COALESCE(SUM(size), 0) FROM http_responses").fetchone()[0]
+        if total_bytes <= max_bytes:
+            return
+        target_bytes = max_bytes * 0.9 # Evict a little extra so the next stores don't each trigger an eviction pass
+        evicted_keys = []
+        for cache_key, size in db.execute("SELECT cache_key, size FROM http_responses ORDER BY last_access ASC"):
+            if total_bytes <= target_bytes:
+                break
+            evicted_keys.append((cache_key,))
+            total_bytes -= size
+        db.executemany("DELETE FROM http_responses WHERE cache_key = ?", evicted_keys)
+        db.commit()
+        self.stats['evictions'] += len(evicted_keys)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            try:
+                stats['entries'], stats['bytes'] = self._db().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM http_responses").fetchone()
+            except sqlite3.Error:
+                stats['entries'], stats['bytes'] = None, None
+        lookups = stats['hits'] + stats['stale'] + stats['misses']
+        stats['hit_rate'] = (stats['hits'] + stats['revalidated']) / lookups if lookups else 0.0
+        return stats
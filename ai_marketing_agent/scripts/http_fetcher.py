@@ -0,0 +1,254 @@
+import json
+import time
+import codecs
+import random
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Rich library imports
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+# Initialize Rich Console
+console = Console()
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36"
+DEFAULT_FETCH_SETTINGS = {
+    'max_in_flight': 16,           # Concurrent requests across all hosts
+    'per_host_requests_per_second': 2.0,
+    'timeout': 10,                 # Seconds (connect and read)
+    'max_retries': 3,
+    'base_retry_delay': 1.0,       # Seconds; doubled per attempt when the server gives no Retry-After
+    'max_retry_after': 60.0,       # Longer Retry-After values are not waited out; the request fails instead
+    'pool_connections': 32,        # Distinct hosts kept in the connection pool
+    'max_read_seconds': 15.0,      # Wall-clock cap on reading a body when fetch(max_bytes=...) streams it
+}
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+
+def build_http_session(pool_connections=32, pool_maxsize=16, user_agent=DEFAULT_USER_AGENT):
+    """requests.Session with a connection pool big enough for `pool_maxsize` concurrent requests per host. Retries are handled by ConcurrentFetcher."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = user_agent
+    return session
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date), or None if absent/unparseable."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+class HostRateLimiter:
+    """
+    Spaces requests to the same host at least 1/requests_per_second apart, and holds a host back entirely
+    until a Retry-After deadline it announced has passed. Different hosts never wait for each other.
+    """
+    def __init__(self, requests_per_second):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._next_slot = {}     # host -> monotonic time of its next free slot
+        self._blocked_until = {} # host -> monotonic time before which nothing may be sent
+        self._lock = threading.Lock()
+
+    def acquire(self, host):
+        """Reserves the host's next slot and sleeps until it arrives. Returns the seconds waited."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0), self._blocked_until.get(host, 0.0))
+            self._next_slot[host] = slot + self.interval
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def block(self, host, seconds):
+        with self._lock:
+            self._blocked_until[host] = max(self._blocked_until.get(host, 0.0), time.monotonic() + seconds)
+
+def response_codec(response):
+    """The codec to decode a response body with: its declared charset if Python knows it, else utf-8 (a bogus charset must not fail the fetch)."""
+    try:
+        return codecs.lookup(response.encoding or 'utf-8').name
+    except LookupError:
+        return 'utf-8'
+
+class ConcurrentFetcher:
+    """
+    Thread-based HTTP fetch engine shared by the opportunity scripts: one pooled requests.Session, at most
+    `max_in_flight` requests at a time, per-host politeness, and retries for 429/5xx/network errors that honour
+    Retry-After (falling back to exponential backoff with jitter).
+    With an http_cache.HttpResponseCache, fresh responses are served without any network call and stale ones
+    are revalidated with If-None-Match / If-Modified-Since.
+
+    fetch() returns a result dict: {'url', 'status', 'text', 'headers', 'error', 'attempts', 'seconds', 'from_cache', 'truncated'}.
+    `status` is None and `error` is set when no response could be obtained. Never raises.
+    With `max_bytes`, the body is streamed and cut off after that many bytes or `max_read_seconds`, so a huge or
+    slow page cannot hold a worker for long.
+    """
+    def __init__(self, settings=None, session=None, cache=None):
+        self.settings = dict(DEFAULT_FETCH_SETTINGS)
+        self.settings.update(settings or {})
+        self.session = session or build_http_session(self.settings['pool_connections'], self.settings['max_in_flight'])
+        self.host_limiter = HostRateLimiter(self.settings['per_host_requests_per_second'])
+        self._in_flight = threading.BoundedSemaphore(self.settings['max_in_flight'])
+        self.cache = cache
+        self._stats_lock = threading.Lock()
+        self.stats = {'requests': 0, 'responses': 0, 'cache_hits': 0, 'not_modified': 0, 'retries': 0, 'throttled': 0, 'errors': 0, 'bytes': 0, 'rate_limit_wait_seconds': 0.0}
+
+    def _count(self, **increments):
+        with self._stats_lock:
+            for key, value in increments.items():
+                self.stats[key] += value
+
+    def _backoff_delay(self, attempt):
+        return random.uniform(0.5, 1.0) * self.settings['base_retry_delay'] * (2 ** attempt)
+
+    def _read_limited(self, response, max_bytes):
+        """Reads at most `max_bytes` of a streamed response body within max_read_seconds. Returns (bytes, truncated)."""
+        chunks, size, truncated = [], 0, False
+        deadline = time.monotonic() + self.settings['max_read_seconds']
+        try:
+            for chunk in response.iter_content(chunk_size=16384):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= max_bytes or time.monotonic() > deadline:
+                    truncated = True
+                    break
+        finally:
+            response.close()
+        return b"".join(chunks)[:max_bytes], truncated
+
+    def fetch(self, url, headers=None, params=None, max_bytes=None):
+        host = urlsplit(url).netloc.lower()
+        result = {'url': url, 'status': None, 'text': "", 'headers': {}, 'error': None, 'attempts': 0, 'seconds': 0.0, 'from_cache': False, 'truncated': False}
+        start_time = time.perf_counter()
+
+        cached = self.cache.lookup(url, headers, params) if self.cache else None
+        if cached and cached['fresh']:
+            self._count(cache_hits=1)
+            result.update(status=cached['status'], text=cached['text'], headers=cached['headers'], from_cache=True)
+            return result
+        request_headers = dict(headers or {})
+        if cached: # Stale, but the server can confirm it is still current
+            if cached['etag']:
+                request_headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                request_headers['If-Modified-Since'] = cached['last_modified']
+
+        for attempt in range(self.settings['max_retries'] + 1):
+            waited = self.host_limiter.acquire(host)
+            self._count(rate_limit_wait_seconds=waited, requests=1)
+            result['attempts'] = attempt + 1
+            retry_after = None
+            try:
+                with self._in_flight:
+                    response = self.session.get(url, headers=request_headers, params=params, timeout=self.settings['timeout'], stream=max_bytes is not None)
+                    if max_bytes is None:
+                        body, truncated = response.content, False
+                    else:
+                        body, truncated = self._read_limited(response, max_bytes)
+                self._count(responses=1, bytes=len(body))
+                if response.status_code == 304 and cached:
+                    self.cache.mark_revalidated(cached)
+                    self._count(not_modified=1)
+                    result.update(status=cached['status'], text=cached['text'], headers=cached['headers'], error=None, from_cache=True)
+                    break
+                result.update(status=response.status_code, text=body.decode(response_codec(response), errors='replace'),
+                              headers=dict(response.headers), error=None, truncated=truncated)
+                if response.status_code not in RETRY_STATUS_CODES:
+                    break
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                self._count(throttled=1)
+                result['error'] = f"HTTP {response.status_code}"
+                if retry_after is not None:
+                    if retry_after > self.settings['max_retry_after']:
+                        result['error'] = f"HTTP {response.status_code} (Retry-After {retry_after:.0f}s exceeds limit)"
+                        break
+                    self.host_limiter.block(host, retry_after) # Every request to this host waits, not just this one
+            except requests.exceptions.RequestException as e:
+                result['error'] = f"{type(e).__name__}: {e}"
+
+            if attempt < self.settings['max_retries']:
+                self._count(retries=1)
+                if retry_after is None: # A Retry-After wait already happens in host_limiter.acquire
+                    time.sleep(self._backoff_delay(attempt))
+
+        if result['error']:
+            self._count(errors=1)
+        elif self.cache and result['status'] == 200 and not result['from_cache'] and not result['truncated']:
+            # A body cut off at max_bytes is never cached: a later hit would serve it as if it were complete
+            self.cache.store(url, headers, result['status'], result['headers'], result['text'], params)
+        result['seconds'] = round(time.perf_counter() - start_time, 4)
+        return result
+
+    def _fetch_isolated(self, url, headers=None, max_bytes=None):
+        """fetch(), with any unexpected exception turned into that URL's error result so it cannot fail a whole fetch_many batch."""
+        try:
+            return self.fetch(url, headers=headers, max_bytes=max_bytes)
+        except Exception as e:
+            self._count(errors=1)
+            return {'url': url, 'status': None, 'text': "", 'headers': {}, 'error': f"{type(e).__name__}: {e}", 'attempts': 0,
+                    'seconds': 0.0, 'from_cache': False, 'truncated': False}
+
+    def fetch_many(self, urls, headers=None, max_bytes=None):
+        """Fetches all URLs concurrently (bounded by max_in_flight) and returns the result dicts in input order. One URL's failure only affects its own result."""
+        urls = list(urls)
+        if not urls:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.settings['max_in_flight'], len(urls))) as executor:
+            return list(executor.map(lambda url: self._fetch_isolated(url, headers=headers, max_bytes=max_bytes), urls))
+
+    def close(self):
+        self.session.close()
+
+_shared_fetchers = {}
+_shared_fetchers_lock = threading.Lock()
+
+def get_shared_fetcher(settings=None, cache=None):
+    """One ConcurrentFetcher (and connection pool) per distinct settings dict and cache, reused for the life of the process."""
+    key = (json.dumps(settings or {}, sort_keys=True, default=str), id(cache)) # Also works for nested or unhashable setting values
+    with _shared_fetchers_lock:
+        if key not in _shared_fetchers:
+            _shared_fetchers[key] = ConcurrentFetcher(settings, cache=cache)
+        return _shared_fetchers[key]
+
+if __name__ == "__main__":
+    # Demo against the local search stand-in (random latency and 429s with Retry-After)
+    import search_standin_server
+
+    console.print(Panel("Concurrent HTTP Fetcher (local stand-in)", title="[bold magenta]Agent Script[/bold magenta]"))
+    server, base_url = search_standin_server.start_in_background(latency_range=(0.05, 0.2), throttle_probability=0.1, retry_after_seconds=1)
+    demo_urls = [f"{base_url}/search?q=bybit+topic+{i}&num=10" for i in range(40)]
+
+    for label, demo_settings in (("sequential", {'max_in_flight': 1, 'per_host_requests_per_second': 0}),
+                                 ("concurrent", {'max_in_flight': 16, 'per_host_requests_per_second': 50})):
+        fetcher = ConcurrentFetcher(demo_settings)
+        start_time = time.perf_counter()
+        demo_results = fetcher.fetch_many(demo_urls)
+        elapsed = time.perf_counter() - start_time
+        table = Table(title=f"[bold blue]{label}: {len(demo_urls)} fetches in {elapsed:.2f}s[/bold blue]")
+        table.add_column("Metric", style="cyan")
+        table.add_column("Value", justify="right")
+        for metric, value in fetcher.stats.items():
+            table.add_row(metric, f"{value:.2f}" if isinstance(value, float) else str(value))
+        table.add_row("ok responses", str(sum(1 for r in demo_results if r['status'] == 200)))
+        console.print(table)
+        fetcher.close()
+    server.shutdown()
@@ -0,0 +1,206 @@
+import cv2
+import os
+import json
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Rich library imports
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+# Initialize Rich Console
+console = Console()
+
+IMAGE_PIPELINE_SETTINGS = {
+    'enabled': True,
+    'cache_dir': os.path.join(os.path.dirname(__file__), '../cache/image_variants'),
+    'public_base_url': None, # Where cache_dir is served from (e.g. a CDN bucket it is synced to); lets Blogger embed variants
+    'max_workers': None,     # Processes for prepare_variants; None = CPU count
+    'inline_max_tasks': 4,   # Batches this small (e.g. one article's image for each platform) are encoded in the calling thread
+    # Variant made for each platform: widest edge in pixels (never upscaled), output format and encoder quality
+    'platforms': {
+        'blogger': {'width': 1200, 'format': 'jpeg', 'quality': 82},
+        'wordpress': {'width': 1200, 'format': 'webp', 'quality': 80},
+        'social_media': {'width': 1080, 'format': 'jpeg', 'quality': 85},
+    },
+}
+VARIANT_EXTENSIONS = {'jpeg': '.jpg', 'webp': '.webp', 'png': '.png'}
+SOURCE_IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp')
+_variant_pools = {} # max_workers -> ProcessPoolExecutor, shared by every prepare_variants call in this process
+_variant_pools_lock = threading.Lock()
+
+def configure_image_pipeline(config):
+    """Applies the optional `image_pipeline` settings; `platforms` entries are merged per platform."""
+    pipeline_settings = (config or {}).get('image_pipeline')
+    if not isinstance(pipeline_settings, dict):
+        return
+    IMAGE_PIPELINE_SETTINGS.update({key: value for key, value in pipeline_settings.items() if key in IMAGE_PIPELINE_SETTINGS and key != 'platforms'})
+    for platform, spec in (pipeline_settings.get('platforms') or {}).items():
+        if isinstance(spec, dict):
+            IMAGE_PIPELINE_SETTINGS['platforms'].setdefault(platform, {}).update(spec)
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def variant_name(source_hash, spec):
+    """Cache file name of a variant: the source content hash plus every transform parameter, so any change makes a new file."""
+    params = f"{spec['width']}w_q{spec['quality']}"
+    return f"{source_hash[:24]}_{params}{VARIANT_EXTENSIONS[spec['format']]}"
+
+def _encode_variant(image, spec):
+    """Resizes (down only, INTER_AREA) and encodes an image for `spec`. Returns (encoded bytes, width, height)."""
+    height, width = image.shape[:2]
+    if max(width, height) > spec['width']:
+        scale = spec['width'] / max(width, height)
+        image = cv2.resize(image, (max(1, round(width * scale)), max(1, round(height * scale))), interpolation=cv2.INTER_AREA)
+    if spec['format'] == 'jpeg':
+        if image.ndim == 3 and image.shape[2] == 4: # JPEG has no alpha: flatten transparent areas onto white
+            alpha = image[:, :, 3:4] / 255.0
+            image = (image[:, :, :3] * alpha + 255 * (1 - alpha)).astype('uint8')
+        params = [cv2.IMWRITE_JPEG_QUALITY, spec['quality'], cv2.IMWRITE_JPEG_OPTIMIZE, 1, cv2.IMWRITE_JPEG_PROGRESSIVE, 1]
+    elif spec['format'] == 'webp':
+        params = [cv2.IMWRITE_WEBP_QUALITY, spec['quality']]
+    else:
+        params = [cv2.IMWRITE_PNG_COMPRESSION, 9]
+    ok, encoded = cv2.imencode(VARIANT_EXTENSIONS[spec['format']], image, params)
+    if not ok:
+        raise ValueError(f"OpenCV could not encode a {spec['format']} variant")
+    return encoded.tobytes(), image.shape[1], image.shape[0]
+
+def make_variant(source_path, spec, cache_dir=None, source_hash=None):
+    """
+    The variant of `source_path` for `spec`, from the cache or newly encoded.
+    Returns {'source', 'path', 'format', 'width', 'height', 'bytes', 'source_bytes', 'source_hash', 'variant_hash', 'cached'}.
+    """
+    cache_dir = cache_dir or IMAGE_PIPELINE_SETTINGS['cache_dir']
+    source_hash = source_hash or file_sha256(source_path)
+    path = os.path.join(cache_dir, variant_name(source_hash, spec))
+    meta_path = f"{path}.json"
+    if os.path.exists(path) and os.path.exists(meta_path):
+        with open(meta_path, 'r') as f:
+            return dict(json.load(f), source=source_path, path=path, cached=True)
+
+    image = cv2.imread(source_path, cv2.IMREAD_UNCHANGED)
+    if image is None:
+        raise ValueError(f"OpenCV could not read image '{source_path}'")
+    data, width, height = _encode_variant(image, spec)
+    variant = {'format': spec['format'], 'width': width, 'height': height, 'bytes': len(data), 'source_bytes': os.path.getsize(source_path),
+               'source_hash': source_hash, 'variant_hash': hashlib.sha256(data).hexdigest()}
+    os.makedirs(cache_dir, exist_ok=True)
+    for target_path, content in ((path, data), (meta_path, json.dumps(variant).encode('utf-8'))):
+        temp_path = f"{target_path}.{os.getpid()}.tmp" # Atomic: concurrent workers making the same variant never see a partial file
+        with open(temp_path, 'wb') as f:
+            f.write(content)
+        os.replace(temp_path, target_path)
+    return dict(variant, source=source_path, path=path, cached=False)
+
+def cached_variants(source_path, platforms=None):
+    """
+    {platform: variant dict} for the variants of `source_path` already in the cache (nothing is encoded), for
+    `platforms` or every configured platform. Lets one platform find where another published the same image.
+    """
+    source_hash = file_sha256(source_path)
+    variants = {}
+    for platform in platforms or IMAGE_PIPELINE_SETTINGS['platforms']:
+        spec = IMAGE_PIPELINE_SETTINGS['platforms'].get(platform)
+        path = os.path.join(IMAGE_PIPELINE_SETTINGS['cache_dir'], variant_name(source_hash, spec)) if spec else None
+        if path and os.path.exists(path) and os.path.exists(f"{path}.json"):
+            with open(f"{path}.json", 'r') as f:
+                variants[platform] = dict(json.load(f), source=source_path, path=path, cached=True)
+    return variants
+
+def _get_variant_pool(max_workers):
+    """The process pool for `max_workers`, created on first use and reused, so callers do not pay for process start-up each time."""
+    with _variant_pools_lock:
+        if max_workers not in _variant_pools:
+            _variant_pools[max_workers] = ProcessPoolExecutor(max_workers=max_workers)
+        return _variant_pools[max_workers]
+
+def _make_variant_for_batch(task):
+    source_path, platform, spec, cache_dir = task
+    try:
+        return platform, make_variant(source_path, spec, cache_dir), None
+    except (OSError, ValueError, cv2.error) as e:
+        return platform, None, f"{type(e).__name__}: {e}"
+
+def prepare_variants(image_paths, platforms, max_workers=None, cache_dir=None):
+    """
+    Makes every (image, platform) variant, reusing cached ones. Small batches (up to `inline_max_tasks`) are
+    encoded in the calling thread; larger ones go to a process pool shared by all calls.
+    Returns {image_path: {platform: variant dict, or None if it could not be made}}.
+    """
+    cache_dir = cache_dir or IMAGE_PIPELINE_SETTINGS['cache_dir']
+    specs = {platform: IMAGE_PIPELINE_SETTINGS['platforms'][platform] for platform in platforms if platform in IMAGE_PIPELINE_SETTINGS['platforms']}
+    tasks = [(image_path, platform, spec, cache_dir) for image_path in image_paths for platform, spec in specs.items()]
+    results = {image_path: {} for image_path in image_paths}
+    if not tasks:
+        return results
+    max_workers = max_workers or IMAGE_PIPELINE_SETTINGS['max_workers'] or os.cpu_count() or 1
+    outcomes = None
+    if len(tasks) > IMAGE_PIPELINE_SETTINGS['inline_max_tasks'] and max_workers > 1:
+        try:
+            outcomes = list(_get_variant_pool(max_workers).map(_make_variant_for_batch, tasks))
+        except BrokenProcessPool as e: # A worker died; drop the pool (the next call starts a new one) and encode here
+            console.print(f"[yellow]IMAGE_PIPELINE_WARN:[/yellow] Variant worker pool failed ({e}); encoding in this process.")
+            with _variant_pools_lock:
+                _variant_pools.pop(max_workers, None)
+    if outcomes is None:
+        outcomes = map(_make_variant_for_batch, tasks)
+    for (image_path, _, _, _), (platform, variant, error) in zip(tasks, outcomes):
+        if error:
+            console.print(f"[yellow]IMAGE_PIPELINE_WARN:[/yellow] No {platform} variant of '{image_path}': {error}")
+        results[image_path][platform] = variant
+    return results
+
+def platform_image_path(image_path, platform):
+    """Path of the image to publish on `platform`: its prepared variant, or the original if the pipeline is off or fails."""
+    if not image_path or not IMAGE_PIPELINE_SETTINGS['enabled'] or platform not in IMAGE_PIPELINE_SETTINGS['platforms']:
+        return image_path
+    variant = prepare_variants([image_path], [platform], max_workers=1)[image_path].get(platform)
+    return variant['path'] if variant else image_path
+
+def public_variant_url(variant_path):
+    """URL of a cached variant under `public_base_url`, or None if none is configured."""
+    base_url = IMAGE_PIPELINE_SETTINGS['public_base_url']
+    return f"{base_url.rstrip('/')}/{os.path.basename(variant_path)}" if base_url and variant_path else None
+
+def print_variant_report(prepared):
+    table = Table(title="[bold blue]Image Variants[/bold blue]")
+    table.add_column("Source", style="cyan", overflow="fold")
+    table.add_column("Platform")
+    table.add_column("Size", justify="right")
+    table.add_column("Source KB", justify="right")
+    table.add_column("Variant KB", justify="right")
+    table.add_column("Saved", justify="right")
+    table.add_column("Cached", justify="center")
+    for image_path, variants in prepared.items():
+        for platform, variant in variants.items():
+            if variant:
+                table.add_row(os.path.basename(image_path), platform, f"{variant['width']}x{variant['height']} {variant['format']}",
+                              f"{variant['source_bytes'] / 1024:.0f}", f"{variant['bytes'] / 1024:.0f}",
+                              f"{100 * (1 - variant['bytes'] / variant['source_bytes']):.0f}%", "yes" if variant['cached'] else "no")
+    console.print(table)
+
+if __name__ == "__main__":
+    import time
+
+    parser = argparse.ArgumentParser(description="Pre-build the platform image variants for every image in a directory.")
+    parser.add_argument("root_dir", nargs="?", default=os.path.join(os.path.dirname(__file__), '../..'))
+    parser.add_argument("--platforms", default=",".join(IMAGE_PIPELINE_SETTINGS['platforms']))
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    console.print(Panel("Image Pipeline", title="[bold magenta]Agent Script[/bold magenta]"))
+    source_images = sorted(os.path.join(args.root_dir, name) for name in os.listdir(args.root_dir) if name.lower().endswith(SOURCE_IMAGE_EXTENSIONS))
+    start_time = time.perf_counter()
+    prepared_variants = prepare_variants(source_images, args.platforms.split(","), max_workers=args.workers)
+    print_variant_report(prepared_variants)
+    console.print(f"[green]Prepared variants for {len(source_images)} image(s) in {time.perf_counter() - start_time:.2f}s.[/green]")
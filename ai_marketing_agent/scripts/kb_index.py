@@ -0,0 +1,182 @@
+import os
+import re
+import math
+import threading
+from collections import Counter
+
+# Rich library imports
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+# Initialize Rich Console
+console = Console()
+
+KB_DIR = "ai_marketing_agent/knowledge_base"
+DEFAULT_CHUNK_CHARS = 500
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how", "in", "is", "it", "its", "of", "on", "or",
+    "that", "the", "this", "to", "vs", "what", "when", "which", "who", "why", "with", "you", "your",
+}
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+HEADING_PATTERN = re.compile(r"^\s*#{1,6}\s") # Markdown headings, not hashtags like "#Ad"
+CONFLICT_MARKER_PATTERN = re.compile(r"^(<{7}|={7}|>{7})")
+
+def tokenize(text):
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+def estimate_tokens(text):
+    return len(text) // 4 + 1
+
+def chunk_kb_text(text, source, max_chars=DEFAULT_CHUNK_CHARS):
+    """
+    Splits a KB file into chunks of whole lines. A markdown heading starts a new chunk and is repeated at the
+    top of every chunk in its section, so each chunk carries its own context when pulled into a prompt.
+    """
+    # Several KB files store bullet lists as literal "\n" sequences on one line
+    lines = [line.rstrip() for line in text.replace("\\n", "\n").split("\n")]
+    chunks = []
+    heading = ""
+    current = []
+
+    def flush():
+        body = "\n".join(current).strip()
+        if body:
+            chunk_text = f"{heading}\n{body}" if heading and not body.startswith(heading) else body
+            chunks.append({'source': source, 'heading': heading, 'text': chunk_text})
+        current.clear()
+
+    for line in lines:
+        if not line.strip() or CONFLICT_MARKER_PATTERN.match(line):
+            continue
+        if HEADING_PATTERN.match(line):
+            flush()
+            heading = line.strip()
+            continue
+        if current and len("\n".join(current)) + len(line) > max_chars:
+            flush()
+        current.append(line)
+    flush()
+    return chunks
+
+class KnowledgeBaseIndex:
+    """
+    In-memory BM25 index over chunked `knowledge_base/*.txt` files.
+    Files are re-chunked only when their mtime (or size) changes; refresh() is cheap enough to call per query.
+    """
+    def __init__(self, kb_dir=KB_DIR, chunk_chars=DEFAULT_CHUNK_CHARS):
+        self.kb_dir = kb_dir
+        self.chunk_chars = chunk_chars
+        self._file_state = {}   # filename -> (mtime_ns, size)
+        self._file_chunks = {}  # filename -> [chunk dicts]
+        self.chunks = []
+        self._term_freqs = []
+        self._doc_freq = Counter()
+        self._avg_length = 0.0
+        self._lock = threading.Lock()
+        self.rebuild_count = 0
+
+    def refresh(self):
+        """Re-reads changed, new or deleted KB files and rebuilds the BM25 statistics if anything changed."""
+        with self._lock:
+            current_state = {}
+            if os.path.isdir(self.kb_dir):
+                with os.scandir(self.kb_dir) as entries:
+                    for entry in entries:
+                        if entry.is_file() and entry.name.endswith(".txt"):
+                            stat = entry.stat()
+                            current_state[entry.name] = (stat.st_mtime_ns, stat.st_size)
+            if current_state == self._file_state:
+                return False
+
+            for filename, state in current_state.items():
+                if self._file_state.get(filename) != state:
+                    try:
+                        with open(os.path.join(self.kb_dir, filename), 'r') as f:
+                            self._file_chunks[filename] = chunk_kb_text(f.read(), filename, self.chunk_chars)
+                    except (IOError, UnicodeDecodeError) as e:
+                        console.print(f"[yellow]Warning:[/yellow] Could not index KB file {filename}: {e}")
+                        self._file_chunks[filename] = []
+            for filename in set(self._file_chunks) - set(current_state):
+                del self._file_chunks[filename]
+            self._file_state = current_state
+
+            self.chunks = [chunk for filename in sorted(self._file_chunks) for chunk in self._file_chunks[filename]]
+            self._term_freqs = [Counter(tokenize(chunk['text'])) for chunk in self.chunks]
+            self._doc_freq = Counter(term for freqs in self._term_freqs for term in freqs)
+            lengths = [sum(freqs.values()) for freqs in self._term_freqs]
+            self._avg_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+            self.rebuild_count += 1
+            return True
+
+    def fingerprint(self):
+        """Sorted [filename, mtime_ns, size] entries for every indexed file (after a refresh)."""
+        self.refresh()
+        return [[filename, mtime_ns, size] for filename, (mtime_ns, size) in sorted(self._file_state.items())]
+
+    def search(self, query, top_k=5, sources=None, exclude_sources=None):
+        """Returns up to `top_k` (score, chunk) pairs with a positive BM25 score, best first."""
+        self.refresh()
+        query_terms = set(tokenize(query))
+        if not query_terms or not self.chunks:
+            return []
+        total_docs = len(self.chunks)
+        results = []
+        for chunk, freqs in zip(self.chunks, self._term_freqs):
+            if sources and chunk['source'] not in sources: continue
+            if exclude_sources and chunk['source'] in exclude_sources: continue
+            doc_length = sum(freqs.values())
+            score = 0.0
+            for term in query_terms:
+                tf = freqs.get(term, 0)
+                if not tf: continue
+                df = self._doc_freq[term]
+                idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+                score += idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * doc_length / (self._avg_length or 1)))
+            if score > 0:
+                results.append((score, chunk))
+        results.sort(key=lambda item: item[0], reverse=True)
+        return results[:top_k]
+
+    def build_context(self, query, top_k=6, token_budget=600, sources=None, exclude_sources=None):
+        """Concatenates the most relevant chunks (labelled by source file) without exceeding `token_budget`."""
+        parts = []
+        used_tokens = 0
+        for _, chunk in self.search(query, top_k, sources, exclude_sources):
+            part = f"[{chunk['source']}]\n{chunk['text']}"
+            part_tokens = estimate_tokens(part)
+            if used_tokens + part_tokens > token_budget:
+                continue # A smaller, lower-ranked chunk may still fit
+            parts.append(part)
+            used_tokens += part_tokens
+        return "\n\n".join(parts)
+
+_shared_index = None
+_shared_index_lock = threading.Lock()
+
+def get_kb_index(kb_dir=KB_DIR):
+    """Process-wide index: built on first use, then only refreshed for changed files."""
+    global _shared_index
+    with _shared_index_lock:
+        if _shared_index is None or _shared_index.kb_dir != kb_dir:
+            _shared_index = KnowledgeBaseIndex(kb_dir)
+        return _shared_index
+
+if __name__ == "__main__":
+    import sys
+    console.print(Panel("Knowledge Base Retrieval Index", title="[bold magenta]Agent Script[/bold magenta]"))
+    index = get_kb_index()
+    index.refresh()
+    console.print(f"[blue]Info:[/blue] Indexed [b]{len(index.chunks)}[/b] chunks from [b]{len(index.fingerprint())}[/b] KB files in {KB_DIR}.")
+
+    query_text = " ".join(sys.argv[1:]) or "How to get started with Bybit Earn staking"
+    table = Table(title=f"[bold blue]Top chunks for:[/bold blue] {query_text}", show_lines=True)
+    table.add_column("Score", style="cyan", no_wrap=True)
+    table.add_column("Source", style="magenta", no_wrap=True)
+    table.add_column("Chunk")
+    for score, chunk in index.search(query_text, top_k=5):
+        table.add_row(f"{score:.2f}", chunk['source'], chunk['text'])
+    console.print(table)
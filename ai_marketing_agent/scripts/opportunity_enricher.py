@@ -0,0 +1,222 @@
+import os
+import re
+import json
+import time
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit
+from datetime import datetime
+
+# Rich imports for CLI output
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+console = Console()
+
+# Sibling scripts: pooled concurrent fetching and the persistent response cache
+import http_fetcher
+import http_cache
+
+OUTPUT_DIR = os.path.join(os.path.dirname(__file__), '../generated_content')
+RECORDS_FILE = os.path.join(OUTPUT_DIR, f"opportunity_records_{datetime.now().strftime('%Y%m%d')}.json")
+
+ENRICHMENT_SETTINGS = {
+    'max_in_flight': 16,                # Pages fetched at once
+    'per_host_requests_per_second': 1.0,
+    'timeout': 8,                       # Connect/read timeout per request, seconds
+    'max_read_seconds': 10.0,           # Wall-clock cap on downloading one page
+    'max_retries': 1,
+    'max_bytes': 262144,                # Only the first 256 KB of a page are read; the head and most nav links are in there
+    'preferred_languages': ["en"],
+    'cache': {},                        # http_cache.HttpResponseCache settings; {'enabled': False} to always refetch
+}
+
+SUBMISSION_PATTERNS = {
+    'write for us': re.compile(r"write[\s\-_]*for[\s\-_]*us", re.IGNORECASE),
+    'guest post': re.compile(r"guest[\s\-_]*(post|blog|author|article)", re.IGNORECASE),
+    'submit article': re.compile(r"submit[\s\-_]*(an?[\s\-_]*)?(article|post|story|content|guest)", re.IGNORECASE),
+    'contributor': re.compile(r"(become[\s\-_]*a[\s\-_]*)?contribut(or|e)[\s\-_]*(guidelines|to us)?", re.IGNORECASE),
+    'submission guidelines': re.compile(r"submission[\s\-_]*guidelines|editorial[\s\-_]*guidelines", re.IGNORECASE),
+    'forum / community': re.compile(r"\b(forum|community|discussion|new[\s\-_]*thread)\b", re.IGNORECASE),
+}
+CRYPTO_TERMS_PATTERN = re.compile(
+    r"\b(crypto\w*|bitcoin|btc|ethereum|eth|blockchain|defi|nft|web3|altcoins?|stablecoins?|tokens?|staking|"
+    r"exchange|trading|bybit|binance|coinbase|kraken|wallet|satoshi)\b", re.IGNORECASE)
+
+def configure_enrichment(config):
+    """Applies the optional `opportunity_enrichment` settings (any ENRICHMENT_SETTINGS key)."""
+    enrichment_settings = (config or {}).get('opportunity_enrichment')
+    if isinstance(enrichment_settings, dict):
+        for key in ENRICHMENT_SETTINGS:
+            if key in enrichment_settings:
+                ENRICHMENT_SETTINGS[key] = enrichment_settings[key]
+
+class PageHeadParser(HTMLParser):
+    """
+    Single-pass parser that only keeps what enrichment needs: <html lang>, <title>, description/language meta
+    tags, the canonical link, and every <a href> with its text. No tree is built and all other markup is ignored.
+    """
+    def __init__(self, base_url):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.lang = None
+        self.title = ""
+        self.description = ""
+        self.canonical = None
+        self.anchors = [] # [(absolute_href, text)]
+        self._in_title = False
+        self._anchor_href = None
+        self._anchor_text = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            href = dict(attrs).get("href")
+            if href and not href.startswith(("#", "javascript:", "mailto:")):
+                self._anchor_href = urljoin(self.base_url, href)
+                self._anchor_text = []
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "meta":
+            attributes = dict(attrs)
+            name = (attributes.get("name") or attributes.get("property") or "").lower()
+            if name in ("description", "og:description") and not self.description:
+                self.description = (attributes.get("content") or "").strip()
+            elif (attributes.get("http-equiv") or "").lower() == "content-language" and not self.lang:
+                self.lang = (attributes.get("content") or "").strip() or None
+        elif tag == "link" and "canonical" in (dict(attrs).get("rel") or "").lower():
+            self.canonical = dict(attrs).get("href")
+        elif tag == "html":
+            self.lang = dict(attrs).get("lang") or self.lang
+
+    def handle_endtag(self, tag):
+        if tag == "title":
+            self._in_title = False
+        elif tag == "a" and self._anchor_href:
+            self.anchors.append((self._anchor_href, " ".join("".join(self._anchor_text).split())))
+            self._anchor_href = None
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+        elif self._anchor_href:
+            self._anchor_text.append(data)
+
+def parse_page_head(html, base_url):
+    parser = PageHeadParser(base_url)
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception as e: # A truncated or badly broken page still yields whatever was parsed before the error
+        console.print(f"[yellow]WARN:[/yellow] HTML parse problem for {base_url}: {e}")
+    return parser
+
+def score_opportunity(url, fetch_result, preferred_languages=("en",)):
+    """Builds the scored opportunity record for one fetched page. Score is 0-100; unreachable pages score 0."""
+    record = {
+        'url': url, 'status': fetch_result['status'], 'error': fetch_result['error'], 'truncated': fetch_result.get('truncated', False),
+        'fetch_seconds': fetch_result['seconds'], 'from_cache': fetch_result.get('from_cache', False),
+        'title': "", 'description': "", 'lang': None, 'canonical': None,
+        'submission_signals': [], 'crypto_terms': [], 'outbound_links': 0, 'crypto_outbound_links': 0, 'score': 0.0,
+    }
+    if fetch_result['status'] != 200:
+        return record
+
+    page = parse_page_head(fetch_result['text'], url)
+    page_host = urlsplit(url).netloc.lower()
+    record.update(title=" ".join(page.title.split()), description=page.description, lang=page.lang, canonical=page.canonical)
+
+    # Submission signals can come from the URL, the title/description, or links such as "Write for us" in the nav
+    signal_haystack = " ".join([url, record['title'], record['description']] + [f"{href} {text}" for href, text in page.anchors if urlsplit(href).netloc.lower() == page_host])
+    record['submission_signals'] = [name for name, pattern in SUBMISSION_PATTERNS.items() if pattern.search(signal_haystack)]
+
+    record['crypto_terms'] = sorted({match.lower() for match in CRYPTO_TERMS_PATTERN.findall(f"{record['title']} {record['description']}")})
+    outbound = [(href, text) for href, text in page.anchors if urlsplit(href).netloc and urlsplit(href).netloc.lower() != page_host]
+    record['outbound_links'] = len(outbound)
+    record['crypto_outbound_links'] = sum(1 for href, text in outbound if CRYPTO_TERMS_PATTERN.search(f"{href} {text}"))
+
+    score = 20.0 # Reachable page
+    score += min(35.0, 20.0 * len([s for s in record['submission_signals'] if s != 'forum / community']) + 10.0 * ('forum / community' in record['submission_signals']))
+    score += min(25.0, 5.0 * len(record['crypto_terms']))
+    if record['outbound_links']:
+        score += 10.0 * record['crypto_outbound_links'] / record['outbound_links']
+    if record['description']:
+        score += 5.0
+    if not record['lang'] or record['lang'].lower().split('-')[0] in preferred_languages:
+        score += 5.0
+    record['score'] = round(min(100.0, score), 1)
+    return record
+
+def _score_isolated(url, fetch_result, preferred_languages):
+    """score_opportunity(), except that a page it cannot handle becomes a 0-score record with `error` set instead of failing the batch."""
+    try:
+        return score_opportunity(url, fetch_result, preferred_languages)
+    except Exception as e:
+        console.print(f"[yellow]WARN:[/yellow] Could not score {url}: {e}")
+        record = score_opportunity(url, dict(fetch_result, status=None, text=""), preferred_languages)
+        record.update(status=fetch_result.get('status'), error=f"{type(e).__name__}: {e}")
+        return record
+
+def enrich_opportunities(urls, settings=None):
+    """
+    Fetches every candidate URL concurrently (bounded pool, per-host politeness, byte and time limits per page),
+    parses only head and anchor tags, and returns scored opportunity records, best first. A page that cannot be
+    fetched or scored gets a 0-score record with `error` set; it never fails the other pages.
+    """
+    enrichment_settings = dict(ENRICHMENT_SETTINGS)
+    enrichment_settings.update(settings or {})
+    urls = list(dict.fromkeys(urls)) # Unique, order kept
+    if not urls:
+        return []
+
+    cache_settings = dict(http_cache.DEFAULT_HTTP_CACHE_SETTINGS, **enrichment_settings['cache'])
+    fetcher = http_fetcher.ConcurrentFetcher({key: enrichment_settings[key] for key in ('max_in_flight', 'per_host_requests_per_second', 'timeout', 'max_read_seconds', 'max_retries')},
+                                             cache=http_cache.HttpResponseCache(cache_settings) if cache_settings['enabled'] else None)
+    start_time = time.perf_counter()
+    with console.status(f"[b blue]Enriching {len(urls)} candidate pages...[/b blue]", spinner="earth"):
+        fetch_results = fetcher.fetch_many(urls, max_bytes=enrichment_settings['max_bytes'])
+    fetcher.close()
+
+    records = [_score_isolated(url, fetch_result, enrichment_settings['preferred_languages']) for url, fetch_result in zip(urls, fetch_results)]
+    records.sort(key=lambda record: record['score'], reverse=True)
+    reachable = sum(1 for record in records if record['status'] == 200 and not record['error'])
+    console.print(f"[green]SUCCESS:[/green] Enriched {len(records)} pages in {time.perf_counter() - start_time:.2f}s ({reachable} reachable, "
+                  f"{fetcher.stats['cache_hits']} from cache, {sum(1 for r in records if r['truncated'])} truncated at {enrichment_settings['max_bytes']} bytes).")
+    return records
+
+def save_opportunity_records(records, path=RECORDS_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    try:
+        with open(path, 'w') as f:
+            json.dump({'generated_at': datetime.now().isoformat(timespec='seconds'), 'records': records}, f, indent=2)
+        console.print(f"[green]SUCCESS:[/green] Saved {len(records)} scored opportunity records to [link=file://{os.path.abspath(path)}]{path}[/link]")
+    except IOError as e:
+        console.print(f"[bold red]IO ERROR:[/bold red] Could not save opportunity records: {e}")
+
+def print_opportunity_records(records, limit=15):
+    table = Table(title="[bold blue]Top Scored Opportunities[/bold blue]", show_lines=True)
+    table.add_column("Score", style="cyan", no_wrap=True)
+    table.add_column("URL / Title", style="magenta", overflow="fold")
+    table.add_column("Signals", overflow="fold")
+    table.add_column("Crypto", overflow="fold")
+    for record in records[:limit]:
+        status = record['title'] or f"[dim]{record['error'] or record['status']}[/dim]"
+        table.add_row(f"{record['score']:.1f}", f"{record['url']}\n{status}", ", ".join(record['submission_signals']) or "-",
+                      f"{', '.join(record['crypto_terms'][:5]) or '-'}\n{record['crypto_outbound_links']}/{record['outbound_links']} outbound")
+    console.print(table)
+
+if __name__ == "__main__":
+    import sys
+    console.print(Panel("Opportunity Enrichment Crawler", title="[bold magenta]Agent Script[/bold magenta]"))
+    candidate_urls = sys.argv[1:]
+    if not candidate_urls:
+        # Default to the URLs found by the latest opportunity_finder run
+        import opportunity_finder
+        try:
+            with open(opportunity_finder.OPPORTUNITIES_FILE, 'r') as f:
+                candidate_urls = [line[2:].strip() for line in f if line.startswith("- http")]
+        except FileNotFoundError:
+            console.print(f"[yellow]WARN:[/yellow] No URLs given and {opportunity_finder.OPPORTUNITIES_FILE} not found. Run opportunity_finder.py first or pass URLs.")
+    if candidate_urls:
+        opportunity_records = enrich_opportunities(candidate_urls)
+        print_opportunity_records(opportunity_records)
+        save_opportunity_records(opportunity_records)
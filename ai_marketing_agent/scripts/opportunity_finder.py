@@ -1,8 +1,8 @@
 import os
+import time
 import yaml
-import requests
 from bs4 import BeautifulSoup
-from urllib.parse import quote_plus
+from html.parser import HTMLParser
 from datetime import datetime
 
 # Rich imports for CLI output
@@ -12,6 +12,12 @@ from rich.table import Table
 
 console = Console()
 
+# Sibling scripts: pooled, rate-limited concurrent HTTP fetching, its persistent response cache, and the cross-run URL index
+import http_fetcher
+import http_cache
+import opportunity_index
+import search_backends
+
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), '../config/settings.yaml')
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), '../generated_content')
 OPPORTUNITIES_FILE = os.path.join(OUTPUT_DIR, f"potential_posting_opportunities_{datetime.now().strftime('%Y%m%d')}.txt")
@@ -37,6 +43,207 @@ def load_settings():
         console.print(f"[bold red]ERROR:[/bold red] Error loading configuration from {CONFIG_PATH}: {e}")
         return None
 
+DEFAULT_QUERY_TEMPLATES = [
+    "{keyword} blogs accepting guest posts",
+    "{keyword} forums community",
+    "write for us {keyword}",
+    "best {keyword} blogs to read",
+    "{keyword} news sites submit article",
+]
+SEARCH_SETTINGS = {
+    'backend': "scrape", # A SEARCH_BACKEND_FACTORIES name: "scrape", "fixture" or "google_cse"
+    'search_base_url': "https://www.google.com/search", # Scrape backend; point at search_standin_server.py for offline tests
+    'num_results': 10,
+    'query_templates': DEFAULT_QUERY_TEMPLATES,
+    'html_parser': "stream", # "stream" (SearchAnchorParser) or "beautifulsoup" (reference implementation)
+    'fetch': {'max_in_flight': 8, 'per_host_requests_per_second': 1.0}, # http_fetcher.ConcurrentFetcher settings
+    'cache': {}, # http_cache.HttpResponseCache settings (enabled, path, ttl_hours, max_megabytes)
+    'index': {}, # opportunity_index.OpportunityIndex settings (enabled, path, bloom_capacity, bloom_error_rate)
+    'fixtures': {'dir': search_backends.DEFAULT_FIXTURE_DIR, 'record': False}, # Fixture backend; `record` fills gaps by scraping
+    'google_cse': {'api_key_env_var': "GOOGLE_CSE_API_KEY", 'cx': None}, # Google Custom Search JSON API backend
+}
+_search_caches = {}
+_opportunity_indexes = {}
+
+def configure_search(config):
+    """Applies the optional `opportunity_finder` settings (backend, search_base_url, num_results, query_templates, html_parser, fetch, cache, index, fixtures, google_cse)."""
+    finder_settings = (config or {}).get('opportunity_finder')
+    if isinstance(finder_settings, dict):
+        for key in SEARCH_SETTINGS:
+            if key in finder_settings:
+                SEARCH_SETTINGS[key] = finder_settings[key]
+
+def get_search_cache():
+    """The persistent search response cache for the current settings, or None if disabled."""
+    cache_settings = dict(http_cache.DEFAULT_HTTP_CACHE_SETTINGS, **SEARCH_SETTINGS['cache'])
+    if not cache_settings['enabled']:
+        return None
+    cache_id = tuple(sorted(cache_settings.items()))
+    if cache_id not in _search_caches:
+        _search_caches[cache_id] = http_cache.HttpResponseCache(cache_settings)
+    return _search_caches[cache_id]
+
+def get_opportunity_index():
+    """The persistent cross-run opportunity URL index for the current settings, or None if disabled."""
+    index_settings = dict(opportunity_index.DEFAULT_OPPORTUNITY_INDEX_SETTINGS, **SEARCH_SETTINGS['index'])
+    if not index_settings['enabled']:
+        return None
+    index_id = tuple(sorted(index_settings.items()))
+    if index_id not in _opportunity_indexes:
+        _opportunity_indexes[index_id] = opportunity_index.OpportunityIndex(index_settings)
+    return _opportunity_indexes[index_id]
+
+def get_search_fetcher():
+    return http_fetcher.get_shared_fetcher(SEARCH_SETTINGS['fetch'], cache=get_search_cache())
+
+def _create_scrape_backend():
+    return search_backends.HtmlScrapeBackend(SEARCH_SETTINGS['search_base_url'], get_search_fetcher(), parse_search_results)
+
+def _create_fixture_backend():
+    fixture_settings = SEARCH_SETTINGS['fixtures']
+    return search_backends.FixtureSearchBackend(fixture_settings.get('dir', search_backends.DEFAULT_FIXTURE_DIR), parse_search_results,
+                                                record_from=_create_scrape_backend() if fixture_settings.get('record') else None)
+
+def _create_google_cse_backend():
+    cse_settings = SEARCH_SETTINGS['google_cse']
+    api_key = os.getenv(cse_settings.get('api_key_env_var', "GOOGLE_CSE_API_KEY"))
+    if not api_key or not cse_settings.get('cx'):
+        raise ValueError(f"google_cse backend needs the {cse_settings.get('api_key_env_var')} environment variable and opportunity_finder.google_cse.cx")
+    return search_backends.GoogleCustomSearchBackend(api_key, cse_settings['cx'], get_search_fetcher())
+
+# name -> factory(); register another engine with register_search_backend instead of touching parsing or scoring
+SEARCH_BACKEND_FACTORIES = {'scrape': _create_scrape_backend, 'fixture': _create_fixture_backend, 'google_cse': _create_google_cse_backend}
+
+def register_search_backend(name, factory):
+    """Makes `backend: <name>` available; `factory()` returns a search_backends.SearchBackend."""
+    SEARCH_BACKEND_FACTORIES[name] = factory
+
+def get_search_backend():
+    return SEARCH_BACKEND_FACTORIES[SEARCH_SETTINGS['backend']]()
+
+def build_search_queries(keywords, templates=None):
+    """Expands every keyword into every query template ("{keyword}" placeholder), dropping duplicates but keeping order."""
+    queries = []
+    for keyword in keywords:
+        for template in templates or SEARCH_SETTINGS['query_templates']:
+            query = template.format(keyword=keyword)
+            if query not in queries:
+                queries.append(query)
+    return queries
+
+def parse_search_results_bs4(html, num_results=10):
+    """Reference implementation: builds the full BeautifulSoup tree, walks every <a>, then falls back to div.g blocks."""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    urls = []
+    link_tags = soup.find_all('a')
+    found_count = 0
+    for link_tag in link_tags:
+        href = link_tag.get('href')
+        if href and href.startswith("/url?q="):
+            actual_url = href.split("/url?q=")[1].split("&sa=")[0]
+            if actual_url.startswith("http") and "google.com" not in actual_url:
+                urls.append(actual_url)
+                found_count += 1
+                if found_count >= num_results:
+                    break
+        elif href and href.startswith("http") and "google.com" not in href and link_tag.h3:
+            urls.append(href)
+            found_count +=1
+            if found_count >= num_results:
+                break
+
+    if not urls:
+        for item in soup.find_all('div', attrs={'class': 'g'}):
+            link_tag = item.find('a', href=True)
+            if link_tag and link_tag['href'].startswith("http") and "google.com" not in link_tag['href']:
+                urls.append(link_tag['href'])
+                if len(urls) >= num_results:
+                    break
+    return list(set(urls)) # Return unique URLs
+
+def _is_result_url(url):
+    return url.startswith("http") and "google.com" not in url
+
+class SearchAnchorParser(HTMLParser):
+    """
+    Streaming equivalent of parse_search_results_bs4. Only <a>, <h3> and <div> tags are looked at and no tree is
+    built; the div.g fallback candidates are collected in the same pass. Stops being fed once num_results URLs
+    were found.
+    """
+    def __init__(self, num_results):
+        super().__init__(convert_charrefs=True)
+        self.num_results = num_results
+        self.urls = []
+        self.fallback_urls = [] # First <a href> of every div.g, used only when no result anchor was found
+        self._anchor_href = None
+        self._anchor_has_h3 = False
+        self._div_stack = [] # One [is_result_block, anchor_taken] entry per open <div>
+
+    @property
+    def done(self):
+        return len(self.urls) >= self.num_results
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            href = dict(attrs).get("href")
+            if href is None:
+                return
+            for div in self._div_stack:
+                if div[0] and not div[1]:
+                    div[1] = True
+                    if _is_result_url(href) and len(self.fallback_urls) < self.num_results:
+                        self.fallback_urls.append(href)
+            if href.startswith("/url?q="):
+                actual_url = href.split("/url?q=")[1].split("&sa=")[0]
+                if _is_result_url(actual_url) and not self.done:
+                    self.urls.append(actual_url)
+            elif _is_result_url(href):
+                self._anchor_href, self._anchor_has_h3 = href, False
+        elif tag == "h3":
+            self._anchor_has_h3 = self._anchor_href is not None
+        elif tag == "div":
+            self._div_stack.append(["g" in (dict(attrs).get("class") or "").split(), False])
+
+    def handle_endtag(self, tag):
+        if tag == "a" and self._anchor_href:
+            if self._anchor_has_h3 and not self.done:
+                self.urls.append(self._anchor_href)
+            self._anchor_href = None
+        elif tag == "div" and self._div_stack:
+            self._div_stack.pop()
+
+def parse_search_results_stream(html, num_results=10, chunk_size=32768):
+    """Extracts result URLs in one streaming pass with SearchAnchorParser. Same results as parse_search_results_bs4."""
+    parser = SearchAnchorParser(num_results)
+    for offset in range(0, len(html), chunk_size):
+        parser.feed(html[offset:offset + chunk_size])
+        if parser.done:
+            break
+    else:
+        parser.close()
+    return list(set(parser.urls or parser.fallback_urls))
+
+SEARCH_RESULT_PARSERS = {'stream': parse_search_results_stream, 'beautifulsoup': parse_search_results_bs4}
+
+def parse_search_results(html, num_results=10):
+    """Extracts result URLs from a Google-style results page with the configured `html_parser` backend."""
+    return SEARCH_RESULT_PARSERS[SEARCH_SETTINGS['html_parser']](html, num_results)
+
+def _search_results_from_fetch(query, fetch_result, num_results, backend):
+    """Turns one fetch result into a URL list, or None if the search request failed (errors are reported here)."""
+    status = fetch_result['status']
+    if status != 200:
+        console.print(f"[bold red]HTTP ERROR:[/bold red] Could not fetch search results for '{query}': {status or ''} - {fetch_result['error']}")
+        if status == 429:
+            console.print("[yellow]WARN:[/yellow] Received a 429 (Too Many Requests) error. Google may be rate-limiting. Try again later or reduce search frequency.")
+        return None
+    try:
+        return backend.parse_results(fetch_result['text'], num_results)
+    except Exception as e:
+        console.print(f"[bold red]PARSING ERROR:[/bold red] Error parsing search results for '{query}': {e}")
+        return None
+
 def search_google(query, num_results=10):
     """
     Performs a Google search and returns a list of URLs.
@@ -45,60 +252,75 @@ def search_google(query, num_results=10):
           This is a simplified version for conceptual purposes.
     """
     console.print(f"[blue]INFO:[/blue] Searching Google for: '{query}' (first {num_results} results)")
-    search_url = f"https://www.google.com/search?q={quote_plus(query)}&num={num_results}"
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36"
-    }
+    backend = get_search_backend()
+    with console.status(f"[b blue]Fetching search results for '{query}'...[/b blue]", spinner="earth"):
+        fetch_result = backend.fetch_result_pages([query], num_results)[0]
+    urls = _search_results_from_fetch(query, fetch_result, num_results, backend) or []
+    console.print(f"[green]SUCCESS:[/green] Found {len(urls)} potential URLs for '{query}'.")
+    return urls
 
-    urls = []
+def search_many(queries, num_results=10):
+    """
+    Runs all queries through the configured search backend; HTTP backends share the fetcher (pooled connections,
+    bounded in-flight requests, per-host rate limit, Retry-After aware retries).
+    Returns {query: [urls]}, with None for queries that failed.
+    """
+    queries = list(queries)
     try:
-        with console.status(f"[b blue]Fetching search results for '{query}'...[/b blue]", spinner="earth"):
-            response = requests.get(search_url, headers=headers, timeout=10)
-            response.raise_for_status() # Raise an exception for bad status codes
-
-        soup = BeautifulSoup(response.text, 'html.parser')
+        backend = get_search_backend()
+    except (KeyError, ValueError) as e:
+        console.print(f"[bold red]ERROR:[/bold red] Search backend '{SEARCH_SETTINGS['backend']}' is unavailable: {e}")
+        return {query: None for query in queries}
+    console.print(f"[blue]INFO:[/blue] Running {len(queries)} search queries concurrently against {backend.describe()}...")
+    start_time = time.perf_counter()
+    with console.status(f"[b blue]Fetching search results for {len(queries)} queries...[/b blue]", spinner="earth"):
+        fetch_results = backend.fetch_result_pages(queries, num_results)
+    results = {query: _search_results_from_fetch(query, fetch_result, num_results, backend) for query, fetch_result in zip(queries, fetch_results)}
+    failed = sum(1 for urls in results.values() if urls is None)
+    from_cache = sum(1 for fetch_result in fetch_results if fetch_result['from_cache'])
+    console.print(f"[green]SUCCESS:[/green] {len(queries) - failed}/{len(queries)} searches succeeded in {time.perf_counter() - start_time:.2f}s "
+                  f"({from_cache} from cache), {sum(len(urls) for urls in results.values() if urls)} URLs found.")
+    return results
 
-        link_tags = soup.find_all('a')
-        found_count = 0
-        for link_tag in link_tags:
-            href = link_tag.get('href')
-            if href and href.startswith("/url?q="):
-                actual_url = href.split("/url?q=")[1].split("&sa=")[0]
-                if actual_url.startswith("http") and "google.com" not in actual_url:
-                    urls.append(actual_url)
-                    found_count += 1
-                    if found_count >= num_results:
-                        break
-            elif href and href.startswith("http") and "google.com" not in href and link_tag.h3:
-                urls.append(href)
-                found_count +=1
-                if found_count >= num_results:
-                    break
-
-        if not urls:
-            for item in soup.find_all('div', attrs={'class': 'g'}):
-                link_tag = item.find('a', href=True)
-                if link_tag and link_tag['href'].startswith("http") and "google.com" not in link_tag['href']:
-                    urls.append(link_tag['href'])
-                    if len(urls) >= num_results:
-                        break
-
-        console.print(f"[green]SUCCESS:[/green] Found {len(urls)} potential URLs for '{query}'.")
-    except requests.exceptions.HTTPError as http_err:
-        console.print(f"[bold red]HTTP ERROR:[/bold red] Could not fetch search results for '{query}': {http_err.response.status_code} - {http_err}")
-        if http_err.response.status_code == 429:
-            console.print("[yellow]WARN:[/yellow] Received a 429 (Too Many Requests) error. Google may be rate-limiting. Try again later or reduce search frequency.")
-    except requests.exceptions.RequestException as e:
-        console.print(f"[bold red]REQUEST ERROR:[/bold red] Could not fetch search results for '{query}': {e}")
-    except Exception as e:
-        console.print(f"[bold red]PARSING ERROR:[/bold red] Error parsing search results for '{query}': {e}")
+def find_opportunities(queries, filter_keywords=None, num_results=None):
+    """Searches all queries concurrently and filters the results. Returns ({query: [filtered urls]}, [failed queries])."""
+    search_results = search_many(queries, num_results or SEARCH_SETTINGS['num_results'])
+    opportunities, failed_queries = {}, []
+    for query, urls in search_results.items():
+        if urls is None:
+            failed_queries.append(query)
+        opportunities[query] = filter_and_analyze_urls(urls, filter_keywords) if urls else []
+    return opportunities, failed_queries
 
-    return list(set(urls)) # Return unique URLs
+def keep_new_opportunities(opportunities_map, new_since=None):
+    """
+    Records every URL in the cross-run opportunity index and returns ({query: [new canonical URLs]}, seen_count).
+    A URL counts as new only the first time it is discovered, in any run and under any query; URLs first
+    discovered at or after the `new_since` timestamp (e.g. the start of today's run date) also still count as
+    new, so re-running an interrupted run keeps them. With the index disabled, URLs are only canonicalized and
+    deduplicated within this run.
+    """
+    index = get_opportunity_index()
+    new_opportunities, seen_count, seen_this_run = {}, 0, set()
+    for query, urls in opportunities_map.items():
+        if index is None:
+            canonical_urls = dict.fromkeys(filter(None, map(opportunity_index.canonicalize_opportunity_url, urls)))
+        else:
+            canonical_urls, seen_urls = index.record(urls, query, new_since=new_since)
+            seen_count += len(seen_urls)
+        new_urls = [url for url in canonical_urls if url not in seen_this_run]
+        seen_count += len(canonical_urls) - len(new_urls)
+        seen_this_run.update(new_urls)
+        new_opportunities[query] = new_urls
+    if index is not None:
+        index.save()
+    console.print(f"[blue]INFO:[/blue] {sum(len(urls) for urls in new_opportunities.values())} new opportunity URLs; {seen_count} already discovered earlier were skipped.")
+    return new_opportunities, seen_count
 
 def filter_and_analyze_urls(urls, keywords_to_check=None):
     """
-    Basic filter for URLs (e.g., looking for 'blog', 'forum' in URL or title - title fetching not done here for simplicity).
-    This is a very basic filter. More advanced analysis would be needed.
+    Basic filter for URLs (e.g., looking for 'blog', 'forum' in the URL). Page fetching and scoring of the
+    survivors is done by opportunity_enricher.enrich_opportunities.
     """
     if keywords_to_check is None:
         keywords_to_check = ["blog", "forum", "community", "guest-post", "write-for-us", "submit-article", "discussion"]
@@ -141,31 +363,16 @@ if __name__ == "__main__":
     else:
         console.print("[green]INFO:[/green] Configuration loaded successfully.")
 
+        configure_search(settings)
         target_keywords = settings.get('target_keywords', ["crypto", "Bitcoin"])
-        primary_keyword = target_keywords[0] if target_keywords else "cryptocurrency"
-
-        search_queries = [
-            f"{primary_keyword} blogs accepting guest posts",
-            f"{primary_keyword} forums community",
-            f"write for us {primary_keyword}",
-            f"best {primary_keyword} blogs to read",
-            "crypto news sites submit article"
-        ]
+        search_keywords = settings.get('opportunity_finder', {}).get('keywords') or target_keywords[:3] or ["cryptocurrency"]
+        search_queries = build_search_queries(search_keywords)
 
         filter_keywords = ["blog", "forum", "community", "guest", "write", "submit", "article", "news", "discuss"]
 
-        all_found_opportunities = {}
-
         console.print(f"[cyan]INFO:[/cyan] Starting online search for posting opportunities using {len(search_queries)} queries.")
-
-        for query in search_queries:
-            raw_urls = search_google(query, num_results=10)
-            if raw_urls:
-                filtered = filter_and_analyze_urls(raw_urls, filter_keywords)
-                all_found_opportunities[query] = filtered
-            else:
-                all_found_opportunities[query] = []
-            console.print("-" * 50)
+        all_found_opportunities, _ = find_opportunities(search_queries, filter_keywords)
+        all_found_opportunities, _ = keep_new_opportunities(all_found_opportunities)
 
         if all_found_opportunities and any(all_found_opportunities.values()): # Check if any query yielded results
             console.print(Panel("Search Results Summary", title="[bold blue]Opportunity Scan Complete[/bold blue]", expand=False))
@@ -184,4 +391,10 @@ if __name__ == "__main__":
             console.print("[yellow]WARN:[/yellow] No opportunities found across all search queries.")
             save_opportunities({})
 
+        search_cache = get_search_cache()
+        if search_cache:
+            cache_stats = search_cache.get_stats()
+            console.print(f"[blue]INFO:[/blue] Search cache: {cache_stats['hits']} hits, {cache_stats['revalidated']} revalidated, "
+                          f"{cache_stats['misses']} misses (hit rate {cache_stats['hit_rate']:.0%}), {cache_stats['entries']} entries.")
+
     console.print(Panel("Opportunity Finder Script Finished", style="bold green"))
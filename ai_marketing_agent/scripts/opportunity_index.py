@@ -0,0 +1,215 @@
+import os
+import math
+import time
+import sqlite3
+import hashlib
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Rich library imports
+from rich.console import Console
+
+# Initialize Rich Console
+console = Console()
+
+DEFAULT_OPPORTUNITY_INDEX_SETTINGS = {
+    'enabled': True,
+    'path': os.path.join(os.path.dirname(__file__), '../cache/opportunity_index.sqlite3'),
+    'bloom_capacity': 5_000_000,  # URLs the Bloom filter is sized for; it is rebuilt larger once the index outgrows it
+    'bloom_error_rate': 0.001,    # False-positive rate at capacity; a false positive only costs one SQLite lookup
+}
+TRACKING_PARAM_PREFIXES = ("utm_",)
+TRACKING_PARAMS = {"gclid", "dclid", "fbclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid", "_ga", "_gl", "ref_src", "sa", "ved", "usg"}
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+def canonicalize_opportunity_url(url):
+    """
+    Canonical form used to recognise the same page across runs: http and https are treated alike, the host is
+    lowercased without "www." or a default port, tracking parameters and the fragment are dropped, remaining
+    query parameters are sorted, and trailing slashes are removed from the path.
+    Returns None for anything that is not an http(s) URL.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        return None
+    host = parts.hostname.lower().rstrip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    netloc = host if parts.port in (None, *DEFAULT_PORTS.values()) else f"{host}:{parts.port}"
+    query_items = [(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if name.lower() not in TRACKING_PARAMS and not name.lower().startswith(TRACKING_PARAM_PREFIXES)]
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("https", netloc, path, urlencode(sorted(query_items)), ""))
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings, using double hashing on one BLAKE2b digest. Persisted as a flat file."""
+    HEADER_SIZE = 24
+
+    def __init__(self, capacity, error_rate, bits=None, items=0):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bits if bits is not None else bytearray((self.num_bits + 7) // 8)
+        self.items = items
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.items += 1
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def save(self, path):
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(self.capacity.to_bytes(8, 'little') + int(self.error_rate * 1e9).to_bytes(8, 'little') + self.items.to_bytes(8, 'little'))
+            f.write(self.bits)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path, capacity, error_rate):
+        """The saved filter, or None if it is missing, unreadable, or was built with different sizing."""
+        try:
+            with open(path, 'rb') as f:
+                header = f.read(cls.HEADER_SIZE)
+                bits = bytearray(f.read())
+        except OSError:
+            return None
+        if len(header) != cls.HEADER_SIZE or int.from_bytes(header[:8], 'little') != capacity or \
+                int.from_bytes(header[8:16], 'little') != int(error_rate * 1e9):
+            return None
+        bloom = cls(capacity, error_rate, items=int.from_bytes(header[16:], 'little'))
+        if len(bits) != len(bloom.bits):
+            return None
+        bloom.bits = bits
+        return bloom
+
+class OpportunityIndex:
+    """
+    Persistent index of every opportunity URL ever discovered, keyed by its canonical form and recording domain,
+    path, first/last seen time, times seen and the query that first found it.
+    Membership checks go through an in-memory Bloom filter first: a miss is definitely a new URL and needs no
+    database read, so lookups stay O(1) with millions of stored URLs. The filter is saved next to the database
+    and rebuilt from it when missing, out of date, or outgrown. Safe to share between threads.
+    """
+    def __init__(self, settings=None):
+        self.settings = dict(DEFAULT_OPPORTUNITY_INDEX_SETTINGS)
+        self.settings.update(settings or {})
+        self.bloom_path = self.settings['path'] + ".bloom"
+        self._lock = threading.Lock()
+        self._connection = None
+        self._bloom = None
+        self.stats = {'checked': 0, 'new': 0, 'seen_before': 0, 'bloom_negatives': 0, 'bloom_false_positives': 0, 'invalid': 0}
+
+    def _db(self):
+        """The SQLite connection, created (with the schema) on first use. Call with self._lock held."""
+        if self._connection is None:
+            os.makedirs(os.path.dirname(self.settings['path']) or '.', exist_ok=True)
+            self._connection = sqlite3.connect(self.settings['path'], timeout=30, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS opportunity_urls ("
+                " canonical_url TEXT PRIMARY KEY, domain TEXT NOT NULL, path TEXT NOT NULL, first_seen REAL NOT NULL,"
+                " last_seen REAL NOT NULL, times_seen INTEGER NOT NULL, first_query TEXT) WITHOUT ROWID"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS opportunity_urls_domain ON opportunity_urls (domain, path)")
+            self._connection.commit()
+        return self._connection
+
+    def _get_bloom(self, db):
+        """The Bloom filter, loaded from disk or rebuilt from the database if the saved one does not match it. Call with self._lock held."""
+        if self._bloom is not None:
+            return self._bloom
+        row_count = db.execute("SELECT COUNT(*) FROM opportunity_urls").fetchone()[0]
+        capacity = self.settings['bloom_capacity']
+        while row_count > capacity // 2: # Outgrown: double until the stored URLs fill at most half of it
+            capacity *= 2
+        bloom = BloomFilter.load(self.bloom_path, capacity, self.settings['bloom_error_rate'])
+        if bloom is None or bloom.items != row_count:
+            if row_count:
+                console.print(f"[blue]INFO:[/blue] Rebuilding opportunity index Bloom filter from {row_count} stored URLs...")
+            bloom = BloomFilter(capacity, self.settings['bloom_error_rate'])
+            for (canonical_url,) in db.execute("SELECT canonical_url FROM opportunity_urls"):
+                bloom.add(canonical_url)
+        self._bloom = bloom
+        return bloom
+
+    def record(self, urls, query=None, new_since=None):
+        """
+        Records `urls` as seen now and returns (new_urls, seen_urls) as canonical URLs, each listed once.
+        New means never recorded in any earlier call or run, or first recorded at or after the `new_since`
+        timestamp, so a re-run of an interrupted run still gets back the URLs that run already recorded.
+        """
+        canonical_urls = [canonicalize_opportunity_url(url) for url in urls]
+        unique_urls = list(dict.fromkeys(filter(None, canonical_urls)))
+        now = time.time()
+        new_urls, seen_urls, recent_urls = [], [], []
+        try:
+            with self._lock:
+                self.stats['invalid'] += canonical_urls.count(None)
+                db = self._db()
+                bloom = self._get_bloom(db)
+                for canonical_url in unique_urls:
+                    if canonical_url not in bloom:
+                        self.stats['bloom_negatives'] += 1 # Definitely new, no database read needed
+                    else:
+                        row = db.execute("SELECT first_seen FROM opportunity_urls WHERE canonical_url = ?", (canonical_url,)).fetchone()
+                        if row:
+                            (recent_urls if new_since is not None and row[0] >= new_since else seen_urls).append(canonical_url)
+                            continue
+                        self.stats['bloom_false_positives'] += 1
+                    new_urls.append(canonical_url)
+                    bloom.add(canonical_url)
+                db.executemany("UPDATE opportunity_urls SET last_seen = ?, times_seen = times_seen + 1 WHERE canonical_url = ?",
+                               [(now, canonical_url) for canonical_url in seen_urls + recent_urls])
+                db.executemany("INSERT INTO opportunity_urls VALUES (?, ?, ?, ?, ?, 1, ?)",
+                               [(canonical_url, urlsplit(canonical_url).netloc, urlsplit(canonical_url).path, now, now, query) for canonical_url in new_urls])
+                db.commit()
+                self.stats['checked'] += len(unique_urls)
+                self.stats['new'] += len(new_urls)
+                self.stats['seen_before'] += len(seen_urls)
+        except sqlite3.Error as e:
+            console.print(f"[yellow]OPPORTUNITY INDEX WARN:[/yellow] Could not update the index, treating all URLs as new: {e}")
+            self._bloom = None # May hold URLs that were never committed; rebuilt from the database on next use
+            return unique_urls, []
+        seen_set = set(seen_urls)
+        return [url for url in unique_urls if url not in seen_set], seen_urls
+
+    def domain_summary(self, domain):
+        """{'domain', 'urls', 'first_seen', 'last_seen'} for a (canonical, www-less) domain."""
+        with self._lock:
+            row = self._db().execute("SELECT COUNT(*), MIN(first_seen), MAX(last_seen) FROM opportunity_urls WHERE domain = ?", (domain.lower(),)).fetchone()
+        return {'domain': domain.lower(), 'urls': row[0], 'first_seen': row[1], 'last_seen': row[2]}
+
+    def save(self):
+        """Persists the Bloom filter so the next run does not rebuild it from the database."""
+        with self._lock:
+            if self._bloom is not None:
+                try:
+                    self._bloom.save(self.bloom_path)
+                except OSError as e:
+                    console.print(f"[yellow]OPPORTUNITY INDEX WARN:[/yellow] Could not save Bloom filter (it will be rebuilt next run): {e}")
+
+    def close(self):
+        self.save()
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            try:
+                stats['stored_urls'] = self._db().execute("SELECT COUNT(*) FROM opportunity_urls").fetchone()[0]
+            except sqlite3.Error:
+                stats['stored_urls'] = None
+        return stats
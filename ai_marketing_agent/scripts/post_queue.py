@@ -0,0 +1,135 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+# Rich library imports
+from rich.console import Console
+
+# Initialize Rich Console
+console = Console()
+
+DEFAULT_POST_QUEUE_PATH = os.path.join(os.path.dirname(__file__), '../cache/post_queue.sqlite3')
+JOB_STATUSES = ('pending', 'running', 'done', 'failed')
+
+class PostJobQueue:
+    """
+    Durable (SQLite) queue of scheduled publishing jobs.
+    A job is due once its `run_at` (epoch seconds) has passed; due jobs are handed out highest `priority` first,
+    then earliest `run_at`. Claimed jobs are leased: if the worker dies, the lease runs out and the job is handed
+    out again, so nothing is lost across restarts. A claim is identified by the job's `attempts` count, and
+    complete/retry/fail only take effect while that claim still holds the job, so a worker that outlived its
+    lease cannot overwrite the outcome of the worker that took the job over. Safe to share between threads and processes.
+    """
+    def __init__(self, path=DEFAULT_POST_QUEUE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+
+    def _db(self):
+        """The SQLite connection for this process, created (with the schema) on first use. Call with self._lock held."""
+        if self._connection is None or self._pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            # Autocommit mode; claim() opens its own IMMEDIATE transaction so two workers never claim the same job
+            self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS post_jobs ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT, platform TEXT NOT NULL, payload TEXT NOT NULL,"
+                " run_at REAL NOT NULL, priority INTEGER NOT NULL DEFAULT 0, status TEXT NOT NULL DEFAULT 'pending',"
+                " attempts INTEGER NOT NULL DEFAULT 0, max_attempts INTEGER NOT NULL, last_error TEXT, result TEXT,"
+                " lease_until REAL, created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS post_jobs_due ON post_jobs (status, run_at)")
+            self._pid = os.getpid()
+        return self._connection
+
+    def enqueue(self, platform, payload, run_at=None, priority=0, max_attempts=5):
+        """Adds a job and returns its id. `payload` must be JSON-serialisable; `run_at` defaults to now."""
+        now = time.time()
+        with self._lock:
+            cursor = self._db().execute(
+                "INSERT INTO post_jobs (platform, payload, run_at, priority, max_attempts, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (platform, json.dumps(payload), now if run_at is None else run_at, priority, max_attempts, now, now))
+            return cursor.lastrowid
+
+    def claim(self, limit=1, lease_seconds=600, platforms=None):
+        """
+        Atomically marks up to `limit` due jobs as running and returns them as dicts
+        ({'id', 'platform', 'payload', 'run_at', 'priority', 'attempts', 'max_attempts'}); `attempts` includes this one.
+        Running jobs whose lease expired (their worker died) are due again.
+        """
+        now = time.time()
+        platform_filter = f" AND platform IN ({','.join('?' * len(platforms))})" if platforms else ""
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                rows = db.execute(
+                    "SELECT id, platform, payload, run_at, priority, attempts, max_attempts FROM post_jobs"
+                    " WHERE ((status = 'pending' AND run_at <= ?) OR (status = 'running' AND lease_until < ?))" + platform_filter +
+                    " ORDER BY priority DESC, run_at ASC LIMIT ?", (now, now, *(platforms or ()), limit)).fetchall()
+                db.executemany("UPDATE post_jobs SET status = 'running', attempts = attempts + 1, lease_until = ?, updated_at = ? WHERE id = ?",
+                               [(now + lease_seconds, now, row[0]) for row in rows])
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+        return [{'id': row[0], 'platform': row[1], 'payload': json.loads(row[2]), 'run_at': row[3], 'priority': row[4],
+                 'attempts': row[5] + 1, 'max_attempts': row[6]} for row in rows]
+
+    def _finish(self, job_id, attempts, status, error=None, result=None, run_at=None):
+        """
+        Records the outcome of the claim that returned the job with `attempts`. Returns False, changing nothing, if
+        that claim's lease has lapsed and the job was handed out again (or already finished) in the meantime.
+        """
+        with self._lock:
+            cursor = self._db().execute(
+                "UPDATE post_jobs SET status = ?, last_error = ?, result = ?, run_at = COALESCE(?, run_at), lease_until = NULL, updated_at = ?"
+                " WHERE id = ? AND status = 'running' AND attempts = ?",
+                (status, error, json.dumps(result) if result is not None else None, run_at, time.time(), job_id, attempts))
+        return cursor.rowcount == 1
+
+    def complete(self, job_id, attempts, result=None):
+        return self._finish(job_id, attempts, 'done', result=result)
+
+    def retry(self, job_id, attempts, error, delay_seconds):
+        """Puts a job back in the queue, due again in `delay_seconds`."""
+        return self._finish(job_id, attempts, 'pending', error=error, run_at=time.time() + delay_seconds)
+
+    def fail(self, job_id, attempts, error):
+        return self._finish(job_id, attempts, 'failed', error=error)
+
+    def next_run_at(self, platforms=None):
+        """Earliest run_at of any pending job (or expired lease), or None if the queue has nothing left to do."""
+        platform_filter = f" AND platform IN ({','.join('?' * len(platforms))})" if platforms else ""
+        with self._lock:
+            row = self._db().execute(
+                "SELECT MIN(CASE WHEN status = 'pending' THEN run_at ELSE lease_until END) FROM post_jobs"
+                " WHERE status IN ('pending', 'running')" + platform_filter, tuple(platforms or ())).fetchone()
+        return row[0]
+
+    def last_scheduled_at(self, platform):
+        """Latest run_at among the platform's pending jobs, or None."""
+        with self._lock:
+            return self._db().execute("SELECT MAX(run_at) FROM post_jobs WHERE platform = ? AND status = 'pending'", (platform,)).fetchone()[0]
+
+    def counts(self):
+        """{status: number of jobs} for every status."""
+        with self._lock:
+            rows = self._db().execute("SELECT status, COUNT(*) FROM post_jobs GROUP BY status").fetchall()
+        counts = dict.fromkeys(JOB_STATUSES, 0)
+        counts.update(rows)
+        return counts
+
+    def list_jobs(self, status=None, limit=50):
+        query = "SELECT id, platform, payload, run_at, priority, status, attempts, max_attempts, last_error FROM post_jobs"
+        params = ()
+        if status:
+            query, params = query + " WHERE status = ?", (status,)
+        with self._lock:
+            rows = self._db().execute(query + " ORDER BY run_at ASC LIMIT ?", (*params, limit)).fetchall()
+        return [{'id': row[0], 'platform': row[1], 'title': json.loads(row[2]).get('title'), 'run_at': row[3], 'priority': row[4],
+                 'status': row[5], 'attempts': row[6], 'max_attempts': row[7], 'last_error': row[8]} for row in rows]
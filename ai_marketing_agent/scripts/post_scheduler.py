@@ -1,12 +1,21 @@
 import os
+import json
+import time
 import yaml # To load settings
+import requests
+import random
+import argparse
+import threading
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED, TimeoutError as FuturesTimeoutError
+from html import escape
 import getpass # For password input if not using rich.prompt fully
 
 # Rich imports
 from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Prompt, Confirm
+from rich.table import Table
 
 # Initialize Rich Console
 console = Console()
@@ -17,37 +26,90 @@ try:
     from google.oauth2.credentials import Credentials as UserCredentials
     from google_auth_oauthlib.flow import InstalledAppFlow
     import google.auth.transport.requests
-=======
-
-# Attempt to import Google API client libraries
-try:
-    from google.oauth2.service_account import Credentials as ServiceAccountCredentials # For service account auth
-    from google.oauth2.credentials import Credentials as UserCredentials # For user OAuth
-    from google_auth_oauthlib.flow import InstalledAppFlow # For user OAuth
-    import google.auth.transport.requests # For refreshing credentials
- main
-    from googleapiclient.discovery import build
+    from googleapiclient.discovery import build_from_document
+    from googleapiclient.discovery_cache import get_static_doc
     from googleapiclient.errors import HttpError
+    from googleapiclient.http import HttpRequest
+    import google_auth_httplib2
+    import httplib2
     GOOGLE_LIBS_AVAILABLE = True
 except ImportError:
     console.print("[bold yellow]POST_SCHEDULER_WARNING:[/bold yellow] google-api-python-client or google-auth libraries not found. Blogger posting will be disabled. Please install them: [i]pip install google-api-python-client google-auth-httplib2 google-auth-oauthlib[/i]")
     GOOGLE_LIBS_AVAILABLE = False
 
+    class HttpError(Exception): # Lets the queue worker's `except HttpError` work without the Google libraries
+        pass
+
+# Sibling scripts: durable SQLite job queue for scheduled posts, the record of what was already published, the WordPress REST client
+# and the platform image variants
+import post_queue
+import posting_ledger
+import wordpress_client
+import image_pipeline
+from http_fetcher import HostRateLimiter
+
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), '../config/settings.yaml')
-=======
-    print("POST_SCHEDULER_WARNING: google-api-python-client or google-auth libraries not found. Blogger posting will be disabled. Please install them: pip install google-api-python-client google-auth-httplib2 google-auth-oauthlib")
-    GOOGLE_LIBS_AVAILABLE = False
 
-CONFIG_PATH = os.path.join(os.path.dirname(__file__), '../config/settings.yaml') # Path relative to this script
- main
+POST_QUEUE_SETTINGS = {
+    'path': post_queue.DEFAULT_POST_QUEUE_PATH,
+    'max_workers': 4,             # Jobs published at once
+    'max_posts_per_hour': 30,     # Publishing rate cap across all workers
+    'min_spacing_minutes': 30,    # Gap between consecutive posts on one platform when schedule_post picks the time
+    'max_attempts': 5,
+    'base_retry_delay': 60,       # Seconds; doubled per failed attempt, unless the API sent Retry-After
+    'max_retry_delay': 3600,
+    'lease_seconds': 900,         # A claimed job whose worker died is handed out again after this
+    'poll_seconds': 30,           # Longest sleep while waiting for the next job to become due
+}
+RETRYABLE_HTTP_STATUSES = {408, 429, 500, 502, 503, 504}
+_post_queues = {}
+
+POSTING_LEDGER_SETTINGS = {
+    'enabled': True,
+    'path': posting_ledger.DEFAULT_POSTING_LEDGER_PATH,
+    'lease_seconds': 900,  # An unfinished publish (crashed worker) stops blocking the article after this
+}
+_posting_ledgers = {}
+
+WORDPRESS_SETTINGS = {
+    'max_concurrent_per_site': 2,  # Requests in flight to one site (a site entry's max_concurrent overrides it)
+    'max_parallel_sites': 16,      # Sites one article is published to at once
+    'pool_maxsize': 16,            # Kept-alive connections per site in the shared session
+    'timeout': 30,                 # Seconds (connect and read)
+    'post_status': 'publish',      # Or 'draft' / 'pending' for review before going live
+}
+_wordpress_sites = {} # site_url -> WordPressSite, shared by every publish call
+_wordpress_sites_lock = threading.Lock()
+
+PUBLISH_DISPATCH_SETTINGS = {
+    'max_workers': 16,                # Platform publishes running at once, across all articles
+    'default_timeout_seconds': 180,   # How long the dispatcher waits for a platform before reporting it failed
+    'default_posts_per_minute': None, # No rate limit unless a platform sets one
+    'platforms': {
+        'blogger': {'timeout_seconds': 120, 'posts_per_minute': 10},
+        'wordpress': {'timeout_seconds': 180},
+        'social_media': {'timeout_seconds': 60},
+    },
+}
+_dispatch_executor = None
+_platform_rate_limiters = {} # platform -> HostRateLimiter keyed by the platform name
+_dispatch_lock = threading.Lock()
+
+BLOGGER_SCOPES = ['https://www.googleapis.com/auth/blogger']
+BLOGGER_DISCOVERY_URL = "https://blogger.googleapis.com/$discovery/rest?version=v3"
+BLOGGER_SERVICE_SETTINGS = {
+    'discovery_cache_path': os.path.join(os.path.dirname(__file__), '../cache/blogger_v3_discovery.json'),
+    'discovery_ttl_hours': 168,      # The discovery document is re-downloaded at most weekly
+    'refresh_margin_seconds': 300,   # Credentials are refreshed in the background this long before they expire
+    'http_timeout_seconds': 120,     # Per API request; well under post_queue.lease_seconds, so a stalled publish fails before its job is handed out again
+}
+_blogger_services = {} # (token_path, client_secrets_path) -> {'service', 'credentials', 'refresh_lock'}; one per account
+_blogger_services_lock = threading.Lock()
 
 def load_settings():
     """Loads settings from the YAML configuration file."""
     if not os.path.exists(CONFIG_PATH):
         console.print(f"[bold red]POST_SCHEDULER_ERROR:[/bold red] Configuration file not found at {CONFIG_PATH}. Cannot proceed.")
-=======
-        print(f"POST_SCHEDULER_ERROR: Configuration file not found at {CONFIG_PATH}. Cannot proceed.")
- main
         return None
     try:
         with open(CONFIG_PATH, 'r') as f:
@@ -81,54 +143,23 @@ def prompt_for_credentials(platform_name):
         return {"username": username, "password": password}
     else:
         console.print(f"[yellow]WARN:[/yellow] No username or password provided for '{platform_name}'.")
-=======
-            print(f"POST_SCHEDULER_ERROR: Configuration file {CONFIG_PATH} is empty or malformed.")
-            return None
-        return config
-    except Exception as e:
-        print(f"POST_SCHEDULER_ERROR: Error loading configuration from {CONFIG_PATH}: {e}")
- main
         return None
 
 # --- Blogger Integration ---
-def get_blogger_service(settings):
-    if not GOOGLE_LIBS_AVAILABLE:
-        console.print("[blue]POST_SCHEDULER_INFO:[/blue] Google client libraries not available. Cannot get Blogger service.")
-=======
-    """
-    Authenticates and returns the Blogger API service client.
-    Requires OAuth 2.0 setup.
-    """
-    if not GOOGLE_LIBS_AVAILABLE:
-        print("POST_SCHEDULER_INFO: Google client libraries not available. Cannot get Blogger service.")
- main
-        return None
-
-    blogger_settings = settings.get('posting_platforms', {}).get('blogger', {})
-    if not blogger_settings.get('enabled', False):
-        console.print("[blue]POST_SCHEDULER_INFO:[/blue] Blogger posting is not enabled in settings.yaml.")
-        return None
-
-    console.print("[blue]POST_SCHEDULER_INFO:[/blue] Attempting to get Blogger service...")
-=======
-        print("POST_SCHEDULER_INFO: Blogger posting is not enabled in settings.yaml.")
-        return None
-
-    print("POST_SCHEDULER_INFO: Attempting to get Blogger service...")
- main
-
-    token_path = blogger_settings.get('oauth_token_file', 'blogger_token.json')
-    client_secrets_path = blogger_settings.get('client_secrets_file', 'client_secret_blogger.json')
+def _save_blogger_token(creds, token_path):
+    temp_path = f"{token_path}.tmp"
+    with open(temp_path, 'w') as token_file:
+        token_file.write(creds.to_json())
+    os.replace(temp_path, token_path)
 
+def _load_blogger_credentials(token_path, client_secrets_path):
+    """Valid user credentials from the token file, refreshed or obtained through the OAuth flow if needed, or None."""
     creds = None
     if os.path.exists(token_path):
         try:
-            creds = UserCredentials.from_authorized_user_file(token_path, ['https://www.googleapis.com/auth/blogger'])
+            creds = UserCredentials.from_authorized_user_file(token_path, BLOGGER_SCOPES)
         except Exception as e:
             console.print(f"[yellow]POST_SCHEDULER_WARNING:[/yellow] Could not load token from {token_path}: {e}. Need to re-authenticate.")
-=======
-            print(f"POST_SCHEDULER_WARNING: Could not load token from {token_path}: {e}. Need to re-authenticate.")
- main
 
     if not creds or not creds.valid:
         if creds and creds.expired and creds.refresh_token:
@@ -136,8 +167,7 @@ def get_blogger_service(settings):
                 console.print("[blue]POST_SCHEDULER_INFO:[/blue] Credentials expired, attempting to refresh...")
                 creds.refresh(google.auth.transport.requests.Request())
                 console.print("[green]POST_SCHEDULER_INFO:[/green] Credentials refreshed successfully.")
-                with open(token_path, 'w') as token_file:
-                    token_file.write(creds.to_json())
+                _save_blogger_token(creds, token_path)
                 console.print(f"[blue]POST_SCHEDULER_INFO:[/blue] Refreshed token saved to {token_path}")
             except Exception as e:
                 console.print(f"[bold red]POST_SCHEDULER_ERROR:[/bold red] Could not refresh token: {e}. Manual re-authentication needed.")
@@ -151,82 +181,208 @@ def get_blogger_service(settings):
 
             console.print(f"[blue]POST_SCHEDULER_INFO:[/blue] Attempting to initiate OAuth flow using {client_secrets_path}. This may require user interaction if run in a non-interactive environment for the first time.")
             try:
-                flow = InstalledAppFlow.from_client_secrets_file(client_secrets_path, ['https://www.googleapis.com/auth/blogger'])
+                flow = InstalledAppFlow.from_client_secrets_file(client_secrets_path, BLOGGER_SCOPES)
                 console.print("[yellow]POST_SCHEDULER_INFO: Please follow the instructions in your browser to authorize access.[/yellow]")
                 console.print("[blue]POST_SCHEDULER_INFO: Waiting for OAuth authorization...[/blue]")
                 creds = flow.run_local_server(port=0)
-                with open(token_path, 'w') as token_file:
-                     token_file.write(creds.to_json())
+                _save_blogger_token(creds, token_path)
                 console.print(f"[green]POST_SCHEDULER_INFO:[/green] New token obtained and saved to {token_path}")
             except Exception as e:
                 console.print(f"[bold red]POST_SCHEDULER_ERROR:[/bold red] Failed to complete OAuth flow: {e}")
                 console.print("[blue]Ensure you have a valid client_secrets.json and that the environment allows browser interaction for the first auth.[/blue]")
                 return None
 
-    if not creds:
-        console.print("[bold red]POST_SCHEDULER_ERROR:[/bold red] Blogger authentication failed. Cannot get service.")
-=======
-                print("POST_SCHEDULER_INFO: Credentials expired, attempting to refresh...")
-                creds.refresh(google.auth.transport.requests.Request())
-                print("POST_SCHEDULER_INFO: Credentials refreshed successfully.")
-                # Save the refreshed token
-                with open(token_path, 'w') as token_file:
-                    token_file.write(creds.to_json())
-                print(f"POST_SCHEDULER_INFO: Refreshed token saved to {token_path}")
-            except Exception as e:
-                print(f"POST_SCHEDULER_ERROR: Could not refresh token: {e}. Manual re-authentication needed.")
-                creds = None
-        else:
-            print(f"POST_SCHEDULER_INFO: No valid token found at {token_path} or token cannot be refreshed.")
-            if not os.path.exists(client_secrets_path):
-                print(f"POST_SCHEDULER_ERROR: Client secrets file ('{client_secrets_path}') not found. Cannot initiate OAuth flow.")
-                print("Please download your client_secret.json from Google Cloud Console for your OAuth 2.0 client ID and place it at the configured path.")
-                return None
+    return creds
+
+def load_blogger_discovery_document():
+    """
+    The Blogger v3 discovery document as JSON text, from the local cache while it is younger than
+    discovery_ttl_hours, otherwise downloaded and cached. If the download fails, a stale cached copy or else
+    the copy bundled with the client library is used. Returns None only if none of these exist.
+    """
+    cache_path = BLOGGER_SERVICE_SETTINGS['discovery_cache_path']
+    try:
+        if time.time() - os.path.getmtime(cache_path) < BLOGGER_SERVICE_SETTINGS['discovery_ttl_hours'] * 3600:
+            with open(cache_path, 'r') as f:
+                return f.read()
+    except OSError:
+        pass
+    try:
+        response = requests.get(BLOGGER_DISCOVERY_URL, timeout=30)
+        response.raise_for_status()
+        json.loads(response.text) # Never cache an error page
+        os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+        with open(f"{cache_path}.tmp", 'w') as f:
+            f.write(response.text)
+        os.replace(f"{cache_path}.tmp", cache_path)
+        return response.text
+    except (requests.RequestException, ValueError, OSError) as e:
+        if os.path.exists(cache_path):
+            console.print(f"[yellow]POST_SCHEDULER_WARNING:[/yellow] Could not refresh the Blogger discovery document ({e}); using the cached copy.")
+            with open(cache_path, 'r') as f:
+                return f.read()
+        console.print(f"[yellow]POST_SCHEDULER_WARNING:[/yellow] Could not download the Blogger discovery document ({e}); using the copy bundled with the client library.")
+        return get_static_doc('blogger', 'v3')
 
-            print(f"POST_SCHEDULER_INFO: Attempting to initiate OAuth flow using {client_secrets_path}. This may require user interaction if run in a non-interactive environment for the first time.")
+def _build_blogger_service(creds):
+    def build_request(http, *args, **kwargs):
+        # A fresh authorized connection per request lets several threads share the one service object
+        http = httplib2.Http(timeout=BLOGGER_SERVICE_SETTINGS['http_timeout_seconds'])
+        return HttpRequest(google_auth_httplib2.AuthorizedHttp(creds, http=http), *args, **kwargs)
+
+    discovery_document = load_blogger_discovery_document()
+    if discovery_document is None:
+        raise RuntimeError("No Blogger v3 discovery document available (download failed, nothing cached or bundled)")
+    return build_from_document(discovery_document, credentials=creds, requestBuilder=build_request)
+
+def _refresh_blogger_credentials(account, token_path):
+    with account['refresh_lock']:
+        account['credentials'].refresh(google.auth.transport.requests.Request())
+        _save_blogger_token(account['credentials'], token_path)
+
+def _start_blogger_token_refresher(account_key, account):
+    """Daemon thread that refreshes the account's credentials refresh_margin_seconds before they expire, for as long as the account stays cached."""
+    token_path = account_key[0]
+
+    def refresh_loop():
+        while _blogger_services.get(account_key) is account:
+            expiry = account['credentials'].expiry # Naive UTC datetime, or None if unknown
+            seconds_left = (expiry - datetime.utcnow()).total_seconds() if expiry else 3000
+            time.sleep(max(30.0, seconds_left - BLOGGER_SERVICE_SETTINGS['refresh_margin_seconds']))
+            if _blogger_services.get(account_key) is not account:
+                return
             try:
-                flow = InstalledAppFlow.from_client_secrets_file(client_secrets_path, ['https://www.googleapis.com/auth/blogger'])
-                print("POST_SCHEDULER_INFO: Please follow the instructions in your browser to authorize access.")
-                print("POST_SCHEDULER_INFO: Waiting for OAuth authorization...")
-                creds = flow.run_local_server(port=0)
-                with open(token_path, 'w') as token_file:
-                     token_file.write(creds.to_json())
-                print(f"POST_SCHEDULER_INFO: New token obtained and saved to {token_path}")
+                _refresh_blogger_credentials(account, token_path)
             except Exception as e:
-                print(f"POST_SCHEDULER_ERROR: Failed to complete OAuth flow: {e}")
-                print("Ensure you have a valid client_secrets.json and that the environment allows browser interaction for the first auth.")
-                return None
+                console.print(f"[yellow]POST_SCHEDULER_WARNING:[/yellow] Background refresh of Blogger credentials failed: {e}")
+
+    threading.Thread(target=refresh_loop, name="blogger-token-refresh", daemon=True).start()
 
-    if not creds: # Final check
-        print("POST_SCHEDULER_ERROR: Blogger authentication failed. Cannot get service.")
- main
+def get_blogger_service(settings):
+    """
+    The authorized Blogger API service for the configured account. It is built once per process (token file,
+    discovery document, connection setup) and reused by every later call and thread; a background thread keeps
+    its credentials fresh.
+    """
+    if not GOOGLE_LIBS_AVAILABLE:
+        console.print("[blue]POST_SCHEDULER_INFO:[/blue] Google client libraries not available. Cannot get Blogger service.")
         return None
 
-    try:
-        service = build('blogger', 'v3', credentials=creds, static_discovery=False)
-        console.print("[green]POST_SCHEDULER_INFO:[/green] Blogger service client created successfully.")
-        return service
-    except Exception as e:
-        console.print(f"[bold red]POST_SCHEDULER_ERROR:[/bold red] Failed to build Blogger service: {e}")
+    blogger_settings = settings.get('posting_platforms', {}).get('blogger', {})
+    if not blogger_settings.get('enabled', False):
+        console.print("[blue]POST_SCHEDULER_INFO:[/blue] Blogger posting is not enabled in settings.yaml.")
         return None
 
-def post_to_blogger(service, settings, title, content_html, labels=None, affiliate_link_override=None, image_path_for_post=None):
-    if not service:
-        console.print("[bold red]POST_SCHEDULER_ERROR:[/bold red] Blogger service not available, cannot post.")
-=======
-        print("POST_SCHEDULER_INFO: Blogger service client created successfully.")
-        return service
-    except Exception as e:
-        print(f"POST_SCHEDULER_ERROR: Failed to build Blogger service: {e}")
+    token_path = blogger_settings.get('oauth_token_file', 'blogger_token.json')
+    client_secrets_path = blogger_settings.get('client_secrets_file', 'client_secret_blogger.json')
+    account_key = (os.path.abspath(token_path), os.path.abspath(client_secrets_path))
+
+    with _blogger_services_lock:
+        account = _blogger_services.get(account_key)
+        if account is not None:
+            if not account['credentials'].valid: # E.g. the machine slept through the background refresh
+                try:
+                    _refresh_blogger_credentials(account, token_path)
+                except Exception as e:
+                    console.print(f"[yellow]POST_SCHEDULER_WARNING:[/yellow] Could not refresh cached Blogger credentials ({e}); re-authenticating.")
+                    del _blogger_services[account_key]
+                    account = None
+            if account is not None:
+                return account['service']
+
+        console.print("[blue]POST_SCHEDULER_INFO:[/blue] Attempting to get Blogger service...")
+        creds = _load_blogger_credentials(token_path, client_secrets_path)
+        if not creds:
+            console.print("[bold red]POST_SCHEDULER_ERROR:[/bold red] Blogger authentication failed. Cannot get service.")
+            return None
+        try:
+            service = _build_blogger_service(creds)
+        except Exception as e:
+            console.print(f"[bold red]POST_SCHEDULER_ERROR:[/bold red] Failed to build Blogger service: {e}")
+            return None
+        account = {'service': service, 'credentials': creds, 'refresh_lock': threading.Lock()}
+        _blogger_services[account_key] = account
+    _start_blogger_token_refresher(account_key, account)
+    console.print("[green]POST_SCHEDULER_INFO:[/green] Blogger service client created successfully.")
+    return service
+
+# --- Posting Ledger ---
+def configure_posting_ledger(config):
+    """Applies the optional `posting_ledger` settings (any POSTING_LEDGER_SETTINGS key)."""
+    ledger_settings = (config or {}).get('posting_ledger')
+    if isinstance(ledger_settings, dict):
+        POSTING_LEDGER_SETTINGS.update({key: value for key, value in ledger_settings.items() if key in POSTING_LEDGER_SETTINGS})
+
+def get_posting_ledger(settings=None):
+    """The shared PostingLedger, or None when `posting_ledger.enabled` is false."""
+    configure_posting_ledger(settings)
+    if not POSTING_LEDGER_SETTINGS['enabled']:
+        return None
+    path = POSTING_LEDGER_SETTINGS['path']
+    if path not in _posting_ledgers:
+        _posting_ledgers[path] = posting_ledger.PostingLedger(path, POSTING_LEDGER_SETTINGS['lease_seconds'])
+    return _posting_ledgers[path]
+
+def _report_ledger_skip(platform_name, title, entry):
+    """Logs why a publish was skipped and returns the publisher result: True if the article is already live."""
+    if entry['status'] == 'published':
+        console.print(f"[green]POST_SCHEDULER_INFO:[/green] '{title}' is already on {platform_name} (post {entry['remote_id']}, {entry['remote_url'] or 'no URL'}); not publishing it again.")
+        return True
+    console.print(f"[yellow]POST_SCHEDULER_WARNING:[/yellow] '{title}' is being published to {platform_name} by another worker; skipping.")
+    return False
+
+def _recent_blogger_posts_by_title(service, blog_id, recent_posts=50):
+    """{title: post} for the blog's most recent posts (any status). Lookup errors propagate: a failed check must not be mistaken for "no earlier copy"."""
+    page = service.posts().list(blogId=blog_id, status=['LIVE', 'DRAFT', 'SCHEDULED'], fetchBodies=False, maxResults=recent_posts).execute()
+    posts_by_title = {}
+    for post in page.get('items', []):
+        posts_by_title.setdefault(post.get('title', '').strip(), post)
+    return posts_by_title
+
+def _find_blogger_post(service, blog_id, title, recent_posts=50):
+    """Looks for a post titled `title` among the blog's most recent posts. Used to settle unconfirmed ledger entries."""
+    return _recent_blogger_posts_by_title(service, blog_id, recent_posts).get((title or '').strip())
+
+def _platform_image(settings, image_path, platform):
+    """The prepared (resized, compressed, cached) variant of `image_path` for `platform`, or the original image."""
+    if not image_path or not os.path.exists(image_path):
+        return image_path
+    image_pipeline.configure_image_pipeline(settings)
+    return image_pipeline.platform_image_path(image_path, platform)
+
+def _blogger_image_html(settings, image_path, title):
+    """
+    An <img> block for the Blogger variant of `image_path`, or None. The Blogger API cannot upload images, so the
+    image needs a hosted URL: the Blogger variant under image_pipeline.public_base_url, or else wherever another
+    platform already uploaded this source image. Uploads are recorded in the posting ledger under the hash of the
+    file sent (e.g. the WordPress variant), so every cached variant of the source, and the source itself, is tried.
+    """
+    variant_path = _platform_image(settings, image_path, 'blogger')
+    if not variant_path or not os.path.exists(variant_path):
+        console.print(f"[yellow]POST_SCHEDULER_WARNING:[/yellow] Image '{image_path}' not found; posting without it.")
+        return None
+    ledger = get_posting_ledger(settings)
+    image_url = image_pipeline.public_variant_url(variant_path)
+    if not image_url and ledger:
+        variants = image_pipeline.cached_variants(image_path) if image_pipeline.IMAGE_PIPELINE_SETTINGS['enabled'] else {}
+        candidate_hashes = [variant['variant_hash'] for _, variant in sorted(variants.items(), key=lambda item: item[0] != 'blogger')]
+        candidate_hashes.append(image_pipeline.file_sha256(image_path)) # Uploaded as-is while the pipeline was off
+        image_url = next(filter(None, map(ledger.find_remote_url, candidate_hashes)), None)
+    if not image_url:
+        console.print(f"[yellow]POST_SCHEDULER_WARNING:[/yellow] No hosted URL for image '{os.path.basename(variant_path)}' "
+                      "(set image_pipeline.public_base_url); posting to Blogger without it.")
         return None
+    return f'<p><img src="{escape(image_url)}" alt="{escape(title or "")}" loading="lazy" style="max-width:100%;height:auto"/></p>'
 
-def post_to_blogger(service, settings, title, content_html, labels=None, affiliate_link_override=None, image_path_for_post=None):
+def post_to_blogger(service, settings, title, content_html, labels=None, affiliate_link_override=None, image_path_for_post=None, raise_http_errors=False):
     """
-    Posts an article to a Blogger blog.
+    Publishes one post. With `raise_http_errors`, an HttpError is re-raised after logging so the caller can retry it.
+    An article the posting ledger already records for this blog is not published again (returns True). If an
+    earlier attempt's outcome is unknown and Blogger cannot be checked for its post, nothing is published and
+    the lookup error is re-raised (with `raise_http_errors`) so the caller retries later.
     """
     if not service:
-        print("POST_SCHEDULER_ERROR: Blogger service not available, cannot post.")
- main
+        console.print("[bold red]POST_SCHEDULER_ERROR:[/bold red] Blogger service not available, cannot post.")
         return False
 
     blogger_settings = settings.get('posting_platforms', {}).get('blogger', {})
@@ -236,38 +392,38 @@ def post_to_blogger(service, settings, title, content_html, labels=None, affilia
         console.print(f"[bold red]POST_SCHEDULER_ERROR:[/bold red] Blogger Blog ID not configured or is set to placeholder in settings.yaml (current: '{blog_id}'). Cannot post.")
         return False
 
+    ledger, article_hash = get_posting_ledger(settings), posting_ledger.content_hash(title, content_html)
+    if ledger:
+        should_publish, entry = ledger.reserve(article_hash, 'blogger', blog_id, title)
+        if not should_publish:
+            return _report_ledger_skip('Blogger', title, entry)
+        try:
+            existing_post = _find_blogger_post(service, blog_id, title) if entry else None
+        except Exception as e: # Publishing now could duplicate an earlier copy; leave the entry for the next retry
+            ledger.mark_unconfirmed(article_hash, 'blogger', blog_id)
+            console.print(f"[yellow]POST_SCHEDULER_WARNING:[/yellow] Could not check Blogger for an earlier copy of '{title}': {e}")
+            if raise_http_errors:
+                raise
+            return False
+        if existing_post:
+            ledger.mark_published(article_hash, 'blogger', blog_id, existing_post['id'], existing_post.get('url'))
+            return _report_ledger_skip('Blogger', title, ledger.lookup(article_hash, 'blogger', blog_id))
+
     console.print(f"[blue]POST_SCHEDULER_INFO:[/blue] Preparing to post to Blogger blog ID: {blog_id}...")
     if affiliate_link_override:
         console.print(f"[blue]POST_SCHEDULER_INFO:[/blue] Using affiliate link override: {affiliate_link_override} (expected to be already embedded in content_html).")
-    if image_path_for_post:
-        console.print(f"[blue]POST_SCHEDULER_INFO:[/blue] Image path '{image_path_for_post}' was provided for this post. (Image embedding logic TBD).")
-=======
-    if not blog_id or blog_id == "YOUR_BLOGGER_BLOG_ID": # Check for placeholder
-        print(f"POST_SCHEDULER_ERROR: Blogger Blog ID not configured or is set to placeholder in settings.yaml (current: '{blog_id}'). Cannot post.")
-        return False
-
-    print(f"POST_SCHEDULER_INFO: Preparing to post to Blogger blog ID: {blog_id}...")
-    if affiliate_link_override:
-        print(f"POST_SCHEDULER_INFO: Using affiliate link override: {affiliate_link_override} (already embedded in content_html).")
-    if image_path_for_post:
-        print(f"POST_SCHEDULER_INFO: Image path '{image_path_for_post}' was provided for this post. (Image embedding logic TBD).")
-        # Future: Add logic here to upload image to Blogger and insert into content_html if possible,
-        # or use a pre-uploaded image URL if that's the workflow.
-        # For now, content_html is assumed to be final or image is handled externally.
- main
+    image_html = _blogger_image_html(settings, image_path_for_post, title) if image_path_for_post else None
 
     body = {
         "kind": "blogger#post",
         "blog": {"id": blog_id},
         "title": title,
-        "content": content_html,
-=======
-        "content": content_html, # Assumed to have the correct affiliate link already
- main
+        "content": f"{image_html}{content_html}" if image_html else content_html, # The ledger key stays the article as given
     }
     if labels:
         body["labels"] = labels
 
+    post, outcome_unknown = None, True
     try:
         posts_service = service.posts()
         request = posts_service.insert(blogId=blog_id, body=body, isDraft=False)
@@ -277,56 +433,464 @@ def post_to_blogger(service, settings, title, content_html, labels=None, affilia
     except HttpError as error:
         console.print(f"[bold red]POST_SCHEDULER_ERROR:[/bold red] An HTTP error {error.resp.status} occurred while posting to Blogger: {error._get_reason()}")
         console.print(f"[bold red]Detailed error:[/bold red] {error.content}")
+        outcome_unknown = int(error.resp.status) >= 500 # A 4xx means the post was rejected; after a 5xx it may exist anyway
+        if raise_http_errors:
+            raise
     except Exception as e:
         console.print(f"[bold red]POST_SCHEDULER_ERROR:[/bold red] An unexpected error occurred while posting to Blogger: {e}")
-=======
-        print(f"POST_SCHEDULER_SUCCESS: Successfully posted to Blogger. Post ID: {post['id']}, URL: {post.get('url', 'N/A')}")
-        return True
-    except HttpError as error:
-        print(f"POST_SCHEDULER_ERROR: An HTTP error {error.resp.status} occurred while posting to Blogger: {error._get_reason()}")
-        print(f"Detailed error: {error.content}")
-    except Exception as e:
-        print(f"POST_SCHEDULER_ERROR: An unexpected error occurred while posting to Blogger: {e}")
- main
+    finally:
+        if ledger and post is not None:
+            ledger.mark_published(article_hash, 'blogger', blog_id, post.get('id'), post.get('url'))
+        elif ledger and outcome_unknown:
+            ledger.mark_unconfirmed(article_hash, 'blogger', blog_id, "no response from Blogger")
+        elif ledger:
+            ledger.release(article_hash, 'blogger', blog_id)
     return False
 
-# --- WordPress Integration (Placeholder) ---
-def post_to_wordpress(settings, title, content_html, affiliate_link_override=None, image_path_for_post=None):
+BLOGGER_BATCH_SIZE = 50 # Sub-requests per batch round-trip
+
+def _blogger_batch_request(service, blog_id, item):
+    """The API request for one bulk item: 'insert' (default) a new post, 'update_labels' of an existing post, or 'publish' a draft."""
+    operation = item.get('operation', 'insert')
+    if operation == 'insert':
+        body = {"kind": "blogger#post", "blog": {"id": blog_id}, "title": item['title'], "content": item['content_html']}
+        if item.get('labels'):
+            body["labels"] = item['labels']
+        return service.posts().insert(blogId=blog_id, body=body, isDraft=item.get('is_draft', False))
+    if operation == 'update_labels':
+        return service.posts().patch(blogId=blog_id, postId=item['post_id'], body={"labels": item['labels']})
+    if operation == 'publish':
+        return service.posts().publish(blogId=blog_id, postId=item['post_id'])
+    raise ValueError(f"Unknown Blogger bulk operation '{operation}'")
+
+def post_batch_to_blogger(service, settings, items, batch_size=BLOGGER_BATCH_SIZE, max_attempts=3, base_retry_delay=2.0):
+    """
+    Runs many Blogger inserts / label updates / draft publishes as BatchHttpRequest round-trips of up to
+    `batch_size` sub-requests. Each sub-response is mapped back to its item; only items that failed with a
+    retryable status (or whose whole batch failed) are sent again, up to `max_attempts` rounds with backoff.
+    Label updates and publishes are idempotent and simply resent. An insert that got a 5xx or no answer may
+    have been applied, so it is looked up on Blogger first and resent only if its post is not there.
+    Inserts are checked against the posting ledger first; an article already published to the blog is not sent
+    again and comes back ok with the recorded post, flagged 'duplicate'. An insert whose earlier outcome is
+    unknown and that cannot be looked up on Blogger is not sent; it comes back failed, to be retried later.
+    Returns one result dict per item, in input order: {'ok', 'post_id', 'url', 'status', 'error', 'attempts'}.
+    """
+    results = [{'ok': False, 'post_id': item.get('post_id'), 'url': None, 'status': None, 'error': None, 'attempts': 0} for item in items]
+    blog_id = settings.get('posting_platforms', {}).get('blogger', {}).get('blog_id')
+    if not service or not blog_id or blog_id == "YOUR_BLOGGER_BLOG_ID":
+        console.print("[bold red]POST_SCHEDULER_ERROR:[/bold red] Blogger service or blog ID not available, cannot run bulk publish.")
+        for result in results:
+            result['error'] = "Blogger service or blog ID not available"
+        return results
+
+    # Inserts go through the posting ledger: already published articles are not sent again
+    ledger, reserved = get_posting_ledger(settings), {}
+    pending, round_trips = [], 0
+    for index, item in enumerate(items):
+        if ledger and item.get('operation', 'insert') == 'insert' and 'title' in item and 'content_html' in item:
+            article_hash = posting_ledger.content_hash(item['title'], item['content_html'])
+            should_publish, entry = ledger.reserve(article_hash, 'blogger', blog_id, item['title'])
+            try:
+                existing_post = _find_blogger_post(service, blog_id, item['title']) if should_publish and entry else None
+            except Exception as e: # Publishing now could duplicate an earlier copy; leave the entry for the next retry
+                ledger.mark_unconfirmed(article_hash, 'blogger', blog_id)
+                results[index].update(status=getattr(getattr(e, 'resp', None), 'status', None), error=f"Could not check for an earlier copy: {e}")
+                continue
+            if existing_post:
+                ledger.mark_published(article_hash, 'blogger', blog_id, existing_post['id'], existing_post.get('url'))
+                should_publish, entry = False, ledger.lookup(article_hash, 'blogger', blog_id)
+            if not should_publish:
+                already_published = entry['status'] == 'published'
+                results[index].update(ok=already_published, duplicate=already_published, post_id=entry['remote_id'], url=entry['remote_url'],
+                                      error=None if already_published else "Already being published by another worker")
+                continue
+            reserved[index] = article_hash
+        pending.append(index)
+    uncertain = set() # Inserts whose last send may have been applied: looked up on Blogger before any resend
+    for attempt in range(1, max_attempts + 1):
+        if not pending:
+            break
+        if attempt > 1:
+            time.sleep(base_retry_delay * (2 ** (attempt - 2)) * random.uniform(1.0, 1.25))
+            console.print(f"[yellow]POST_SCHEDULER_WARNING:[/yellow] Retrying {len(pending)} failed Blogger item(s), attempt {attempt}/{max_attempts}...")
+            if uncertain.intersection(pending): # One listing of the blog settles every insert that may already be on it
+                try:
+                    recent_posts = _recent_blogger_posts_by_title(service, blog_id, len(items) + 50)
+                except Exception as e:
+                    recent_posts = None
+                    console.print(f"[yellow]POST_SCHEDULER_WARNING:[/yellow] Could not check Blogger for inserts with an unknown outcome; not resending them: {e}")
+                checked = []
+                for index in pending:
+                    if index in uncertain:
+                        existing_post = recent_posts.get(items[index]['title'].strip()) if recent_posts is not None else None
+                        if existing_post:
+                            results[index].update(ok=True, status=200, error=None, post_id=existing_post['id'], url=existing_post.get('url'))
+                        if existing_post or recent_posts is None:
+                            continue # Already on the blog, or could not be checked: resending could post it twice
+                        uncertain.discard(index)
+                    checked.append(index)
+                pending = checked
+        retry_indexes = []
+        for chunk_start in range(0, len(pending), batch_size):
+            chunk, sub_responses = [], {}
+            batch = service.new_batch_http_request(callback=lambda request_id, response, exception: sub_responses.__setitem__(int(request_id), (response, exception)))
+            for index in pending[chunk_start:chunk_start + batch_size]:
+                try:
+                    batch.add(_blogger_batch_request(service, blog_id, items[index]), request_id=str(index))
+                    chunk.append(index)
+                except (KeyError, ValueError) as e: # Malformed item: fails without being sent
+                    results[index].update(error=f"Invalid item: {e}", attempts=attempt)
+            if not chunk:
+                continue
+            try:
+                batch.execute()
+                round_trips += 1
+            except Exception as e: # The batch request itself failed: its items may or may not have been applied
+                for index in chunk:
+                    results[index].update(status=None, error=f"Batch request failed: {e}", attempts=attempt)
+                    if items[index].get('operation', 'insert') == 'insert':
+                        uncertain.add(index)
+                retry_indexes.extend(chunk)
+                continue
+            for index in chunk:
+                response, exception = sub_responses.get(index, (None, None))
+                result = results[index]
+                result['attempts'] = attempt
+                if exception is None and response is not None:
+                    result.update(ok=True, status=200, error=None, post_id=response.get('id', result['post_id']), url=response.get('url'))
+                    uncertain.discard(index)
+                    continue
+                status = getattr(getattr(exception, 'resp', None), 'status', None)
+                result.update(status=status, error=str(exception) if exception else "No sub-response in batch reply")
+                outcome_unknown = status is None or int(status) >= 500
+                if outcome_unknown and items[index].get('operation', 'insert') == 'insert':
+                    uncertain.add(index) # A resent insert could double-post: it is looked up first
+                elif not outcome_unknown:
+                    uncertain.discard(index) # A 4xx means this send was rejected, and any earlier one was already checked
+                if outcome_unknown or int(status) in RETRYABLE_HTTP_STATUSES:
+                    retry_indexes.append(index)
+        pending = retry_indexes
+
+    for index, article_hash in reserved.items():
+        if results[index]['ok']:
+            ledger.mark_published(article_hash, 'blogger', blog_id, results[index]['post_id'], results[index]['url'])
+        elif index in uncertain: # The insert may have gone through
+            ledger.mark_unconfirmed(article_hash, 'blogger', blog_id, results[index]['error'])
+        else:
+            ledger.release(article_hash, 'blogger', blog_id)
+
+    succeeded = sum(1 for result in results if result['ok'])
+    duplicates = sum(1 for result in results if result.get('duplicate'))
+    console.print(f"[green]POST_SCHEDULER_INFO:[/green] Blogger bulk publish: {succeeded}/{len(items)} succeeded ({duplicates} already published) in {round_trips} batch round-trip(s).")
+    return results
+
+def publish_blogger_drafts(service, settings, batch_size=BLOGGER_BATCH_SIZE, max_attempts=3):
+    """Publishes every draft post of the configured blog through post_batch_to_blogger. Returns its result list."""
+    blog_id = settings.get('posting_platforms', {}).get('blogger', {}).get('blog_id')
+    draft_ids, page_token = [], None
+    try:
+        while True:
+            page = service.posts().list(blogId=blog_id, status='DRAFT', fetchBodies=False, maxResults=500, pageToken=page_token).execute()
+            draft_ids.extend(post['id'] for post in page.get('items', []))
+            page_token = page.get('nextPageToken')
+            if not page_token:
+                break
+    except HttpError as error:
+        console.print(f"[bold red]POST_SCHEDULER_ERROR:[/bold red] Could not list Blogger drafts: HTTP {error.resp.status}")
+        return []
+    console.print(f"[blue]POST_SCHEDULER_INFO:[/blue] Publishing {len(draft_ids)} Blogger draft(s) in batches of {batch_size}...")
+    return post_batch_to_blogger(service, settings, [{'operation': 'publish', 'post_id': post_id} for post_id in draft_ids], batch_size, max_attempts)
+
+# --- WordPress Integration ---
+def _wordpress_site_configs(wp_settings):
+    """
+    The sites to publish to: every entry of `posting_platforms.wordpress.sites` (each with site_url, username,
+    password_env_var and optionally name, max_concurrent, post_status), or the single site configured directly
+    under `posting_platforms.wordpress`. Site entries inherit any key they do not set from the wordpress section.
+    """
+    shared = {key: value for key, value in wp_settings.items() if key not in ('sites', 'enabled')}
+    return [dict(shared, **site) for site in wp_settings['sites']] if wp_settings.get('sites') else [shared]
+
+def get_wordpress_sites(settings):
+    """A WordPressSite client per configured site with credentials, reused across calls so their connections and media IDs are kept."""
+    wp_settings = settings.get('posting_platforms', {}).get('wordpress', {})
+    configure_wordpress(settings)
+    sites = []
+    for site_config in _wordpress_site_configs(wp_settings):
+        site_url = site_config.get('site_url', 'https://your-wordpress-site.com') # Provide default to avoid error if key missing
+        with _wordpress_sites_lock:
+            if site_url in _wordpress_sites:
+                sites.append(_wordpress_sites[site_url])
+                continue
+        current_username = site_config.get('username', 'your_wordpress_username')
+        password_env_var = site_config.get('password_env_var')
+        current_password = os.environ.get(password_env_var) if password_env_var else None
+
+        # Check if settings are placeholders or password is not set
+        if site_url == "https://your-wordpress-site.com":
+            console.print("[yellow]WARN:[/yellow] WordPress site_url is not configured; skipping that site.")
+            continue
+        if current_username == "your_wordpress_username" or not current_password:
+            console.print(f"[yellow]WARN:[/yellow] WordPress application password for user '{current_username}' on {site_url} not found via env var '{password_env_var}'.")
+            dynamic_creds = prompt_for_credentials(f"WordPress ({site_url})")
+            if not dynamic_creds:
+                console.print(f"[bold red]ERROR:[/bold red] Cannot post to {site_url} without credentials.")
+                continue
+            current_username, current_password = dynamic_creds['username'], dynamic_creds['password']
+            console.print(f"[blue]INFO:[/blue] Using dynamically provided credentials for WordPress user '{current_username}'.")
+
+        site = wordpress_client.WordPressSite(
+            site_url, current_username, current_password, session=wordpress_client.get_shared_session(WORDPRESS_SETTINGS['pool_maxsize']),
+            max_concurrent=site_config.get('max_concurrent', WORDPRESS_SETTINGS['max_concurrent_per_site']),
+            timeout=WORDPRESS_SETTINGS['timeout'], ledger=get_posting_ledger(settings), name=site_config.get('name'))
+        site.post_status = site_config.get('post_status', WORDPRESS_SETTINGS['post_status'])
+        with _wordpress_sites_lock:
+            sites.append(_wordpress_sites.setdefault(site.site_url, site))
+    return sites
+
+def configure_wordpress(config):
+    """Applies the optional `posting_platforms.wordpress.client` settings (any WORDPRESS_SETTINGS key)."""
+    client_settings = (config or {}).get('posting_platforms', {}).get('wordpress', {}).get('client')
+    if isinstance(client_settings, dict):
+        WORDPRESS_SETTINGS.update({key: value for key, value in client_settings.items() if key in WORDPRESS_SETTINGS})
+
+def _publish_to_wordpress_site(site, ledger, title, content_html, image_path=None):
+    """Publishes one article to one site through the posting ledger. Returns {'site', 'ok', 'post_id', 'url', 'status', 'error', 'duplicate'}."""
+    result = {'site': site.name, 'ok': False, 'post_id': None, 'url': None, 'status': None, 'error': None, 'duplicate': False}
+    article_hash = posting_ledger.content_hash(title, content_html)
+    if ledger:
+        should_publish, entry = ledger.reserve(article_hash, 'wordpress', site.site_url, title)
+        if should_publish and entry: # An earlier attempt ended without a known outcome: look for its post first
+            try:
+                existing_post = site.find_post_by_title(title)
+            except wordpress_client.WordPressError as e: # Publishing now could duplicate it; leave it for the next retry
+                ledger.mark_unconfirmed(article_hash, 'wordpress', site.site_url)
+                result.update(error=f"Could not check for an earlier copy: {e}", retry_after=e.retry_after)
+                console.print(f"[yellow]POST_SCHEDULER_WARNING:[/yellow] Could not check {site.name} for an earlier copy of '{title}': {e}")
+                return result
+            if existing_post:
+                ledger.mark_published(article_hash, 'wordpress', site.site_url, existing_post['id'], existing_post.get('link'))
+                should_publish, entry = False, ledger.lookup(article_hash, 'wordpress', site.site_url)
+        if not should_publish:
+            already_published = _report_ledger_skip(f"WordPress ({site.name})", title, entry)
+            result.update(ok=already_published, duplicate=already_published, post_id=entry['remote_id'], url=entry['remote_url'],
+                          error=None if already_published else "Already being published by another worker")
+            return result
+
+    post = None
+    try:
+        featured_media = site.upload_media(image_path)['id'] if image_path and os.path.exists(image_path) else None
+        post = site.create_post(title, content_html, status=site.post_status, featured_media=featured_media)
+        result.update(ok=True, post_id=post['id'], url=post.get('link'), status=200)
+        console.print(f"[green]POST_SCHEDULER_SUCCESS:[/green] Posted to WordPress ({site.name}). Post ID: {post['id']}, URL: {post.get('link', 'N/A')}")
+    except wordpress_client.WordPressError as error:
+        result.update(status=error.status, error=str(error), retry_after=error.retry_after)
+        console.print(f"[bold red]POST_SCHEDULER_ERROR:[/bold red] Posting to WordPress failed: {error}")
+    except OSError as e:
+        result.update(status=400, error=f"Could not read image '{image_path}': {e}")
+        console.print(f"[bold red]POST_SCHEDULER_ERROR:[/bold red] {result['error']}")
+    finally:
+        if ledger and post is not None:
+            ledger.mark_published(article_hash, 'wordpress', site.site_url, post['id'], post.get('link'))
+        elif ledger and (result['status'] is None or int(result['status']) >= 500): # The post may exist anyway
+            ledger.mark_unconfirmed(article_hash, 'wordpress', site.site_url, result['error'])
+        elif ledger:
+            ledger.release(article_hash, 'wordpress', site.site_url)
+    return result
+
+def post_to_wordpress_sites(settings, title, content_html, image_path=None):
+    """
+    Publishes one article to every configured WordPress site at once (each site still capped at its own
+    max_concurrent requests). Returns one result dict per site, in configuration order.
+    """
+    sites = get_wordpress_sites(settings)
+    if not sites:
+        return []
+    ledger = get_posting_ledger(settings)
+    image_path = _platform_image(settings, image_path, 'wordpress') # Uploaded at most once per site (WordPressSite.upload_media)
+    with ThreadPoolExecutor(max_workers=min(len(sites), WORDPRESS_SETTINGS['max_parallel_sites'])) as executor:
+        return list(executor.map(lambda site: _publish_to_wordpress_site(site, ledger, title, content_html, image_path), sites))
+
+def post_to_wordpress(settings, title, content_html, affiliate_link_override=None, image_path_for_post=None, raise_http_errors=False):
+    """
+    Publishes one post to every configured WordPress site. Returns True only if every site has it.
+    With `raise_http_errors`, a retryable failure on any site is raised as WordPressError so the queue retries
+    the job; sites that already have the post are skipped on the retry by the posting ledger.
+    """
     wp_settings = settings.get('posting_platforms', {}).get('wordpress', {})
     if not wp_settings.get('enabled', False):
         console.print("[blue]POST_SCHEDULER_INFO:[/blue] WordPress posting is not enabled in settings.yaml.")
         return False
+    if affiliate_link_override:
+        console.print(f"[blue]POST_SCHEDULER_INFO:[/blue] Using affiliate link override: {affiliate_link_override} (expected to be already embedded in content_html).")
 
-    site_url = wp_settings.get('site_url', 'https://your-wordpress-site.com') # Provide default to avoid error if key missing
-    config_username = wp_settings.get('username', 'your_wordpress_username')
-    password_env_var = wp_settings.get('password_env_var')
-    config_password = os.environ.get(password_env_var) if password_env_var else None
-
-    current_username = config_username
-    current_password = config_password
-
-    # Check if settings are placeholders or password is not set
-    if site_url == "https://your-wordpress-site.com" or \
-       current_username == "your_wordpress_username" or \
-       not current_password:
-        console.print(f"[yellow]WARN:[/yellow] WordPress settings incomplete or password for user '{current_username}' not found via env var '{password_env_var}'.")
-        dynamic_creds = prompt_for_credentials("WordPress")
-        if dynamic_creds:
-            current_username = dynamic_creds['username']
-            current_password = dynamic_creds['password']
-            console.print(f"[blue]INFO:[/blue] Using dynamically provided credentials for WordPress user '{current_username}'.")
-        else:
-            console.print(f"[bold red]ERROR:[/bold red] Cannot proceed with WordPress posting for '{current_username}' without credentials.")
-            return False
+    results = post_to_wordpress_sites(settings, title, content_html, image_path_for_post)
+    if not results:
+        console.print("[bold red]POST_SCHEDULER_ERROR:[/bold red] No WordPress site with usable settings and credentials; nothing posted.")
+        return False
+    failed = [result for result in results if not result['ok']]
+    if failed and raise_http_errors:
+        retryable = [result for result in failed if result['status'] is None or int(result['status']) in RETRYABLE_HTTP_STATUSES]
+        if retryable:
+            raise wordpress_client.WordPressError("; ".join(result['error'] or "" for result in retryable), status=retryable[0]['status'],
+                                                  retry_after=retryable[0].get('retry_after'))
+    return not failed
 
-    console.print(f"[blue]POST_SCHEDULER_INFO (Placeholder):[/blue] Would attempt to post to WordPress site: [link={site_url}]{site_url}[/link] as user [b]{current_username}[/b]")
-    console.print(f"[blue]POST_SCHEDULER_INFO (Placeholder):[/blue] Title: {title[:50]}...")
-    if affiliate_link_override:
-        console.print(f"[blue]POST_SCHEDULER_INFO (Placeholder):[/blue] WordPress post would use affiliate link: {affiliate_link_override} (expected to be in content_html)")
-    if image_path_for_post:
-        console.print(f"[blue]POST_SCHEDULER_INFO (Placeholder):[/blue] WordPress post would attempt to use image: {image_path_for_post}")
-    console.print("[cyan]POST_SCHEDULER_INFO (Placeholder):[/cyan] WordPress posting logic not yet implemented.")
-    return False
+# --- Scheduled Posting Queue ---
+def configure_post_queue(config):
+    """Applies the optional `post_queue` settings (any POST_QUEUE_SETTINGS key)."""
+    queue_settings = (config or {}).get('post_queue')
+    if isinstance(queue_settings, dict):
+        POST_QUEUE_SETTINGS.update({key: value for key, value in queue_settings.items() if key in POST_QUEUE_SETTINGS})
+
+def get_post_queue():
+    path = POST_QUEUE_SETTINGS['path']
+    if path not in _post_queues:
+        _post_queues[path] = post_queue.PostJobQueue(path)
+    return _post_queues[path]
+
+def spread_run_times(count, start=None, end=None, jitter_fraction=0.2):
+    """
+    `count` run_at times (epoch seconds) spread evenly over [start, end) - by default the next 24 hours - with each
+    one shifted by up to `jitter_fraction` of the gap so posts do not land on a visibly regular grid.
+    """
+    start = time.time() if start is None else start
+    end = start + 86400 if end is None else end
+    gap = (end - start) / max(count, 1)
+    return [start + i * gap + random.uniform(0, gap * jitter_fraction) for i in range(count)]
+
+def schedule_post(settings, platform, title, content_html, labels=None, affiliate_link=None, image_path=None, run_at=None, priority=0):
+    """
+    Queues one post for `platform` and returns the job id. Without `run_at`, the post goes into the platform's next
+    free slot: now, or min_spacing_minutes after its latest pending post.
+    """
+    queue = get_post_queue()
+    if run_at is None:
+        last_scheduled = queue.last_scheduled_at(platform)
+        run_at = max(time.time(), (last_scheduled or 0) + POST_QUEUE_SETTINGS['min_spacing_minutes'] * 60)
+    payload = {'title': title, 'content_html': content_html, 'labels': labels, 'affiliate_link': affiliate_link, 'image_path': image_path}
+    job_id = queue.enqueue(platform, payload, run_at=run_at, priority=priority, max_attempts=POST_QUEUE_SETTINGS['max_attempts'])
+    console.print(f"[blue]POST_SCHEDULER_INFO:[/blue] Queued {platform} post '{title}' as job {job_id}, due {datetime.fromtimestamp(run_at).strftime('%Y-%m-%d %H:%M')}.")
+    return job_id
+
+def _publish_blogger_job(settings, payload):
+    return post_to_blogger(get_blogger_service(settings), settings, payload['title'], payload['content_html'], labels=payload.get('labels'),
+                           affiliate_link_override=payload.get('affiliate_link'), image_path_for_post=payload.get('image_path'), raise_http_errors=True)
+
+def _publish_wordpress_job(settings, payload):
+    return post_to_wordpress(settings, payload['title'], payload['content_html'], affiliate_link_override=payload.get('affiliate_link'),
+                             image_path_for_post=payload.get('image_path'), raise_http_errors=True)
+
+# platform -> publisher(settings, payload) returning True/False; an HttpError with a retryable status, or a WordPressError, is retried
+QUEUE_PUBLISHERS = {'blogger': _publish_blogger_job, 'wordpress': _publish_wordpress_job}
+
+def _retry_delay(job, http_error=None):
+    response = getattr(http_error, 'resp', None) # httplib2 response: a dict of lowercased headers
+    retry_after = response.get('retry-after') if isinstance(response, dict) else getattr(http_error, 'retry_after', None)
+    if retry_after and str(retry_after).isdigit():
+        return min(float(retry_after), POST_QUEUE_SETTINGS['max_retry_delay'])
+    delay = POST_QUEUE_SETTINGS['base_retry_delay'] * (2 ** (job['attempts'] - 1))
+    return min(delay, POST_QUEUE_SETTINGS['max_retry_delay']) * random.uniform(1.0, 1.25)
+
+def _warn_lost_lease(job):
+    console.print(f"[yellow]POST_SCHEDULER_WARNING:[/yellow] Job {job['id']} outlived its lease and was handed to another worker; "
+                  "this attempt's outcome was not recorded.")
+
+def run_post_job(settings, queue, job):
+    """
+    Publishes one claimed job and records the outcome in the queue. Returns 'done', 'retry' or 'failed'.
+    The outcome is recorded only if this claim still holds the job (see PostJobQueue).
+    """
+    publisher = QUEUE_PUBLISHERS.get(job['platform'])
+    if publisher is None:
+        if not queue.fail(job['id'], job['attempts'], f"No publisher for platform '{job['platform']}'"):
+            _warn_lost_lease(job)
+        return 'failed'
+    retryable, error_text, http_error = False, None, None
+    try:
+        if publisher(settings, job['payload']):
+            if not queue.complete(job['id'], job['attempts']):
+                _warn_lost_lease(job)
+            return 'done'
+        error_text = "Publisher reported failure" # Configuration or content problem; retrying would not help
+    except HttpError as error:
+        http_error = error
+        status = getattr(getattr(error, 'resp', None), 'status', None)
+        retryable, error_text = status is not None and int(status) in RETRYABLE_HTTP_STATUSES, f"HTTP {status}: {error}"
+    except wordpress_client.WordPressError as error: # Raised only for retryable failures (no response, or a retryable status)
+        http_error, retryable, error_text = error, True, str(error)
+    except Exception as e: # Network errors and timeouts are transient
+        retryable, error_text = True, f"{type(e).__name__}: {e}"
+
+    if retryable and job['attempts'] < job['max_attempts']:
+        delay = _retry_delay(job, http_error)
+        if not queue.retry(job['id'], job['attempts'], error_text, delay):
+            _warn_lost_lease(job)
+        console.print(f"[yellow]POST_SCHEDULER_WARNING:[/yellow] Job {job['id']} attempt {job['attempts']}/{job['max_attempts']} failed ({error_text}); retrying in {delay:.0f}s.")
+        return 'retry'
+    if not queue.fail(job['id'], job['attempts'], error_text):
+        _warn_lost_lease(job)
+    console.print(f"[bold red]POST_SCHEDULER_ERROR:[/bold red] Job {job['id']} ({job['platform']}, '{job['payload'].get('title')}') failed permanently: {error_text}")
+    return 'failed'
+
+def run_post_worker(settings, wait_for_future_jobs=False, platforms=None):
+    """
+    Drains the queue with a pool of max_workers threads, starting at most max_posts_per_hour jobs per hour.
+    By default it returns once nothing is due; with `wait_for_future_jobs` it sleeps until scheduled jobs come due
+    and returns only when no pending job is left. Returns {'done', 'retry', 'failed'} counts.
+    """
+    configure_post_queue(settings)
+    queue = get_post_queue()
+    outcomes = {'done': 0, 'retry': 0, 'failed': 0}
+    min_interval = 3600.0 / POST_QUEUE_SETTINGS['max_posts_per_hour']
+    next_start = 0.0
+    in_flight = set()
+    with ThreadPoolExecutor(max_workers=POST_QUEUE_SETTINGS['max_workers'], thread_name_prefix="post-worker") as executor:
+        while True:
+            for future in [future for future in in_flight if future.done()]:
+                in_flight.discard(future)
+                outcomes[future.result()] += 1
+
+            now = time.monotonic()
+            if len(in_flight) < POST_QUEUE_SETTINGS['max_workers'] and now >= next_start:
+                jobs = queue.claim(1, POST_QUEUE_SETTINGS['lease_seconds'], platforms)
+                if jobs:
+                    in_flight.add(executor.submit(run_post_job, settings, queue, jobs[0]))
+                    next_start = now + min_interval
+                    continue
+
+            next_run_at = queue.next_run_at(platforms)
+            if not in_flight and (next_run_at is None or (not wait_for_future_jobs and next_run_at > time.time())):
+                break
+            timeout = POST_QUEUE_SETTINGS['poll_seconds']
+            if next_run_at is not None:
+                timeout = min(timeout, max(0.05, next_run_at - time.time()))
+            if now < next_start:
+                timeout = min(timeout, next_start - now)
+            if in_flight:
+                wait(in_flight, timeout=max(0.05, timeout), return_when=FIRST_COMPLETED)
+            else:
+                time.sleep(max(0.05, timeout))
+    console.print(f"[green]POST_SCHEDULER_INFO:[/green] Worker finished: {outcomes['done']} published, {outcomes['retry']} rescheduled, {outcomes['failed']} failed.")
+    return outcomes
+
+def print_queue_status(limit=20):
+    queue = get_post_queue()
+    counts = queue.counts()
+    table = Table(title=f"[bold blue]Post Queue[/bold blue] ({', '.join(f'{status}: {count}' for status, count in counts.items())})")
+    table.add_column("Job", style="cyan", no_wrap=True)
+    table.add_column("Platform", no_wrap=True)
+    table.add_column("Title", style="magenta", overflow="fold")
+    table.add_column("Due", no_wrap=True)
+    table.add_column("Attempts", justify="right")
+    table.add_column("Last error", style="dim", overflow="fold")
+    for job in queue.list_jobs('pending', limit) + queue.list_jobs('failed', limit):
+        table.add_row(str(job['id']), job['platform'], job['title'] or "-", datetime.fromtimestamp(job['run_at']).strftime('%Y-%m-%d %H:%M'),
+                      f"{job['attempts']}/{job['max_attempts']}", job['last_error'] or "")
+    console.print(table)
+    ledger = get_posting_ledger()
+    if ledger:
+        console.print(f"[blue]Posting ledger:[/blue] {', '.join(f'{status}: {count}' for status, count in ledger.counts().items())}")
 
 # --- Social Media Posting (Placeholder) ---
 def post_to_social_media(settings, text_content, image_path=None, affiliate_link_override=None):
@@ -339,12 +903,126 @@ def post_to_social_media(settings, text_content, image_path=None, affiliate_link
     console.print("[cyan]Social media posting logic not yet implemented.[/cyan]")
     return False
 
+# --- Multi-Platform Fan-Out ---
+def configure_publish_dispatch(config):
+    """Applies the optional `publish_dispatch` settings; `platforms` entries are merged per platform."""
+    dispatch_settings = (config or {}).get('publish_dispatch')
+    if not isinstance(dispatch_settings, dict):
+        return
+    PUBLISH_DISPATCH_SETTINGS.update({key: value for key, value in dispatch_settings.items() if key in PUBLISH_DISPATCH_SETTINGS and key != 'platforms'})
+    for platform, platform_settings in (dispatch_settings.get('platforms') or {}).items():
+        if isinstance(platform_settings, dict):
+            PUBLISH_DISPATCH_SETTINGS['platforms'].setdefault(platform, {}).update(platform_settings)
+
+def _platform_dispatch_setting(platform, key):
+    return PUBLISH_DISPATCH_SETTINGS['platforms'].get(platform, {}).get(key, PUBLISH_DISPATCH_SETTINGS[f'default_{key}'])
+
+def _get_dispatch_executor():
+    global _dispatch_executor
+    with _dispatch_lock:
+        if _dispatch_executor is None:
+            _dispatch_executor = ThreadPoolExecutor(max_workers=PUBLISH_DISPATCH_SETTINGS['max_workers'], thread_name_prefix="publish")
+        return _dispatch_executor
+
+def _get_platform_rate_limiter(platform):
+    """A limiter spacing this platform's publishes posts_per_minute apart, or None if it has no limit."""
+    posts_per_minute = _platform_dispatch_setting(platform, 'posts_per_minute')
+    if not posts_per_minute:
+        return None
+    with _dispatch_lock:
+        if platform not in _platform_rate_limiters:
+            _platform_rate_limiters[platform] = HostRateLimiter(posts_per_minute / 60.0)
+        return _platform_rate_limiters[platform]
+
+def _run_platform_publisher(platform, publisher):
+    """Runs one platform's publisher in a dispatch thread; failures stay inside this platform's outcome."""
+    start_time = time.perf_counter()
+    limiter = _get_platform_rate_limiter(platform)
+    rate_wait = limiter.acquire(platform) if limiter else 0.0
+    try:
+        ok = bool(publisher())
+        error = None if ok else "Publisher reported failure"
+    except Exception as e:
+        ok, error = False, f"{type(e).__name__}: {e}"
+    return {'ok': ok, 'error': error, 'timed_out': False,
+            'seconds': round(time.perf_counter() - start_time, 3), 'rate_wait_seconds': round(rate_wait, 3)}
+
+def dispatch_to_platforms(publishers):
+    """
+    Runs {platform: zero-argument publisher returning True/False} in parallel, each platform with its own timeout
+    and rate limit. Returns {'ok', 'seconds', 'platforms': {platform: {'ok', 'error', 'timed_out', 'seconds', ...}}}.
+    A platform that times out is reported as failed; its call cannot be interrupted and finishes in the background
+    (the posting ledger makes a later retry of it safe).
+    """
+    start_time = time.perf_counter()
+    executor = _get_dispatch_executor()
+    futures = {platform: executor.submit(_run_platform_publisher, platform, publisher) for platform, publisher in publishers.items()}
+    outcomes = {}
+    for platform, future in sorted(futures.items(), key=lambda item: _platform_dispatch_setting(item[0], 'timeout_seconds')):
+        timeout = _platform_dispatch_setting(platform, 'timeout_seconds')
+        try:
+            outcomes[platform] = future.result(timeout=max(0.0, start_time + timeout - time.perf_counter()))
+        except FuturesTimeoutError:
+            outcomes[platform] = {'ok': False, 'error': f"Timed out after {timeout}s (still running in the background)", 'timed_out': True,
+                                  'seconds': round(time.perf_counter() - start_time, 3), 'rate_wait_seconds': None}
+    platforms = {platform: outcomes[platform] for platform in publishers}
+    return {'ok': bool(platforms) and all(outcome['ok'] for outcome in platforms.values()),
+            'seconds': round(time.perf_counter() - start_time, 3), 'platforms': platforms}
+
+def dispatch_publish(settings, title, content_html, labels=None, affiliate_link=None, image_path=None, blogger_service=None):
+    """
+    Publishes one article to every enabled platform (Blogger, WordPress, social media) at once, so the whole
+    publish takes as long as the slowest platform instead of the sum of all of them. Returns dispatch_to_platforms' result.
+    """
+    configure_publish_dispatch(settings)
+    platform_settings = settings.get('posting_platforms', {})
+    publishers = {}
+    if platform_settings.get('blogger', {}).get('enabled', False) and GOOGLE_LIBS_AVAILABLE:
+        publishers['blogger'] = lambda: post_to_blogger(blogger_service or get_blogger_service(settings), settings, title, content_html, labels=labels,
+                                                        affiliate_link_override=affiliate_link, image_path_for_post=image_path)
+    if platform_settings.get('wordpress', {}).get('enabled', False):
+        publishers['wordpress'] = lambda: post_to_wordpress(settings, title, content_html, affiliate_link_override=affiliate_link, image_path_for_post=image_path)
+    if platform_settings.get('social_media', {}).get('enabled', False):
+        publishers['social_media'] = lambda: post_to_social_media(settings, f"{title} {affiliate_link or ''}".strip(), image_path=_platform_image(settings, image_path, 'social_media'),
+                                                                  affiliate_link_override=affiliate_link)
+    if not publishers:
+        console.print("[yellow]POST_SCHEDULER_WARNING:[/yellow] No posting platform is enabled; nothing published.")
+        return {'ok': False, 'seconds': 0.0, 'platforms': {}}
+
+    if image_path and os.path.exists(image_path): # Every platform's variant in one process pool, before the platforms need them
+        image_pipeline.configure_image_pipeline(settings)
+        if image_pipeline.IMAGE_PIPELINE_SETTINGS['enabled']:
+            image_pipeline.prepare_variants([image_path], list(publishers))
+    console.print(f"[blue]POST_SCHEDULER_INFO:[/blue] Publishing '{title}' to {', '.join(publishers)} in parallel...")
+    result = dispatch_to_platforms(publishers)
+    summary = ", ".join(f"{platform}: {'ok' if outcome['ok'] else 'FAILED'} ({outcome['seconds']:.1f}s)" for platform, outcome in result['platforms'].items())
+    console.print(f"[{'green' if result['ok'] else 'yellow'}]POST_SCHEDULER_INFO:[/] Publish finished in {result['seconds']:.1f}s - {summary}")
+    for platform, outcome in result['platforms'].items():
+        if outcome['error']:
+            console.print(f"[yellow]POST_SCHEDULER_WARNING:[/yellow] {platform}: {outcome['error']}")
+    return result
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Post scheduler: queue worker and posting test.")
+    parser.add_argument("--drain", action="store_true", help="Publish every queued post that is due now, then exit.")
+    parser.add_argument("--serve", action="store_true", help="Keep publishing queued posts as they come due until the queue is empty.")
+    parser.add_argument("--status", action="store_true", help="Show pending and failed jobs in the post queue.")
+    parser.add_argument("--publish-drafts", action="store_true", help="Publish every Blogger draft of the configured blog, in batches.")
+    args = parser.parse_args()
+
     console.print(Panel("Post Scheduler Script", title="[bold magenta]Agent Automation[/bold magenta]", subtitle="[dim]Initiating Workflow[/dim]"))
     current_settings = load_settings()
 
     if not current_settings:
         console.print("[bold red]FATAL:[/bold red] Exiting due to configuration loading failure.")
+    elif args.status:
+        configure_post_queue(current_settings)
+        configure_posting_ledger(current_settings)
+        print_queue_status()
+    elif args.drain or args.serve:
+        run_post_worker(current_settings, wait_for_future_jobs=args.serve)
+    elif args.publish_drafts:
+        publish_blogger_drafts(get_blogger_service(current_settings), current_settings)
     else:
         console.print("[green]INFO:[/green] Configuration loaded successfully.")
 
@@ -361,96 +1039,21 @@ if __name__ == "__main__":
             if not os.path.exists(client_secrets_file):
                 console.print(f"[yellow]POST_SCHEDULER_WARNING:[/yellow] '{client_secrets_file}' not found. Creating a dummy one for structural testing ONLY.")
                 console.print("[yellow]Real Blogger posting WILL FAIL without a valid client secrets file from Google Cloud Console.[/yellow]")
-=======
-    """Placeholder for WordPress posting functionality."""
-    wp_settings = settings.get('posting_platforms', {}).get('wordpress', {})
-    if not wp_settings.get('enabled', False):
-        print("POST_SCHEDULER_INFO: WordPress posting is not enabled in settings.yaml.")
-        return False
-
-    site_url = wp_settings.get('site_url')
-    username = wp_settings.get('username')
-    password_env_var = wp_settings.get('password_env_var')
-
-    if site_url == "https://your-wordpress-site.com" or username == "your_wordpress_username" or not password_env_var:
-        print(f"POST_SCHEDULER_ERROR: WordPress settings (site_url, username, password_env_var) are placeholders or missing. Cannot post.")
-        return False
-
-    password = os.environ.get(password_env_var)
-    if not password:
-        print(f"POST_SCHEDULER_ERROR: WordPress password environment variable '{password_env_var}' not set. Cannot post.")
-        return False
-
-    print(f"POST_SCHEDULER_INFO: (Placeholder) Would attempt to post to WordPress site: {site_url}")
-    print(f"POST_SCHEDULER_INFO: Title: {title[:50]}...")
-    if affiliate_link_override:
-        print(f"POST_SCHEDULER_INFO: (Placeholder) WordPress post would use affiliate link: {affiliate_link_override} (expected to be in content_html)")
-    if image_path_for_post:
-        print(f"POST_SCHEDULER_INFO: (Placeholder) WordPress post would attempt to use image: {image_path_for_post}")
-    print("POST_SCHEDULER_INFO: WordPress posting logic not yet implemented.")
-    return False
-
-# --- Social Media Posting (Placeholder) ---
-def post_to_social_media(settings, text_content, image_path=None, affiliate_link_override=None): # Renamed link to affiliate_link_override
-    """Placeholder for social media posting functionality."""
-    print("POST_SCHEDULER_INFO: (Placeholder) Would attempt to post to social media platforms.")
-    print(f"POST_SCHEDULER_INFO: Content: {text_content[:100]}...")
-    if image_path:
-        print(f"POST_SCHEDULER_INFO: With image: {image_path}")
-    if affiliate_link_override: # Updated parameter name
-        print(f"POST_SCHEDULER_INFO: With link: {affiliate_link_override}")
-    print("POST_SCHEDULER_INFO: Social media posting logic not yet implemented.")
-    return False
-
-if __name__ == "__main__":
-    print("--- Post Scheduler Script ---")
-    current_settings = load_settings()
-
-    if not current_settings:
-        print("POST_SCHEDULER_INFO: Exiting due to configuration loading failure.")
-    else:
-        print("POST_SCHEDULER_INFO: Configuration loaded successfully.")
-
-        # Simulated dynamic values for testing
-        simulated_affiliate_link = "https://test.bybit.com/qr-ref"
-        simulated_image_path = "ByBit.png" # Assuming this image exists at the repo root for testing
-        print(f"MAIN_TEST_INFO: Using simulated affiliate link: {simulated_affiliate_link}")
-        print(f"MAIN_TEST_INFO: Using simulated image path: {simulated_image_path}")
-
-
-        blogger_config = current_settings.get('posting_platforms', {}).get('blogger', {})
-        if blogger_config.get('enabled', False) and GOOGLE_LIBS_AVAILABLE:
-            print("\n--- Testing Blogger Posting ---")
-
-            client_secrets_file = blogger_config.get('client_secrets_file', 'client_secret_blogger.json')
-            if not os.path.exists(client_secrets_file):
-                print(f"POST_SCHEDULER_WARNING: '{client_secrets_file}' not found. Creating a dummy one for structural testing ONLY.")
-                print("POST_SCHEDULER_WARNING: Real Blogger posting WILL FAIL without a valid client secrets file from Google Cloud Console.")
- main
                 try:
                     with open(client_secrets_file, 'w') as cs_file:
                         cs_file.write('{"installed":{"client_id":"YOUR_CLIENT_ID.apps.googleusercontent.com","project_id":"YOUR_PROJECT_ID","auth_uri":"https://accounts.google.com/o/oauth2/auth","token_uri":"https://oauth2.googleapis.com/token","auth_provider_x509_cert_url":"https://www.googleapis.com/oauth2/v1/certs","client_secret":"YOUR_CLIENT_SECRET","redirect_uris":["http://localhost"]}}')
                 except IOError as e:
                     console.print(f"[bold red]POST_SCHEDULER_ERROR:[/bold red] Could not write dummy client secrets file: {e}")
-=======
-                    print(f"POST_SCHEDULER_ERROR: Could not write dummy client secrets file: {e}")
- main
 
             blogger_service_client = get_blogger_service(current_settings)
             if blogger_service_client:
                 example_title = f"Test Post via Agent @ {datetime.now().strftime('%Y-%m-%d %H:%M')}"
-=======
-                # Ensure the example_content_html uses the simulated_affiliate_link for the test
- main
                 example_content_html = (
                     "<p>This is a <b>test post</b> generated automatically by the AI Marketing Agent.</p>"
                     "<p>It includes an affiliate link: <a href='{link}'>{link_text}</a></p>"
                     "<p><em>{disclaimer}</em></p>"
                 ).format(
                     link=simulated_affiliate_link,
-=======
-                    link=simulated_affiliate_link, # Use the simulated link for test content
- main
                     link_text="Check out Bybit via QR!",
                     disclaimer=current_settings.get('compliance',{}).get('risk_disclaimer','Invest responsibly.')
                 )
@@ -458,10 +1061,6 @@ if __name__ == "__main__":
 
                 console.print("[blue]POST_SCHEDULER_INFO:[/blue] Attempting test post to Blogger.")
                 console.print("[yellow]NOTE: This will likely require manual OAuth browser interaction if 'blogger_token.json' is not present or invalid.[/yellow]")
-=======
-                print("POST_SCHEDULER_INFO: Attempting test post to Blogger.")
-                print("POST_SCHEDULER_INFO: NOTE: This will likely require manual OAuth browser interaction if 'blogger_token.json' is not present or invalid.")
- main
 
                 post_to_blogger(
                     blogger_service_client,
@@ -484,23 +1083,6 @@ if __name__ == "__main__":
                 current_settings,
                 "WP Test Post",
                 f"<p>Test content for WordPress with link: {simulated_affiliate_link}</p>", # Formatted string
-=======
-                    affiliate_link_override=simulated_affiliate_link, # Pass the override
-                    image_path_for_post=simulated_image_path      # Pass the image path
-                )
-            else:
-                print("POST_SCHEDULER_INFO: Blogger service could not be initialized. Test post skipped.")
-        else:
-            print("\nPOST_SCHEDULER_INFO: Blogger posting is disabled or Google libraries are missing. Skipping Blogger test.")
-
-        wordpress_config = current_settings.get('posting_platforms', {}).get('wordpress', {})
-        if wordpress_config.get('enabled', False):
-            print("\n--- Testing WordPress Posting (Placeholder) ---")
-            post_to_wordpress(
-                current_settings,
-                "WP Test Post",
-                "<p>Test content for WordPress with link: {simulated_affiliate_link}</p>",
- main
                 affiliate_link_override=simulated_affiliate_link,
                 image_path_for_post=simulated_image_path
             )
@@ -516,16 +1098,3 @@ if __name__ == "__main__":
         )
 
     console.print(Panel("Post Scheduler Script Finished", style="bold green", padding=(1,2)))
-=======
-            print("\nPOST_SCHEDULER_INFO: WordPress posting is disabled. Skipping WordPress test.")
-
-        print("\n--- Testing Social Media Posting (Placeholder) ---")
-        post_to_social_media(
-            current_settings,
-            "Check out this cool update! #Bybit #Crypto",
-            image_path=simulated_image_path, # Existing parameter name is fine
-            affiliate_link_override=simulated_affiliate_link # Pass the override
-        )
-
-        print("\n--- Post Scheduler Script Finished ---")
- main
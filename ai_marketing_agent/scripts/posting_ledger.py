@@ -0,0 +1,128 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+
+# Rich library imports
+from rich.console import Console
+
+# Initialize Rich Console
+console = Console()
+
+DEFAULT_POSTING_LEDGER_PATH = os.path.join(os.path.dirname(__file__), '../cache/posting_ledger.sqlite3')
+
+def content_hash(title, content_html):
+    """Identity of an article for duplicate detection: SHA-256 of its title and HTML, ignoring surrounding whitespace."""
+    return hashlib.sha256(f"{(title or '').strip()}\n{(content_html or '').strip()}".encode('utf-8')).hexdigest()
+
+class PostingLedger:
+    """
+    Durable (SQLite) record of what has been published where, keyed by (content hash, platform, target blog/site).
+    Publishing goes reserve() -> publish -> mark_published(), or release() when the platform definitely rejected
+    the post, or mark_unconfirmed() when the outcome is unknown (timeout, connection drop, 5xx) and the post may
+    exist anyway. A reservation is leased, so a second worker cannot publish the same article while the first one
+    is in flight; one left behind by a crash expires after `lease_seconds`. Expired and unconfirmed entries are
+    handed back by reserve() so the caller can look for the post on the platform before publishing it again.
+    Safe to share between threads and processes.
+    """
+    def __init__(self, path=DEFAULT_POSTING_LEDGER_PATH, lease_seconds=900):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+        self.stats = {'reserved': 0, 'duplicates_skipped': 0, 'in_flight_skipped': 0, 'unconfirmed_retries': 0, 'published': 0}
+
+    def _db(self):
+        """The SQLite connection for this process, created (with the schema) on first use. Call with self._lock held."""
+        if self._connection is None or self._pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS posting_ledger ("
+                " content_hash TEXT NOT NULL, platform TEXT NOT NULL, target TEXT NOT NULL, status TEXT NOT NULL,"
+                " title TEXT, remote_id TEXT, remote_url TEXT, lease_until REAL, created_at REAL NOT NULL, updated_at REAL NOT NULL,"
+                " PRIMARY KEY (content_hash, platform, target)) WITHOUT ROWID"
+            )
+            self._pid = os.getpid()
+        return self._connection
+
+    def lookup(self, content_hash, platform, target):
+        """The ledger entry {'status', 'title', 'remote_id', 'remote_url', 'lease_until'} for a key, or None."""
+        with self._lock:
+            row = self._db().execute(
+                "SELECT status, title, remote_id, remote_url, lease_until FROM posting_ledger WHERE content_hash = ? AND platform = ? AND target = ?",
+                (content_hash, platform, str(target))).fetchone()
+        return dict(zip(('status', 'title', 'remote_id', 'remote_url', 'lease_until'), row)) if row else None
+
+    def reserve(self, content_hash, platform, target, title=None):
+        """
+        Claims the right to publish an article to `target`. Returns (False, entry) if it is already published, or
+        being published under a live reservation; otherwise (True, None), or (True, entry) when an earlier attempt
+        ended without a known outcome and the caller should check whether that attempt published it.
+        """
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                row = db.execute(
+                    "SELECT status, title, remote_id, remote_url, lease_until FROM posting_ledger WHERE content_hash = ? AND platform = ? AND target = ?",
+                    (content_hash, platform, str(target))).fetchone()
+                entry = dict(zip(('status', 'title', 'remote_id', 'remote_url', 'lease_until'), row)) if row else None
+                if entry and (entry['status'] == 'published' or (entry['status'] == 'publishing' and (entry['lease_until'] or 0) > now)):
+                    db.execute("COMMIT")
+                    self.stats['duplicates_skipped' if entry['status'] == 'published' else 'in_flight_skipped'] += 1
+                    return False, entry
+                if entry:
+                    self.stats['unconfirmed_retries'] += 1
+                db.execute(
+                    "INSERT OR REPLACE INTO posting_ledger (content_hash, platform, target, status, title, lease_until, created_at, updated_at)"
+                    " VALUES (?, ?, ?, 'publishing', ?, ?, ?, ?)", (content_hash, platform, str(target), title, now + self.lease_seconds, now, now))
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+            self.stats['reserved'] += 1
+        return True, entry
+
+    def find_remote_url(self, content_hash):
+        """URL of any published entry for `content_hash` (any platform or target), or None. Maps uploaded file hashes to hosted URLs."""
+        with self._lock:
+            row = self._db().execute("SELECT remote_url FROM posting_ledger WHERE content_hash = ? AND status = 'published' AND remote_url IS NOT NULL LIMIT 1",
+                                     (content_hash,)).fetchone()
+        return row[0] if row else None
+
+    def mark_published(self, content_hash, platform, target, remote_id=None, remote_url=None):
+        with self._lock:
+            self._db().execute(
+                "UPDATE posting_ledger SET status = 'published', remote_id = ?, remote_url = ?, lease_until = NULL, updated_at = ?"
+                " WHERE content_hash = ? AND platform = ? AND target = ?",
+                (None if remote_id is None else str(remote_id), remote_url, time.time(), content_hash, platform, str(target)))
+            self.stats['published'] += 1
+
+    def release(self, content_hash, platform, target):
+        """Drops a reservation after a failed publish, so the article can be published by a later attempt."""
+        with self._lock:
+            self._db().execute("DELETE FROM posting_ledger WHERE content_hash = ? AND platform = ? AND target = ? AND status = 'publishing'",
+                               (content_hash, platform, str(target)))
+
+    def mark_unconfirmed(self, content_hash, platform, target, error=None):
+        """Records that a publish attempt ended without a known outcome; the next reserve() hands the entry back for checking."""
+        with self._lock:
+            self._db().execute(
+                "UPDATE posting_ledger SET status = 'unconfirmed', remote_url = NULL, lease_until = NULL, updated_at = ?"
+                " WHERE content_hash = ? AND platform = ? AND target = ? AND status = 'publishing'",
+                (time.time(), content_hash, platform, str(target)))
+        if error:
+            console.print(f"[yellow]POSTING LEDGER WARN:[/yellow] Outcome of publishing to {platform} unknown ({error}); it will be checked before any retry.")
+
+    def counts(self):
+        """{status: number of entries}."""
+        with self._lock:
+            rows = self._db().execute("SELECT status, COUNT(*) FROM posting_ledger GROUP BY status").fetchall()
+        counts = {'publishing': 0, 'unconfirmed': 0, 'published': 0}
+        counts.update(rows)
+        return counts
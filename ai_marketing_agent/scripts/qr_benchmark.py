@@ -0,0 +1,240 @@
+import os
+import io
+import json
+import time
+import argparse
+import contextlib
+from datetime import datetime
+
+import cv2
+import numpy as np
+
+# Rich library imports
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+# Sibling script under test
+import qr_processor
+
+# Initialize Rich Console
+console = Console()
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), '../cache/qr_benchmark_corpus')
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), '../logs/benchmarks')
+
+RESOLUTIONS = [(800, 600), (1920, 1080), (2560, 1440), (3840, 2160)]
+MODULE_SIZES = [2, 3, 5, 8]      # Pixels per QR module
+ROTATIONS = [0, 10, 30, 45, 90]  # Degrees
+NOISE_LEVELS = [0, 8, 20]        # Gaussian noise sigma (0-255 scale)
+QUIET_ZONE_MODULES = 4
+
+def _qr_matrix(payload, module_px):
+    """QR code for `payload` as a white-bordered uint8 image with `module_px` pixels per module."""
+    code = cv2.QRCodeEncoder.create().encode(payload)
+    code = cv2.copyMakeBorder(code, QUIET_ZONE_MODULES, QUIET_ZONE_MODULES, QUIET_ZONE_MODULES, QUIET_ZONE_MODULES, cv2.BORDER_CONSTANT, value=255)
+    return cv2.resize(code, None, fx=module_px, fy=module_px, interpolation=cv2.INTER_NEAREST)
+
+def _rotate(image, angle):
+    if angle == 0:
+        return image
+    height, width = image.shape[:2]
+    matrix = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+    cos, sin = abs(matrix[0, 0]), abs(matrix[0, 1])
+    new_width, new_height = int(height * sin + width * cos), int(height * cos + width * sin)
+    matrix[0, 2] += new_width / 2 - width / 2
+    matrix[1, 2] += new_height / 2 - height / 2
+    return cv2.warpAffine(image, matrix, (new_width, new_height), borderValue=255)
+
+def _background(rng, width, height):
+    """Screenshot-like canvas: a colour gradient with a few solid panels and text-like strokes."""
+    top, bottom = rng.integers(120, 256, 3), rng.integers(40, 200, 3)
+    ramp = np.linspace(0.0, 1.0, height, dtype=np.float32)[:, None, None]
+    canvas = (top * (1 - ramp) + bottom * ramp).astype(np.uint8).repeat(width, axis=1)
+    for _ in range(6):
+        x, y = int(rng.integers(0, width)), int(rng.integers(0, height))
+        cv2.rectangle(canvas, (x, y), (x + int(rng.integers(50, width // 3)), y + int(rng.integers(20, height // 4))), tuple(int(c) for c in rng.integers(0, 256, 3)), -1)
+    for _ in range(10):
+        cv2.putText(canvas, "BYBIT " + str(int(rng.integers(1000, 9999))), (int(rng.integers(0, width - 200)), int(rng.integers(30, height))),
+                    cv2.FONT_HERSHEY_SIMPLEX, float(rng.uniform(0.6, 2.0)), tuple(int(c) for c in rng.integers(0, 256, 3)), 2)
+    return canvas
+
+def generate_corpus(corpus_dir=CORPUS_DIR, positives=40, negatives=10, seed=0):
+    """
+    Writes a reproducible synthetic corpus (same seed -> same images) and returns its case list:
+    [{'file', 'expected' (payload or None), 'resolution', 'module_px', 'rotation', 'noise', 'format'}].
+    """
+    rng = np.random.default_rng(seed)
+    os.makedirs(corpus_dir, exist_ok=True)
+    cases = []
+    for index in range(positives + negatives):
+        width, height = RESOLUTIONS[int(rng.integers(len(RESOLUTIONS)))]
+        canvas = _background(rng, width, height)
+        case = {'resolution': [width, height], 'module_px': None, 'rotation': None, 'noise': int(rng.choice(NOISE_LEVELS)),
+                'format': "jpg" if rng.random() < 0.3 else "png", 'expected': None}
+
+        if index < positives:
+            case['expected'] = f"https://www.bybit.com/invite?ref=BENCH{seed}X{index:04d}"
+            case['module_px'] = int(rng.choice(MODULE_SIZES))
+            case['rotation'] = int(rng.choice(ROTATIONS))
+            code = _rotate(_qr_matrix(case['expected'], case['module_px']), case['rotation'])
+            if code.shape[0] >= height or code.shape[1] >= width: # Too big for this canvas: shrink the modules
+                case['module_px'] = 2
+                code = _rotate(_qr_matrix(case['expected'], 2), case['rotation'])
+            y, x = int(rng.integers(0, height - code.shape[0])), int(rng.integers(0, width - code.shape[1]))
+            canvas[y:y + code.shape[0], x:x + code.shape[1]] = code[..., None]
+            case['position'] = [x, y]
+
+        if case['noise']:
+            canvas = np.clip(canvas.astype(np.int16) + rng.normal(0, case['noise'], canvas.shape).astype(np.int16), 0, 255).astype(np.uint8)
+        case['file'] = f"{'qr' if case['expected'] else 'neg'}_{index:04d}.{case['format']}"
+        cv2.imwrite(os.path.join(corpus_dir, case['file']), canvas, [cv2.IMWRITE_JPEG_QUALITY, 85] if case['format'] == "jpg" else [])
+        cases.append(case)
+
+    with open(os.path.join(corpus_dir, "corpus.json"), 'w') as f:
+        json.dump({'seed': seed, 'positives': positives, 'negatives': negatives, 'cases': cases}, f, indent=2)
+    return cases
+
+def load_or_generate_corpus(corpus_dir=CORPUS_DIR, positives=40, negatives=10, seed=0):
+    """Reuses an existing corpus with the same parameters; regenerates it otherwise."""
+    try:
+        with open(os.path.join(corpus_dir, "corpus.json"), 'r') as f:
+            existing = json.load(f)
+        if (existing['seed'], existing['positives'], existing['negatives']) == (seed, positives, negatives) and \
+                all(os.path.exists(os.path.join(corpus_dir, case['file'])) for case in existing['cases']):
+            return existing['cases']
+    except (FileNotFoundError, ValueError, KeyError):
+        pass
+    console.print(f"[blue]Info:[/blue] Generating synthetic corpus ({positives} QR images + {negatives} negatives, seed {seed}) in {corpus_dir}...")
+    return generate_corpus(corpus_dir, positives, negatives, seed)
+
+def latency_summary(seconds_list):
+    latencies_ms = np.array(seconds_list) * 1000
+    if not len(latencies_ms):
+        return {}
+    return {
+        'mean_ms': round(float(latencies_ms.mean()), 3),
+        'p50_ms': round(float(np.percentile(latencies_ms, 50)), 3),
+        'p90_ms': round(float(np.percentile(latencies_ms, 90)), 3),
+        'p95_ms': round(float(np.percentile(latencies_ms, 95)), 3),
+        'p99_ms': round(float(np.percentile(latencies_ms, 99)), 3),
+        'max_ms': round(float(latencies_ms.max()), 3),
+    }
+
+def accuracy_summary(cases, results):
+    """results[i] is the value returned for cases[i] (payload string or None)."""
+    positives = [(case, result) for case, result in zip(cases, results) if case['expected']]
+    negatives = [(case, result) for case, result in zip(cases, results) if not case['expected']]
+    correct = sum(1 for case, result in zip(cases, results) if result == case['expected'])
+    return {
+        'accuracy': round(correct / len(cases), 4) if cases else 0.0,
+        'recall': round(sum(1 for case, result in positives if result == case['expected']) / len(positives), 4) if positives else 0.0,
+        'wrong_payloads': sum(1 for case, result in positives if result and result != case['expected']),
+        'false_positives': sum(1 for _, result in negatives if result),
+        'misses': [case['file'] for case, result in positives if result != case['expected']],
+    }
+
+def benchmark_single_mode(cases, corpus_dir, decoder_mode, repeat=1):
+    """Times extract_qr_link_from_image for every case (decode cache off) with the given decoder mode."""
+    qr_processor.QR_DECODER_SETTINGS['mode'] = decoder_mode
+    for tier_stats in qr_processor.QR_TIER_STATS.values():
+        tier_stats.update(attempts=0, hits=0, seconds=0.0)
+
+    latencies, results = [], []
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        results = []
+        for case in cases:
+            image_path = os.path.join(corpus_dir, case['file'])
+            with contextlib.redirect_stdout(io.StringIO()): # qr_processor prints one line per image
+                image_start = time.perf_counter()
+                results.append(qr_processor.extract_qr_link_from_image(image_path, default_if_not_found=None, use_cache=False))
+                latencies.append(time.perf_counter() - image_start)
+    elapsed = time.perf_counter() - start_time
+
+    return {
+        'mode': f"single:{decoder_mode}",
+        'images': len(cases) * repeat,
+        'seconds': round(elapsed, 4),
+        'throughput_images_per_s': round(len(cases) * repeat / elapsed, 2) if elapsed else 0.0,
+        'latency': latency_summary(latencies),
+        'accuracy': accuracy_summary(cases, results),
+        'tiers': qr_processor.get_qr_tier_stats(),
+    }
+
+def benchmark_batch_mode(cases, corpus_dir, decoder_mode, max_workers=None):
+    """Times batch_extract_qr_links (process pool) over the whole corpus. Latency is per image inside the workers."""
+    qr_processor.QR_DECODER_SETTINGS['mode'] = decoder_mode # Inherited by forked workers
+    image_paths = [os.path.join(corpus_dir, case['file']) for case in cases]
+    start_time = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        batch_results = qr_processor.batch_extract_qr_links(image_paths, max_workers=max_workers, use_cache=False)
+    elapsed = time.perf_counter() - start_time
+    results = [(batch_results[path]['payloads'] or [None])[0] for path in image_paths]
+
+    return {
+        'mode': f"batch:{decoder_mode}",
+        'workers': max_workers or os.cpu_count(),
+        'images': len(cases),
+        'seconds': round(elapsed, 4),
+        'throughput_images_per_s': round(len(cases) / elapsed, 2) if elapsed else 0.0,
+        'latency': latency_summary([batch_results[path]['seconds'] for path in image_paths]),
+        'accuracy': accuracy_summary(cases, results),
+    }
+
+def save_results(report, results_dir=RESULTS_DIR):
+    os.makedirs(results_dir, exist_ok=True)
+    path = os.path.join(results_dir, f"qr_benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+    return path
+
+def print_results(report):
+    table = Table(title="[bold blue]QR Decode Benchmark[/bold blue]")
+    table.add_column("Mode", style="cyan")
+    table.add_column("Img/s", justify="right")
+    table.add_column("p50 ms", justify="right")
+    table.add_column("p90 ms", justify="right")
+    table.add_column("p99 ms", justify="right")
+    table.add_column("Accuracy", justify="right")
+    table.add_column("Recall", justify="right")
+    table.add_column("False +", justify="right")
+    for run in report['runs']:
+        latency, accuracy = run['latency'], run['accuracy']
+        table.add_row(run['mode'], f"{run['throughput_images_per_s']:.1f}", f"{latency.get('p50_ms', 0):.1f}", f"{latency.get('p90_ms', 0):.1f}",
+                      f"{latency.get('p99_ms', 0):.1f}", f"{accuracy['accuracy']:.0%}", f"{accuracy['recall']:.0%}", str(accuracy['false_positives']))
+    console.print(table)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark qr_processor decode latency, throughput and accuracy on a synthetic corpus.")
+    parser.add_argument("--positives", type=int, default=40, help="Images containing a QR code.")
+    parser.add_argument("--negatives", type=int, default=10, help="Images without a QR code.")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus seed (same seed -> identical corpus).")
+    parser.add_argument("--repeat", type=int, default=1, help="Timing passes over the corpus for single-image modes.")
+    parser.add_argument("--modes", nargs="+", default=["single:full", "single:tiered", "batch:tiered"],
+                        help="Modes to run: single:<full|tiered> and/or batch:<full|tiered>.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for batch modes (default: CPU cores).")
+    parser.add_argument("--corpus-dir", default=CORPUS_DIR)
+    parser.add_argument("--results-dir", default=RESULTS_DIR)
+    args = parser.parse_args()
+
+    console.print(Panel("QR Processor Benchmark", title="[bold magenta]Agent Script[/bold magenta]"))
+    corpus_cases = load_or_generate_corpus(args.corpus_dir, args.positives, args.negatives, args.seed)
+
+    benchmark_report = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'corpus': {'dir': os.path.abspath(args.corpus_dir), 'seed': args.seed, 'positives': args.positives, 'negatives': args.negatives},
+        'environment': {'opencv': cv2.__version__, 'numpy': np.__version__, 'cpu_count': os.cpu_count()},
+        'decoder_settings': dict(qr_processor.QR_DECODER_SETTINGS),
+        'runs': [],
+    }
+    for mode in args.modes:
+        kind, _, decoder_mode = mode.partition(":")
+        console.print(f"[blue]Info:[/blue] Running [b]{mode}[/b]...")
+        if kind == "batch":
+            benchmark_report['runs'].append(benchmark_batch_mode(corpus_cases, args.corpus_dir, decoder_mode or "tiered", args.workers))
+        else:
+            benchmark_report['runs'].append(benchmark_single_mode(corpus_cases, args.corpus_dir, decoder_mode or "tiered", args.repeat))
+
+    print_results(benchmark_report)
+    console.print(f"[green]Results saved to[/green] {save_results(benchmark_report, args.results_dir)}")
@@ -1,6 +1,15 @@
 import cv2
 from pyzbar.pyzbar import decode
 import os
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import argparse
+import threading
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
 
 # Attempt to import necessary libraries and provide helpful error messages if they are missing.
 try:
@@ -17,7 +26,184 @@ except ImportError:
     print("Note: pyzbar might also require system libraries like libzbar0 (e.g., 'sudo apt-get install libzbar0' on Debian/Ubuntu).")
     exit(1)
 
-def extract_qr_link_from_image(image_path, default_if_not_found=None):
+QR_CACHE_SETTINGS = {
+    'enabled': True,
+    'path': os.path.join(os.path.dirname(__file__), '../cache/qr_decode_cache.sqlite3'),
+}
+QR_CACHE_STATS = {'hits': 0, 'misses': 0, 'stores': 0}
+QR_MANIFEST_PATH = os.path.join(os.path.dirname(__file__), '../cache/qr_manifest.json')
+DEFAULT_IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+QR_DECODER_SETTINGS = {
+    'mode': 'tiered',           # 'tiered' (downscaled -> ROI -> full resolution) or 'full' (full resolution only)
+    'downscale_max_side': 1024, # Longest side of the cheap first-tier copy, in pixels
+    'roi_margin': 0.15,         # Extra border around a detected QR region, as a fraction of its size
+}
+QR_DECODE_TIERS = ('downscaled', 'roi', 'full')
+QR_TIER_STATS = {tier: {'attempts': 0, 'hits': 0, 'seconds': 0.0} for tier in QR_DECODE_TIERS}
+_qr_cache_lock = threading.Lock()
+_qr_cache_connections = {} # (pid, path) -> sqlite3.Connection; a forked worker process must open its own
+
+def configure_qr_cache(config):
+    """Applies the optional `qr_code_processing.decode_cache` (enabled, path) and `.decoder` (mode, downscale_max_side, roi_margin) settings."""
+    qr_settings = (config or {}).get('qr_code_processing', {})
+    if isinstance(qr_settings.get('decode_cache'), dict):
+        QR_CACHE_SETTINGS.update(qr_settings['decode_cache'])
+    if isinstance(qr_settings.get('decoder'), dict):
+        QR_DECODER_SETTINGS.update(qr_settings['decoder'])
+
+def _get_qr_cache_connection():
+    """Returns this process's connection to the decode cache, creating the database on first use. Call with _qr_cache_lock held."""
+    connection_key = (os.getpid(), QR_CACHE_SETTINGS['path'])
+    connection = _qr_cache_connections.get(connection_key)
+    if connection is None:
+        os.makedirs(os.path.dirname(QR_CACHE_SETTINGS['path']) or '.', exist_ok=True)
+        connection = sqlite3.connect(QR_CACHE_SETTINGS['path'], timeout=30, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL") # Lets parallel decoders read while one writes
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS qr_decodes ("
+            " content_sha256 TEXT NOT NULL, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL,"
+            " payloads TEXT NOT NULL, decoded_at REAL NOT NULL,"
+            " PRIMARY KEY (content_sha256, size, mtime_ns))"
+        )
+        connection.commit()
+        _qr_cache_connections[connection_key] = connection
+    return connection
+
+def qr_cache_key(image_path):
+    """(SHA-256 of the file bytes, size, mtime_ns) for `image_path`. Editing or touching the file gives a new key."""
+    stat = os.stat(image_path)
+    sha256 = hashlib.sha256()
+    with open(image_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            sha256.update(block)
+    return sha256.hexdigest(), stat.st_size, stat.st_mtime_ns
+
+def load_cached_qr_payloads(cache_key):
+    """Returns the cached list of payloads for `cache_key` ([] = cached "no QR code"), or None on a miss."""
+    try:
+        with _qr_cache_lock:
+            row = _get_qr_cache_connection().execute(
+                "SELECT payloads FROM qr_decodes WHERE content_sha256 = ? AND size = ? AND mtime_ns = ?", cache_key).fetchone()
+            QR_CACHE_STATS['hits' if row else 'misses'] += 1
+    except sqlite3.Error as e:
+        print(f"QR Processor WARN: Could not read QR decode cache: {e}")
+        return None
+    return json.loads(row[0]) if row else None
+
+def store_cached_qr_payloads(cache_key, payloads):
+    try:
+        with _qr_cache_lock:
+            connection = _get_qr_cache_connection()
+            connection.execute("INSERT OR REPLACE INTO qr_decodes VALUES (?, ?, ?, ?, ?)", (*cache_key, json.dumps(payloads), time.time()))
+            connection.commit()
+            QR_CACHE_STATS['stores'] += 1
+    except sqlite3.Error as e:
+        print(f"QR Processor WARN: Could not write QR decode cache: {e}")
+
+def get_qr_cache_stats():
+    with _qr_cache_lock:
+        stats = dict(QR_CACHE_STATS)
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+    return stats
+
+def _zbar_payloads(image):
+    return [decoded_object.data.decode('utf-8', errors='replace') for decoded_object in decode(image)]
+
+def _qr_regions(small_gray, scale, full_shape, margin):
+    """Bounding boxes (in full-resolution coordinates) of QR codes that cv2.QRCodeDetector locates in the downscaled image."""
+    found, points = cv2.QRCodeDetector().detectMulti(small_gray)
+    if not found or points is None:
+        return []
+    height, width = full_shape[:2]
+    regions = []
+    for quad in points:
+        x_min, y_min = quad.min(axis=0) / scale
+        x_max, y_max = quad.max(axis=0) / scale
+        pad_x, pad_y = (x_max - x_min) * margin, (y_max - y_min) * margin
+        regions.append((max(0, int(x_min - pad_x)), max(0, int(y_min - pad_y)),
+                        min(width, int(x_max + pad_x) + 1), min(height, int(y_max + pad_y) + 1)))
+    return regions
+
+def decode_qr_tiered(gray):
+    """
+    Decodes a grayscale image with progressively more expensive tiers, stopping at the first that finds a QR code:
+      1. 'downscaled': a copy shrunk to `downscale_max_side` (skipped if the image is already that small),
+      2. 'roi': full-resolution crops of the regions cv2.QRCodeDetector locates in the downscaled copy,
+      3. 'full': the whole full-resolution image (the original behaviour; a negative answer is only given here).
+    Returns (payloads, tier_timings) where tier_timings is a list of (tier, seconds, found) for the tiers tried.
+    """
+    timings = []
+
+    def run_tier(tier, func):
+        start_time = time.perf_counter()
+        payloads = func()
+        elapsed = time.perf_counter() - start_time
+        timings.append((tier, elapsed, bool(payloads)))
+        QR_TIER_STATS[tier]['attempts'] += 1
+        QR_TIER_STATS[tier]['seconds'] += elapsed
+        QR_TIER_STATS[tier]['hits'] += bool(payloads)
+        return payloads
+
+    if QR_DECODER_SETTINGS.get('mode', 'tiered') == 'tiered':
+        scale = min(1.0, QR_DECODER_SETTINGS['downscale_max_side'] / max(gray.shape[:2]))
+        if scale < 1.0:
+            small_gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+            payloads = run_tier('downscaled', lambda: _zbar_payloads(small_gray))
+            if payloads:
+                return payloads, timings
+
+            def decode_regions():
+                region_payloads = []
+                for x0, y0, x1, y1 in _qr_regions(small_gray, scale, gray.shape, QR_DECODER_SETTINGS['roi_margin']):
+                    region_payloads += [payload for payload in _zbar_payloads(gray[y0:y1, x0:x1]) if payload not in region_payloads]
+                return region_payloads
+            payloads = run_tier('roi', decode_regions)
+            if payloads:
+                return payloads, timings
+
+    return run_tier('full', lambda: _zbar_payloads(gray)), timings
+
+def get_qr_tier_stats():
+    """Per-tier attempts, hits, total and mean latency (ms) accumulated by decode_qr_tiered in this process."""
+    return {tier: dict(stats, mean_ms=(stats['seconds'] / stats['attempts'] * 1000) if stats['attempts'] else 0.0)
+            for tier, stats in QR_TIER_STATS.items()}
+
+def decode_qr_payloads(image_path, use_cache=True):
+    """
+    Decodes every QR code in the image and returns the list of payload strings ([] if there is none).
+    Results, including "no QR code", are cached by content hash + size + mtime, so a cache hit never touches cv2.
+    Returns None if the file is missing or cannot be read as an image (such failures are not cached).
+    """
+    if not os.path.exists(image_path):
+        print(f"QR Processor INFO: Image file not found at '{image_path}'.")
+        return None
+
+    cache_key = None
+    if use_cache and QR_CACHE_SETTINGS.get('enabled', True):
+        try:
+            cache_key = qr_cache_key(image_path)
+        except OSError as e:
+            print(f"QR Processor WARN: Could not hash '{image_path}' for the decode cache: {e}")
+        if cache_key:
+            cached_payloads = load_cached_qr_payloads(cache_key)
+            if cached_payloads is not None:
+                return cached_payloads
+
+    # Load the image using OpenCV (zbar only looks at luminance, so read it as grayscale straight away)
+    img = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+
+    if img is None:
+        print(f"QR Processor ERROR: Could not read or decode image at '{image_path}'. File might be corrupted or not a supported image format.")
+        return None
+
+    # Decode QR codes, cheapest tier first
+    payloads, _ = decode_qr_tiered(img)
+    if cache_key:
+        store_cached_qr_payloads(cache_key, payloads)
+    return payloads
+
+def extract_qr_link_from_image(image_path, default_if_not_found=None, use_cache=True):
     """
     Attempts to detect and decode a QR code from the given image file.
 
@@ -25,28 +211,20 @@ def extract_qr_link_from_image(image_path, default_if_not_found=None):
         image_path (str): The path to the image file.
         default_if_not_found (any, optional): Value to return if no QR code is found
                                              or an error occurs. Defaults to None.
+        use_cache (bool, optional): Look up / store the result in the persistent decode cache. Defaults to True.
 
     Returns:
         str: The decoded QR code data (e.g., a URL) if found, otherwise default_if_not_found.
     """
-    if not os.path.exists(image_path):
-        print(f"QR Processor INFO: Image file not found at '{image_path}'.")
-        return default_if_not_found
-
     try:
-        # Load the image using OpenCV
-        img = cv2.imread(image_path)
+        payloads = decode_qr_payloads(image_path, use_cache=use_cache)
 
-        if img is None:
-            print(f"QR Processor ERROR: Could not read or decode image at '{image_path}'. File might be corrupted or not a supported image format.")
+        if payloads is None:
             return default_if_not_found
 
-        # Decode QR codes
-        decoded_objects = decode(img)
-
-        if decoded_objects:
+        if payloads:
             # For simplicity, return the data from the first QR code found
-            qr_data = decoded_objects[0].data.decode('utf-8')
+            qr_data = payloads[0]
             print(f"QR Processor INFO: Found QR code in '{image_path}'. Decoded data: {qr_data}")
             return qr_data
         else:
@@ -56,7 +234,157 @@ def extract_qr_link_from_image(image_path, default_if_not_found=None):
         print(f"QR Processor ERROR: An exception occurred while processing image '{image_path}': {e}")
         return default_if_not_found
 
+# --- Batch extraction over asset directories ---
+def find_images(root_dir, extensions=DEFAULT_IMAGE_EXTENSIONS, recursive=True):
+    """Returns {relative_path: (size, mtime_ns)} for every image under `root_dir` (hidden directories are skipped)."""
+    extensions = tuple(ext.lower() for ext in extensions)
+    images = {}
+    for dir_path, dir_names, file_names in os.walk(root_dir):
+        dir_names[:] = sorted(d for d in dir_names if not d.startswith('.')) if recursive else []
+        for file_name in file_names:
+            if file_name.lower().endswith(extensions):
+                full_path = os.path.join(dir_path, file_name)
+                try:
+                    stat = os.stat(full_path)
+                except OSError:
+                    continue
+                images[os.path.relpath(full_path, root_dir)] = (stat.st_size, stat.st_mtime_ns)
+    return images
+
+def _init_qr_worker(cache_settings, decoder_settings):
+    """Process-pool initializer: applies the parent's configure_qr_cache() settings, which a spawned worker would not inherit."""
+    QR_CACHE_SETTINGS.update(cache_settings)
+    QR_DECODER_SETTINGS.update(decoder_settings)
+
+def _decode_image_for_batch(image_path, use_cache):
+    """Process-pool worker: decodes one image and reports every payload (or the error)."""
+    start_time = time.perf_counter()
+    hits_before = QR_CACHE_STATS['hits']
+    tiers_before = {tier: dict(stats) for tier, stats in QR_TIER_STATS.items()}
+    try:
+        payloads = decode_qr_payloads(image_path, use_cache=use_cache)
+        error = None if payloads is not None else "Unreadable image"
+    except Exception as e:
+        payloads, error = None, str(e)
+    return {'payloads': payloads or [], 'error': error, 'seconds': round(time.perf_counter() - start_time, 4),
+            'cache_hit': QR_CACHE_STATS['hits'] > hits_before,
+            'tiers': {tier: {key: stats[key] - tiers_before[tier][key] for key in stats} for tier, stats in QR_TIER_STATS.items() if stats['attempts'] > tiers_before[tier]['attempts']}}
+
+def batch_extract_qr_links(image_paths, max_workers=None, use_cache=True):
+    """
+    Decodes all `image_paths` in a process pool (one worker per core by default) and returns
+    {image_path: {'payloads': [...], 'error': str or None, 'seconds': float}}. Small batches run in-process.
+    """
+    image_paths = list(image_paths)
+    max_workers = max_workers or os.cpu_count() or 1
+    if len(image_paths) <= 1 or max_workers == 1:
+        return {path: _decode_image_for_batch(path, use_cache) for path in image_paths}
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(image_paths)), initializer=_init_qr_worker,
+                             initargs=(dict(QR_CACHE_SETTINGS), dict(QR_DECODER_SETTINGS))) as executor:
+        results = dict(zip(image_paths, executor.map(_decode_image_for_batch, image_paths, [use_cache] * len(image_paths), chunksize=4)))
+    # Workers count cache lookups and tier timings in their own processes; fold them into this process's stats
+    for result in results.values():
+        for tier, tier_delta in result['tiers'].items():
+            for key, value in tier_delta.items():
+                QR_TIER_STATS[tier][key] += value
+    if use_cache and QR_CACHE_SETTINGS.get('enabled', True):
+        worker_hits = sum(1 for result in results.values() if result['cache_hit'])
+        with _qr_cache_lock:
+            QR_CACHE_STATS['hits'] += worker_hits
+            QR_CACHE_STATS['misses'] += len(results) - worker_hits
+    return results
+
+# main_agent loads this script as "ai_marketing_agent.scripts.qr_processor" and also registers it as "qr_processor".
+# Pool workers are pickled by module name, and a spawned worker can only import the plain script name (the scripts
+# directory is on its sys.path; the package path need not be), so the worker functions are pickled under that name.
+if __name__ != "qr_processor" and sys.modules.get("qr_processor") is sys.modules.get(__name__):
+    for _worker_function in (_init_qr_worker, _decode_image_for_batch):
+        _worker_function.__module__ = "qr_processor"
+
+def load_qr_manifest(manifest_path=QR_MANIFEST_PATH):
+    try:
+        with open(manifest_path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (IOError, ValueError) as e:
+        print(f"QR Processor WARN: Could not read QR manifest '{manifest_path}': {e}")
+        return None
+
+def save_qr_manifest(manifest, manifest_path=QR_MANIFEST_PATH):
+    """Writes the manifest atomically (temp file + rename)."""
+    os.makedirs(os.path.dirname(manifest_path) or '.', exist_ok=True)
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+def build_qr_manifest(root_dir, manifest_path=QR_MANIFEST_PATH, extensions=DEFAULT_IMAGE_EXTENSIONS, recursive=True, max_workers=None, use_cache=True):
+    """
+    Walks `root_dir` and writes a manifest of every image with all its QR payloads.
+    Entries from the previous manifest whose size and mtime are unchanged are reused; only new or modified
+    images are decoded (in parallel). Returns the manifest dict:
+    {'root_dir', 'generated_at', 'images': {relative_path: {'size', 'mtime_ns', 'payloads', 'error'}}}
+    """
+    root_dir = os.path.abspath(root_dir)
+    previous = load_qr_manifest(manifest_path) or {}
+    previous_images = previous.get('images', {}) if previous.get('root_dir') == root_dir else {}
+
+    images = find_images(root_dir, extensions, recursive)
+    manifest_images, to_decode = {}, []
+    for rel_path, (size, mtime_ns) in images.items():
+        entry = previous_images.get(rel_path)
+        if entry and entry.get('size') == size and entry.get('mtime_ns') == mtime_ns and not entry.get('error'):
+            manifest_images[rel_path] = entry
+        else:
+            to_decode.append(rel_path)
+
+    start_time = time.perf_counter()
+    decoded = batch_extract_qr_links([os.path.join(root_dir, rel_path) for rel_path in to_decode], max_workers, use_cache)
+    for rel_path in to_decode:
+        result = decoded[os.path.join(root_dir, rel_path)]
+        size, mtime_ns = images[rel_path]
+        manifest_images[rel_path] = {'size': size, 'mtime_ns': mtime_ns, 'payloads': result['payloads'], 'error': result['error']}
+
+    manifest = {
+        'root_dir': root_dir,
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'images': dict(sorted(manifest_images.items())),
+    }
+    save_qr_manifest(manifest, manifest_path)
+    print(f"QR Processor INFO: Manifest of {len(images)} image(s) written to '{manifest_path}' "
+          f"({len(to_decode)} decoded in {time.perf_counter() - start_time:.2f}s, {len(images) - len(to_decode)} unchanged).")
+    return manifest
+
+def manifest_link_catalog(manifest):
+    """Flattens a manifest into [(absolute_image_path, [payloads])] for images that contain at least one QR code."""
+    root_dir = manifest.get('root_dir', '.')
+    return [(os.path.join(root_dir, rel_path), entry['payloads']) for rel_path, entry in manifest.get('images', {}).items() if entry.get('payloads')]
+
+def run_batch_cli(args):
+    manifest = build_qr_manifest(args.scan, args.manifest, extensions=args.ext, recursive=not args.no_recursive,
+                                 max_workers=args.workers, use_cache=not args.no_cache)
+    for rel_path, entry in manifest['images'].items():
+        status = entry['error'] or (", ".join(entry['payloads']) if entry['payloads'] else "no QR code")
+        print(f"  {rel_path}: {status}")
+    catalog = manifest_link_catalog(manifest)
+    print(f"\n{len(catalog)} of {len(manifest['images'])} image(s) contain QR codes.")
+    for tier, tier_stats in get_qr_tier_stats().items():
+        print(f"Decode tier '{tier}': {tier_stats['attempts']} attempts, {tier_stats['hits']} hits, {tier_stats['mean_ms']:.1f} ms mean")
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="QR code processor: test decode, or batch-scan an asset tree into a manifest.")
+    parser.add_argument("--scan", metavar="DIR", help="Walk DIR, decode every image in parallel and write the QR manifest.")
+    parser.add_argument("--manifest", default=QR_MANIFEST_PATH, help="Manifest output path (default: %(default)s).")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: number of CPU cores).")
+    parser.add_argument("--ext", nargs="+", default=list(DEFAULT_IMAGE_EXTENSIONS), help="Image extensions to include.")
+    parser.add_argument("--no-recursive", action="store_true", help="Only scan DIR itself, not its subdirectories.")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the persistent decode cache.")
+    cli_args = parser.parse_args()
+    if cli_args.scan:
+        run_batch_cli(cli_args)
+        raise SystemExit(0)
+
     print("--- Testing QR Code Processor ---")
 
     # Test images expected to be in the root directory relative to where the agent is run
@@ -109,4 +437,12 @@ if __name__ == "__main__":
         else:
             print(f"Result for '{image_file_path}': Extracted Link -> {extracted_link}")
 
+    # Second pass: every lookup should now be answered by the decode cache
+    for image_info in test_images_info:
+        extract_qr_link_from_image(image_info["path"], default_if_not_found=default_return)
+    cache_stats = get_qr_cache_stats()
+    print(f"\nQR decode cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses (hit rate {cache_stats['hit_rate']:.0%}).")
+    for tier, tier_stats in get_qr_tier_stats().items():
+        print(f"Decode tier '{tier}': {tier_stats['attempts']} attempts, {tier_stats['hits']} hits, {tier_stats['mean_ms']:.1f} ms mean")
+
     print("\n--- QR Code Processor Test Finished ---")
@@ -0,0 +1,185 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from urllib.parse import quote_plus
+from datetime import datetime
+
+# Rich library imports
+from rich.console import Console
+from rich.panel import Panel
+
+# Initialize Rich Console
+console = Console()
+
+DEFAULT_FIXTURE_DIR = os.path.join(os.path.dirname(__file__), '../sim_data/search_fixtures')
+FIXTURE_INDEX_FILE = "index.json"
+GOOGLE_CSE_ENDPOINT = "https://www.googleapis.com/customsearch/v1"
+GOOGLE_CSE_MAX_RESULTS = 10 # Per request, imposed by the API
+
+def _fetch_result(url, status=None, text="", error=None, seconds=0.0, from_cache=False):
+    """A result dict shaped like http_fetcher.ConcurrentFetcher.fetch() output, for backends that do not fetch over HTTP."""
+    return {'url': url, 'status': status, 'text': text, 'headers': {}, 'error': error, 'attempts': 1 if status else 0,
+            'seconds': seconds, 'from_cache': from_cache, 'truncated': False}
+
+class SearchBackend:
+    """
+    Where search result pages come from. A backend turns queries into raw result pages (fetch result dicts, in
+    query order) and knows how to read URLs out of its own page format. Reporting, filtering, dedupe and
+    scoring live in opportunity_finder and do not change per backend.
+    """
+    name = "base"
+
+    def fetch_result_pages(self, queries, num_results):
+        raise NotImplementedError
+
+    def parse_results(self, text, num_results):
+        raise NotImplementedError
+
+    def describe(self):
+        return self.name
+
+class HtmlScrapeBackend(SearchBackend):
+    """Scrapes a Google-style HTML results page per query (google.com, or search_standin_server.py for offline runs)."""
+    name = "scrape"
+
+    def __init__(self, base_url, fetcher, parse_func):
+        self.base_url = base_url
+        self.fetcher = fetcher
+        self.parse_func = parse_func
+
+    def build_url(self, query, num_results):
+        return f"{self.base_url}?q={quote_plus(query)}&num={num_results}"
+
+    def fetch_result_pages(self, queries, num_results):
+        return self.fetcher.fetch_many([self.build_url(query, num_results) for query in queries])
+
+    def parse_results(self, text, num_results):
+        return self.parse_func(text, num_results)
+
+    def describe(self):
+        return f"{self.name} ({self.base_url})"
+
+def fixture_key(query, num_results):
+    return hashlib.sha256(f"{num_results}\n{query}".encode('utf-8')).hexdigest()[:24]
+
+class FixtureSearchBackend(SearchBackend):
+    """
+    Serves recorded result pages from `fixture_dir` (one .html file per query and result count, listed in
+    index.json), so the opportunity pipeline runs deterministically and offline.
+    With a `record_from` backend, missing pages are fetched through it and saved as new fixtures; without one,
+    a query that was never recorded fails like an unreachable search.
+    """
+    name = "fixture"
+
+    def __init__(self, fixture_dir=DEFAULT_FIXTURE_DIR, parse_func=None, record_from=None):
+        self.fixture_dir = fixture_dir
+        self.parse_func = parse_func or (record_from.parse_results if record_from else None)
+        self.record_from = record_from
+        self._lock = threading.Lock()
+        self.stats = {'replayed': 0, 'recorded': 0, 'missing': 0}
+
+    def _load_index(self):
+        try:
+            with open(os.path.join(self.fixture_dir, FIXTURE_INDEX_FILE), 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _replay(self, query, num_results):
+        start_time = time.perf_counter()
+        key = fixture_key(query, num_results)
+        try:
+            with open(os.path.join(self.fixture_dir, f"{key}.html"), 'r', encoding='utf-8') as f:
+                text = f.read()
+        except FileNotFoundError:
+            return None
+        return _fetch_result(f"fixture://{key}", status=200, text=text, seconds=round(time.perf_counter() - start_time, 4), from_cache=True)
+
+    def record(self, query, num_results, fetch_result):
+        """Saves a successful live result page as the fixture for (query, num_results)."""
+        key = fixture_key(query, num_results)
+        os.makedirs(self.fixture_dir, exist_ok=True)
+        with self._lock:
+            with open(os.path.join(self.fixture_dir, f"{key}.html"), 'w', encoding='utf-8') as f:
+                f.write(fetch_result['text'])
+            index = self._load_index()
+            index[key] = {'query': query, 'num_results': num_results, 'source_url': fetch_result['url'],
+                          'recorded_at': datetime.now().isoformat(timespec='seconds')}
+            with open(os.path.join(self.fixture_dir, FIXTURE_INDEX_FILE), 'w') as f:
+                json.dump(index, f, indent=2, sort_keys=True)
+            self.stats['recorded'] += 1
+
+    def fetch_result_pages(self, queries, num_results):
+        results = [self._replay(query, num_results) for query in queries]
+        missing = [i for i, result in enumerate(results) if result is None]
+        self.stats['replayed'] += len(results) - len(missing)
+        if missing and self.record_from is not None:
+            live_results = self.record_from.fetch_result_pages([queries[i] for i in missing], num_results)
+            for i, live_result in zip(missing, live_results):
+                if live_result['status'] == 200:
+                    self.record(queries[i], num_results, live_result)
+                results[i] = live_result
+            missing = []
+        for i in missing:
+            results[i] = _fetch_result(f"fixture://{fixture_key(queries[i], num_results)}", error=f"No recorded fixture in {self.fixture_dir}")
+        self.stats['missing'] += len(missing)
+        return results
+
+    def parse_results(self, text, num_results):
+        return self.parse_func(text, num_results)
+
+    def describe(self):
+        return f"{self.name} ({self.fixture_dir}{', recording' if self.record_from else ''})"
+
+class GoogleCustomSearchBackend(SearchBackend):
+    """
+    Adapter for the Google Custom Search JSON API (needs an API key and a search engine id `cx`).
+    At most 10 results per request are returned by the API.
+    """
+    name = "google_cse"
+
+    def __init__(self, api_key, cx, fetcher):
+        self.api_key = api_key
+        self.cx = cx
+        self.fetcher = fetcher
+
+    def build_url(self, query, num_results):
+        return f"{GOOGLE_CSE_ENDPOINT}?key={quote_plus(self.api_key)}&cx={quote_plus(self.cx)}&q={quote_plus(query)}&num={min(num_results, GOOGLE_CSE_MAX_RESULTS)}"
+
+    def fetch_result_pages(self, queries, num_results):
+        return self.fetcher.fetch_many([self.build_url(query, num_results) for query in queries])
+
+    def parse_results(self, text, num_results):
+        items = json.loads(text).get('items') or []
+        return list(dict.fromkeys(item['link'] for item in items if item.get('link', "").startswith("http")))[:num_results]
+
+    def describe(self):
+        return f"{self.name} (cx={self.cx})"
+
+if __name__ == "__main__":
+    # Records fixtures for a set of queries from the local search stand-in, then replays them offline
+    import argparse
+    import search_standin_server
+    import opportunity_finder
+
+    parser = argparse.ArgumentParser(description="Record search result fixtures from the local stand-in and time an offline replay.")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--fixture-dir", default=DEFAULT_FIXTURE_DIR)
+    args = parser.parse_args()
+
+    console.print(Panel("Search Backends: record & replay", title="[bold magenta]Agent Script[/bold magenta]"))
+    fixture_queries = [f"bybit fixture query {i}" for i in range(args.queries)]
+    server, base_url = search_standin_server.start_in_background(latency_range=(0.05, 0.2))
+    opportunity_finder.SEARCH_SETTINGS.update(backend="fixture", search_base_url=f"{base_url}/search", cache={'enabled': False},
+                                              fetch={'max_in_flight': 8, 'per_host_requests_per_second': 20.0},
+                                              fixtures={'dir': args.fixture_dir, 'record': True})
+    opportunity_finder.search_many(fixture_queries)
+    server.shutdown()
+
+    opportunity_finder.SEARCH_SETTINGS['fixtures'] = {'dir': args.fixture_dir, 'record': False}
+    replay_start = time.perf_counter()
+    replayed = opportunity_finder.search_many(fixture_queries)
+    console.print(f"[green]Replayed {sum(1 for urls in replayed.values() if urls is not None)}/{len(fixture_queries)} queries offline in "
+                  f"{time.perf_counter() - replay_start:.3f}s.[/green]")
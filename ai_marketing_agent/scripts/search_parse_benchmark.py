@@ -0,0 +1,135 @@
+import os
+import json
+import time
+import random
+import argparse
+import statistics
+from html import escape
+from datetime import datetime
+
+# Rich library imports
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+# Sibling scripts: the parsers under test and the stand-in's result page renderer
+import opportunity_finder
+from search_standin_server import render_standin_results_page, standin_result_urls
+
+# Initialize Rich Console
+console = Console()
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), '../logs/benchmarks')
+PAGE_SHAPES = ["redirect", "direct_h3", "div_g_only"]
+
+def _page_chrome(rng, size_kb):
+    """Inline script/style and navigation markup that real results pages carry around the actual results."""
+    parts, size = [], 0
+    while size < size_kb * 1024:
+        kind = rng.random()
+        if kind < 0.4:
+            part = "<script>" + "var s=" + json.dumps("x" * rng.randint(200, 2000)) + ";</script>"
+        elif kind < 0.6:
+            part = "<style>" + ".c%d{margin:%dpx}" % (rng.randint(0, 999), rng.randint(0, 40)) * rng.randint(10, 60) + "</style>"
+        else:
+            part = "<div class=\"nav\">" + "".join(f'<span><a href="https://www.google.com/search?q=related{rng.randint(0, 9999)}">Related</a></span>'
+                                                  for _ in range(rng.randint(3, 15))) + "</div>"
+        parts.append(part)
+        size += len(part)
+    return "".join(parts)
+
+def render_benchmark_page(query, num_results, shape, rng, chrome_kb):
+    """One synthetic results page. `shape` selects which branch of the extraction logic the results exercise."""
+    if shape == "redirect":
+        results_html = render_standin_results_page(query, num_results)
+    else:
+        urls = standin_result_urls(query, num_results)
+        if shape == "direct_h3":
+            blocks = [f'<div class="g"><a href="{escape(url)}"><h3>{escape(query)} {i}</h3></a></div>' for i, url in enumerate(urls)]
+        else: # Result anchors without <h3>: only the div.g fallback finds them
+            blocks = [f'<div class="g tF2Cxc"><div><a href="{escape(url)}"><span>{escape(query)} {i}</span></a></div></div>' for i, url in enumerate(urls)]
+        results_html = f'<html><body><a href="https://www.google.com/preferences">Settings</a><div id="search">{"".join(blocks)}</div></body></html>'
+    head, _, tail = results_html.partition("<body>")
+    return f"{head}<body>{_page_chrome(rng, chrome_kb)}{tail}"
+
+def generate_pages(count=200, num_results=10, chrome_kb=150, seed=0):
+    rng = random.Random(seed)
+    return [{'query': f"crypto query {i}", 'shape': PAGE_SHAPES[i % len(PAGE_SHAPES)],
+             'html': render_benchmark_page(f"crypto query {i}", num_results, PAGE_SHAPES[i % len(PAGE_SHAPES)], rng, chrome_kb)}
+            for i in range(count)]
+
+def benchmark_parser(name, parse_func, pages, num_results, repeat=3):
+    """Best-of-`repeat` wall time for parsing every page, plus per-page latencies from the best pass."""
+    best_seconds, best_latencies, results = None, [], []
+    for _ in range(repeat):
+        latencies, results = [], []
+        start_time = time.perf_counter()
+        for page in pages:
+            page_start = time.perf_counter()
+            results.append(sorted(parse_func(page['html'], num_results)))
+            latencies.append(time.perf_counter() - page_start)
+        elapsed = time.perf_counter() - start_time
+        if best_seconds is None or elapsed < best_seconds:
+            best_seconds, best_latencies = elapsed, latencies
+    latencies_ms = sorted(latency * 1000 for latency in best_latencies)
+    return {
+        'parser': name,
+        'pages': len(pages),
+        'seconds': round(best_seconds, 4),
+        'pages_per_s': round(len(pages) / best_seconds, 1) if best_seconds else 0.0,
+        'p50_ms': round(statistics.median(latencies_ms), 3),
+        'p95_ms': round(latencies_ms[int(0.95 * (len(latencies_ms) - 1))], 3),
+        'results': results,
+    }
+
+def save_results(report, results_dir=RESULTS_DIR):
+    os.makedirs(results_dir, exist_ok=True)
+    path = os.path.join(results_dir, f"search_parse_benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+    return path
+
+def print_results(report):
+    table = Table(title="[bold blue]Search Result Parsing Benchmark[/bold blue]")
+    table.add_column("Parser", style="cyan")
+    table.add_column("Pages/s", justify="right")
+    table.add_column("p50 ms", justify="right")
+    table.add_column("p95 ms", justify="right")
+    table.add_column("Speedup", justify="right")
+    table.add_column("Same URLs as reference", justify="right")
+    for run in report['runs']:
+        table.add_row(run['parser'], f"{run['pages_per_s']:.1f}", f"{run['p50_ms']:.2f}", f"{run['p95_ms']:.2f}",
+                      f"{run['speedup']:.2f}x", f"{run['matching_pages']}/{run['pages']}")
+    console.print(table)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare search result parsers (BeautifulSoup reference vs. streaming) on synthetic results pages.")
+    parser.add_argument("--pages", type=int, default=200, help="Synthetic results pages to parse per pass.")
+    parser.add_argument("--num-results", type=int, default=10)
+    parser.add_argument("--chrome-kb", type=int, default=150, help="Approximate script/style/navigation markup per page, in KB.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing passes; the fastest is reported.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--results-dir", default=RESULTS_DIR)
+    args = parser.parse_args()
+
+    console.print(Panel("Search Result Parsing Benchmark", title="[bold magenta]Agent Script[/bold magenta]"))
+    benchmark_pages = generate_pages(args.pages, args.num_results, args.chrome_kb, args.seed)
+    console.print(f"[blue]Info:[/blue] {len(benchmark_pages)} pages, {sum(len(page['html']) for page in benchmark_pages) / 1e6:.1f} MB of HTML.")
+
+    runs = [benchmark_parser(name, parse_func, benchmark_pages, args.num_results, args.repeat)
+            for name, parse_func in [("beautifulsoup", opportunity_finder.parse_search_results_bs4),
+                                     ("stream", opportunity_finder.parse_search_results_stream)]]
+    reference_seconds, reference_results = runs[0]['seconds'], runs[0]['results']
+    for run in runs:
+        run['speedup'] = round(reference_seconds / run['seconds'], 2) if run['seconds'] else 0.0
+        run['matching_pages'] = sum(1 for ours, expected in zip(run['results'], reference_results) if ours == expected)
+        run['mismatched_queries'] = [page['query'] for page, ours, expected in zip(benchmark_pages, run['results'], reference_results) if ours != expected]
+        del run['results']
+
+    benchmark_report = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'corpus': {'pages': args.pages, 'num_results': args.num_results, 'chrome_kb': args.chrome_kb, 'seed': args.seed, 'shapes': PAGE_SHAPES},
+        'runs': runs,
+    }
+    print_results(benchmark_report)
+    console.print(f"[green]Results saved to[/green] {save_results(benchmark_report, args.results_dir)}")
@@ -0,0 +1,115 @@
+import time
+import random
+import hashlib
+import argparse
+import threading
+from html import escape
+from urllib.parse import urlsplit, parse_qs, quote
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Rich library imports
+from rich.console import Console
+from rich.panel import Panel
+
+# Initialize Rich Console
+console = Console()
+
+STANDIN_DOMAINS = ["cryptoblog.example", "coinforum.example", "defi-community.example", "tradersnews.example", "web3writers.example"]
+STANDIN_PATHS = ["blog/{slug}", "forum/thread/{slug}", "write-for-us", "community/{slug}", "news/{slug}", "guest-post-guidelines"]
+
+def standin_result_urls(query, num_results):
+    """Deterministic fake result URLs for a query (same query -> same URLs)."""
+    rng = random.Random(hashlib.sha256(query.encode('utf-8')).hexdigest())
+    slug = "-".join(query.lower().split())[:40] or "home"
+    return [f"https://{rng.choice(STANDIN_DOMAINS)}/{rng.choice(STANDIN_PATHS).format(slug=slug)}?id={rng.randint(1, 99999)}" for _ in range(num_results)]
+
+def render_standin_results_page(query, num_results):
+    """HTML shaped like a Google results page: '/url?q=' redirect anchors wrapping an <h3>, inside div.g blocks."""
+    results = "".join(
+        f'<div class="g"><a href="/url?q={quote(url, safe=":/?=")}&amp;sa=U&amp;ved=0"><h3>Result {i + 1} for {escape(query)}</h3></a>'
+        f'<div class="snippet">Snippet text about {escape(query)}.</div></div>'
+        for i, url in enumerate(standin_result_urls(query, num_results))
+    )
+    return (f"<!doctype html><html><head><title>{escape(query)} - Search</title></head><body>"
+            f'<a href="https://www.google.com/preferences">Settings</a><div id="search">{results}</div></body></html>')
+
+class StandInSearchHandler(BaseHTTPRequestHandler):
+    server_version = "SearchStandIn/1.0"
+
+    def do_GET(self):
+        settings = self.server.standin_settings
+        parts = urlsplit(self.path)
+        if parts.path != "/search":
+            self.send_error(404)
+            return
+        with self.server.standin_lock:
+            self.server.standin_stats['requests'] += 1
+            throttle = self.server.standin_rng.random() < settings['throttle_probability']
+            latency = self.server.standin_rng.uniform(*settings['latency_range'])
+        if throttle:
+            with self.server.standin_lock:
+                self.server.standin_stats['throttled'] += 1
+            self.send_response(429)
+            self.send_header("Retry-After", str(settings['retry_after_seconds']))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        time.sleep(latency)
+        query_params = parse_qs(parts.query)
+        query = query_params.get("q", [""])[0]
+        num_results = int(query_params.get("num", ["10"])[0])
+        body = render_standin_results_page(query, num_results).encode('utf-8')
+        etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+        if self.headers.get("If-None-Match") == etag:
+            with self.server.standin_lock:
+                self.server.standin_stats['not_modified'] += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass # Keep benchmark output clean
+
+def create_standin_server(host="127.0.0.1", port=0, latency_range=(0.05, 0.3), throttle_probability=0.0, retry_after_seconds=1, seed=None):
+    """
+    Local stand-in for the search engine, for testing the opportunity finder without touching google.com.
+    Point `opportunity_finder.search_base_url` at f"http://{host}:{port}/search" to use it.
+    """
+    server = ThreadingHTTPServer((host, port), StandInSearchHandler)
+    server.daemon_threads = True
+    server.standin_settings = {'latency_range': latency_range, 'throttle_probability': throttle_probability, 'retry_after_seconds': retry_after_seconds}
+    server.standin_rng = random.Random(seed)
+    server.standin_lock = threading.Lock()
+    server.standin_stats = {'requests': 0, 'throttled': 0, 'not_modified': 0}
+    return server
+
+def start_in_background(**kwargs):
+    """Starts a stand-in server on a free port in a daemon thread. Returns (server, base_url); call server.shutdown() when done."""
+    server = create_standin_server(**kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Google-like search stand-in for opportunity finder tests and benchmarks.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--throttle", type=float, default=0.0, help="Probability of answering 429 with Retry-After.")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with 429 responses.")
+    args = parser.parse_args()
+
+    standin = create_standin_server(port=args.port, throttle_probability=args.throttle, retry_after_seconds=args.retry_after)
+    console.print(Panel(f"Serving fake search results at http://127.0.0.1:{args.port}/search\n"
+                        f"Set opportunity_finder.search_base_url to this URL in settings.yaml. Ctrl+C to stop.",
+                        title="[bold magenta]Search Stand-In[/bold magenta]"))
+    try:
+        standin.serve_forever()
+    except KeyboardInterrupt:
+        standin.shutdown()
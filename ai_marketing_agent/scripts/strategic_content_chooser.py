@@ -1,6 +1,10 @@
 import os
+import re
 import csv
 import random
+from functools import lru_cache
+
+import numpy as np
 
 # Rich library imports
 from rich.console import Console
@@ -81,28 +85,129 @@ def load_trending_topics():
         return {}
     return trends
 
-def choose_next_article(ideas, performance_data, trending_topics):
+TREND_SCORE_WEIGHT = 2.5
+EXPLORATION_NOISE = 8.0 # Upper bound of the random bonus that keeps the choice from always being the same idea
+_IDEA_SEPARATOR = "\x00" # Cannot occur inside an idea, so no trend match can span two ideas
+
+def trie_pattern(words):
+    """
+    Regex source matching any of `words`, factored into a character trie (e.g. "btc", "btc etf" -> "btc(?: etf)?").
+    Siblings never share a first character, so matching never backtracks across branches and optional
+    suffixes are greedy: at any position the longest word wins. Far faster in `re` than a flat alternation.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True # End-of-word marker
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char != '']
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return '(?:' + body + ')?' if '' in node else body
+
+    return build(trie)
+
+@lru_cache(maxsize=8)
+def compile_trend_matcher(trend_items):
+    """
+    Compiles trending topics (a tuple of (topic, trend_score) pairs) into one regex plus per-topic weights.
+    The pattern is a lookahead over a trie of all topics, so a single findall pass over all ideas reports,
+    at every position, the longest topic starting there (or the idea separator). Any shorter topic starting at the
+    same position is a prefix of that match, so each match also credits the topics in its row of `prefix_matrix`.
+    Together this reproduces the `topic.lower() in idea.lower()` test for every topic.
+    Returns (pattern or None, {topic: id, separator: -1}, topic_weights array, prefix_matrix, weight added to every idea).
+    """
+    weights = {}
+    for topic, trend_score in trend_items:
+        key = topic.lower()
+        weights[key] = weights.get(key, 0.0) + trend_score * TREND_SCORE_WEIGHT # Topics differing only in case both count
+    always_weight = weights.pop("", 0.0) # An empty topic is "in" every idea
+    if not weights:
+        return None, {}, np.zeros(0), np.zeros((0, 0), dtype=np.int64), always_weight
+
+    topics = sorted(weights, key=len, reverse=True)
+    topic_index = {topic: i for i, topic in enumerate(topics)}
+    topic_weights = np.array([weights[topic] for topic in topics], dtype=np.float64)
+    prefix_rows = [[topic_index[other] for other in topics if topic.startswith(other)] for topic in topics]
+    prefix_matrix = np.full((len(topics), max(len(row) for row in prefix_rows)), -1, dtype=np.int64) # -1 pads short rows
+    for i, row in enumerate(prefix_rows):
+        prefix_matrix[i, :len(row)] = row
+    topic_index[_IDEA_SEPARATOR] = -1
+    pattern = re.compile("(?=(" + trie_pattern(topics + [_IDEA_SEPARATOR]) + "))")
+    return pattern, topic_index, topic_weights, prefix_matrix, always_weight
+
+def trend_scores(ideas, trending_topics):
+    """Vector of summed trend bonuses per idea, computed with one regex pass over all (lowercased) ideas."""
+    pattern, topic_index, topic_weights, prefix_matrix, always_weight = compile_trend_matcher(tuple(trending_topics.items()))
+    scores = np.full(len(ideas), always_weight, dtype=np.float64)
+    if pattern is None or not ideas:
+        return scores
+
+    found = pattern.findall(_IDEA_SEPARATOR.join(ideas).lower())
+    match_topics = np.fromiter(map(topic_index.__getitem__, found), dtype=np.int64, count=len(found))
+    match_ideas = np.cumsum(match_topics == -1) # Separators found so far = index of the idea containing the match
+    is_topic = match_topics >= 0
+    if not is_topic.any():
+        return scores
+
+    credited = prefix_matrix[match_topics[is_topic]]
+    credited_ideas = np.broadcast_to(match_ideas[is_topic][:, None], credited.shape)
+    valid = credited >= 0
+    topic_count = len(topic_weights)
+    # Each topic counts once per idea, however often it occurs
+    pair_codes = np.sort(credited_ideas[valid] * topic_count + credited[valid])
+    unique_pairs = pair_codes[np.concatenate(([True], pair_codes[1:] != pair_codes[:-1]))]
+    scores += np.bincount(unique_pairs // topic_count, weights=topic_weights[unique_pairs % topic_count], minlength=len(ideas))
+    return scores
+
+def rank_ideas(ideas, performance_data, trending_topics, top_k=None, seed=None):
+    """
+    Scores every idea and returns a list of (idea_text, score) tuples, best first (only the best `top_k` if given).
+    Ideas without performance data get a flat novelty bonus; ideas with data score higher the fewer conversions
+    and views they have. Each trending topic contained in the idea adds trend_score * 2.5, plus a random
+    exploration bonus drawn from a NumPy generator seeded with `seed` (None = fresh entropy).
+    """
     if not ideas:
-        return "Error: No content ideas available to choose from." # Plain error string
+        return []
+    ideas = list(ideas)
+    idea_count = len(ideas)
 
-    scored_ideas = []
-    for idea_text in ideas:
-        score = 0
+    has_perf = np.zeros(idea_count, dtype=bool)
+    conversions = np.zeros(idea_count, dtype=np.float64)
+    views = np.zeros(idea_count, dtype=np.float64)
+    for i, idea_text in enumerate(ideas):
         perf = performance_data.get(idea_text)
         if perf:
-            score += (30 - perf.get('conversions', 0)) * 0.5
-            score += (10000 - perf.get('views', 0)) / 2000.0
-        else:
-            score += 15
+            has_perf[i] = True
+            conversions[i] = perf.get('conversions', 0)
+            views[i] = perf.get('views', 0)
 
-        for topic, trend_score in trending_topics.items():
-            if topic.lower() in idea_text.lower():
-                score += trend_score * 2.5
+    scores = np.where(has_perf, (30 - conversions) * 0.5 + (10000 - views) / 2000.0, 15.0)
+    scores += trend_scores(ideas, trending_topics)
+    scores += np.random.default_rng(seed).uniform(0, EXPLORATION_NOISE, idea_count)
+    scores = np.round(scores, 2)
 
-        score += random.uniform(0, 8)
-        scored_ideas.append((idea_text, round(score, 2)))
+    if top_k is not None and top_k < idea_count:
+        if top_k <= 0:
+            return []
+        # Partial sort: only ideas scoring at least the k-th best value get fully sorted
+        kth_best = -np.partition(-scores, top_k - 1)[top_k - 1]
+        candidates = np.flatnonzero(scores >= kth_best)
+    else:
+        candidates = np.arange(idea_count)
+    # Best score first; ties keep the ideas' original order
+    order = candidates[np.lexsort((candidates, -scores[candidates]))][:top_k]
+    return [(ideas[i], float(scores[i])) for i in order]
+
+def choose_next_article(ideas, performance_data, trending_topics, seed=None):
+    if not ideas:
+        return "Error: No content ideas available to choose from." # Plain error string
 
-    scored_ideas.sort(key=lambda x: x[1], reverse=True)
+    scored_ideas = rank_ideas(ideas, performance_data, trending_topics, top_k=5, seed=seed)
 
     if scored_ideas:
         table = Table(title="[bold blue]Top Scored Content Ideas[/bold blue]", show_lines=True)
@@ -110,7 +215,7 @@ def choose_next_article(ideas, performance_data, trending_topics):
         table.add_column("Score", style="cyan", no_wrap=True)
         table.add_column("Idea", style="magenta")
 
-        for i, (idea_text, idea_score) in enumerate(scored_ideas[:5]): # Show top 5
+        for i, (idea_text, idea_score) in enumerate(scored_ideas): # Show top 5
             table.add_row(str(i+1), f"{idea_score:.2f}", idea_text)
         console.print(table)
         return scored_ideas[0][0]
@@ -0,0 +1,122 @@
+import os
+import hashlib
+import mimetypes
+import threading
+
+import requests
+
+# Rich library imports
+from rich.console import Console
+
+# Sibling script: pooled requests.Session factory
+from http_fetcher import build_http_session
+
+# Initialize Rich Console
+console = Console()
+
+WORDPRESS_USER_AGENT = "AIMarketingAgent/1.0 (WordPress REST)"
+MEDIA_LEDGER_PLATFORM = "wordpress_media" # Uploaded media are recorded in the posting ledger under this platform name
+
+class WordPressError(Exception):
+    """A WordPress REST API call failed. `status` is the HTTP status, or None when no response arrived (timeout, connection error)."""
+    def __init__(self, message, status=None, retry_after=None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+_shared_session = None
+_shared_session_lock = threading.Lock()
+
+def get_shared_session(pool_maxsize=16):
+    """One pooled, keep-alive session for every WordPress site, so repeated posts reuse open connections."""
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            _shared_session = build_http_session(pool_connections=64, pool_maxsize=pool_maxsize, user_agent=WORDPRESS_USER_AGENT)
+        return _shared_session
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class WordPressSite:
+    """
+    REST API client for one WordPress site, authenticated with an application password (HTTP Basic).
+    At most `max_concurrent` requests go to the site at once, however many threads publish through it.
+    Media are uploaded once per site: the returned media ID is kept (and recorded in `ledger`, if given)
+    and reused for every later post with the same file content.
+    """
+    def __init__(self, site_url, username, app_password, session=None, max_concurrent=2, timeout=30, ledger=None, name=None):
+        self.site_url = site_url.rstrip("/")
+        self.name = name or self.site_url
+        self.api_url = f"{self.site_url}/wp-json/wp/v2"
+        self.auth = (username, app_password)
+        self.session = session or get_shared_session()
+        self.timeout = timeout
+        self.ledger = ledger
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._media_ids = {}  # file sha256 -> {'id', 'source_url'}
+        self._media_locks = {}
+        self._media_lock = threading.Lock()
+
+    def _request(self, method, path, **kwargs):
+        """One API call; returns the decoded JSON body or raises WordPressError."""
+        with self._slots:
+            try:
+                response = self.session.request(method, f"{self.api_url}/{path}", auth=self.auth, timeout=self.timeout, **kwargs)
+            except requests.RequestException as e:
+                raise WordPressError(f"{self.name}: {type(e).__name__}: {e}") from e
+        if response.status_code >= 400:
+            try:
+                message = response.json().get('message') or response.text[:200]
+            except ValueError:
+                message = response.text[:200]
+            raise WordPressError(f"{self.name}: HTTP {response.status_code}: {message}", status=response.status_code,
+                                 retry_after=response.headers.get("Retry-After"))
+        return response.json()
+
+    def create_post(self, title, content_html, status="publish", featured_media=None, categories=None, tags=None):
+        """Creates a post and returns the API's post object (with 'id' and 'link')."""
+        body = {"title": title, "content": content_html, "status": status}
+        if featured_media:
+            body["featured_media"] = featured_media
+        if categories:
+            body["categories"] = categories
+        if tags:
+            body["tags"] = tags
+        return self._request("POST", "posts", json=body)
+
+    def find_post_by_title(self, title, recent_posts=20):
+        """The most recent post (any status) titled exactly `title`, or None. Needs a user allowed to edit posts."""
+        posts = self._request("GET", "posts", params={"search": title, "status": "publish,future,draft,pending,private",
+                                                      "context": "edit", "per_page": recent_posts, "_fields": "id,link,title"})
+        return next((post for post in posts if post.get('title', {}).get('raw', '').strip() == (title or '').strip()), None)
+
+    def upload_media(self, path):
+        """Uploads a file to the media library, or returns the earlier upload of the same content: {'id', 'source_url'}."""
+        file_hash = file_sha256(path)
+        with self._media_lock:
+            file_lock = self._media_locks.setdefault(file_hash, threading.Lock())
+        with file_lock: # Concurrent posts with the same image wait for one upload instead of each uploading it
+            if file_hash in self._media_ids:
+                return self._media_ids[file_hash]
+            entry = self.ledger.lookup(file_hash, MEDIA_LEDGER_PLATFORM, self.site_url) if self.ledger else None
+            if entry and entry['status'] == 'published':
+                media = {'id': int(entry['remote_id']), 'source_url': entry['remote_url']}
+            else:
+                with open(path, 'rb') as f:
+                    data = f.read()
+                file_name = os.path.basename(path)
+                uploaded = self._request("POST", "media", data=data, headers={
+                    "Content-Disposition": f'attachment; filename="{file_name}"',
+                    "Content-Type": mimetypes.guess_type(file_name)[0] or "application/octet-stream"})
+                media = {'id': uploaded['id'], 'source_url': uploaded.get('source_url')}
+                if self.ledger:
+                    self.ledger.reserve(file_hash, MEDIA_LEDGER_PLATFORM, self.site_url, file_name)
+                    self.ledger.mark_published(file_hash, MEDIA_LEDGER_PLATFORM, self.site_url, media['id'], media['source_url'])
+                console.print(f"[blue]WORDPRESS_INFO:[/blue] Uploaded '{file_name}' to {self.name} as media {media['id']}.")
+            self._media_ids[file_hash] = media
+            return media
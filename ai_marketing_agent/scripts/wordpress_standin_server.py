@@ -0,0 +1,157 @@
+import json
+import time
+import base64
+import random
+import argparse
+import threading
+from urllib.parse import urlsplit, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Rich library imports
+from rich.console import Console
+from rich.panel import Panel
+
+# Initialize Rich Console
+console = Console()
+
+STANDIN_USERNAME = "agent"
+STANDIN_APP_PASSWORD = "abcd efgh ijkl mnop qrst uvwx"
+
+class StandInWordPressHandler(BaseHTTPRequestHandler):
+    """
+    Serves the WordPress REST endpoints the agent uses (create/search posts, upload media) for any number of
+    sites, each under its own path prefix: http://host:port/<site>/wp-json/wp/v2/...
+    """
+    server_version = "WordPressStandIn/1.0"
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, method):
+        server = self.server
+        parts = urlsplit(self.path)
+        site, _, route = parts.path.strip("/").partition("/wp-json/wp/v2/")
+        raw_body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if not site or route not in ("posts", "media"):
+            self._send_json(404, {"code": "rest_no_route", "message": "No route was found matching the URL and request method."})
+            return
+        expected_auth = "Basic " + base64.b64encode(f"{STANDIN_USERNAME}:{STANDIN_APP_PASSWORD}".encode()).decode()
+        if self.headers.get("Authorization") != expected_auth:
+            self._send_json(401, {"code": "rest_not_logged_in", "message": "You are not currently logged in."})
+            return
+
+        with server.standin_lock:
+            server.standin_stats['requests'] += 1
+            site_stats = server.standin_sites.setdefault(site, {'in_flight': 0, 'max_in_flight': 0, 'posts': [], 'media': 0})
+            site_stats['in_flight'] += 1
+            site_stats['max_in_flight'] = max(site_stats['max_in_flight'], site_stats['in_flight'])
+            fail = server.standin_rng.random() < server.standin_settings['fail_probability']
+            latency = server.standin_rng.uniform(*server.standin_settings['latency_range'])
+        try:
+            time.sleep(latency)
+            if fail:
+                with server.standin_lock:
+                    server.standin_stats['failures_injected'] += 1
+                self._send_json(503, {"code": "service_unavailable", "message": "Temporarily unavailable."})
+                return
+            with server.standin_lock:
+                if route == "media" and method == "POST":
+                    site_stats['media'] += 1
+                    media_id = 1000 + site_stats['media']
+                    self._send_json(201, {"id": media_id, "source_url": f"https://{site}.example/wp-content/uploads/{media_id}.png"})
+                elif route == "posts" and method == "POST":
+                    body = json.loads(raw_body or b"{}")
+                    post = {"id": len(site_stats['posts']) + 1, "status": body.get("status", "draft"), "featured_media": body.get("featured_media", 0),
+                            "title": {"raw": body.get("title", ""), "rendered": body.get("title", "")}}
+                    post["link"] = f"https://{site}.example/?p={post['id']}"
+                    site_stats['posts'].append(post)
+                    self._send_json(201, post)
+                elif route == "posts" and method == "GET":
+                    search = parse_qs(parts.query).get("search", [""])[0]
+                    self._send_json(200, [post for post in reversed(site_stats['posts']) if search in post["title"]["raw"]])
+                else:
+                    self._send_json(404, {"code": "rest_no_route", "message": "No route was found matching the URL and request method."})
+        finally:
+            with server.standin_lock:
+                site_stats['in_flight'] -= 1
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def log_message(self, format, *args):
+        pass # Keep test output clean
+
+def create_standin_server(host="127.0.0.1", port=0, latency_range=(0.05, 0.15), fail_probability=0.0, seed=None):
+    """
+    Local stand-in for a network of WordPress sites, for testing the WordPress publisher without real blogs.
+    Authenticates with STANDIN_USERNAME / STANDIN_APP_PASSWORD and records, per site, the posts, media uploads and
+    the highest number of requests it had in flight at once.
+    """
+    server = ThreadingHTTPServer((host, port), StandInWordPressHandler)
+    server.daemon_threads = True
+    server.standin_settings = {'latency_range': latency_range, 'fail_probability': fail_probability}
+    server.standin_rng = random.Random(seed)
+    server.standin_lock = threading.Lock()
+    server.standin_sites = {}
+    server.standin_stats = {'requests': 0, 'failures_injected': 0}
+    return server
+
+def start_in_background(**kwargs):
+    """Starts a stand-in server on a free port in a daemon thread. Returns (server, base_url); call server.shutdown() when done."""
+    server = create_standin_server(**kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+if __name__ == "__main__":
+    # Publishes a batch of articles with an image to a network of stand-in sites, serially and then concurrently
+    import os
+    import tempfile
+    import cv2
+    import numpy
+    from concurrent.futures import ThreadPoolExecutor
+    import post_scheduler
+
+    parser = argparse.ArgumentParser(description="Local WordPress stand-in; compares serial and concurrent multi-site publishing.")
+    parser.add_argument("--sites", type=int, default=8)
+    parser.add_argument("--articles", type=int, default=10)
+    parser.add_argument("--per-site", type=int, default=2, help="max_concurrent requests per site.")
+    args = parser.parse_args()
+
+    console.print(Panel("WordPress multi-site publishing against a local stand-in", title="[bold magenta]Agent Script[/bold magenta]"))
+    os.environ["WP_STANDIN_APP_PASSWORD"] = STANDIN_APP_PASSWORD
+    work_dir = tempfile.mkdtemp(prefix="wp_standin_")
+    image_path = os.path.join(work_dir, "banner.png")
+    cv2.imwrite(image_path, numpy.random.default_rng(0).integers(0, 256, (1600, 2400, 3), dtype=numpy.uint8)) # Resized to a variant before upload
+
+    for mode in ("serial", "concurrent"):
+        standin, standin_url = start_in_background(seed=0)
+        post_scheduler._wordpress_sites.clear()
+        post_scheduler.POSTING_LEDGER_SETTINGS['path'] = os.path.join(work_dir, f"ledger_{mode}.sqlite3")
+        site_configs = [{'name': f"site{i}", 'site_url': f"{standin_url}/site{i}"} for i in range(args.sites)]
+        standin_settings = {'posting_platforms': {'wordpress': {
+            'enabled': True, 'username': STANDIN_USERNAME, 'password_env_var': "WP_STANDIN_APP_PASSWORD",
+            'sites': site_configs if mode == "concurrent" else site_configs[:1], 'client': {'max_concurrent_per_site': args.per_site}}}}
+        articles = [(f"Stand-in article {i}", f"<p>Article {i}</p>") for i in range(args.articles)]
+        start_time = time.perf_counter()
+        if mode == "serial": # The old shape of the problem: one site at a time, one article at a time
+            for site_config in site_configs:
+                standin_settings['posting_platforms']['wordpress']['sites'] = [site_config]
+                for title, content_html in articles:
+                    post_scheduler.post_to_wordpress(standin_settings, title, content_html, image_path_for_post=image_path)
+        else:
+            with ThreadPoolExecutor(max_workers=args.articles) as executor:
+                list(executor.map(lambda article: post_scheduler.post_to_wordpress(standin_settings, *article, image_path_for_post=image_path), articles))
+        elapsed = time.perf_counter() - start_time
+        sites = standin.standin_sites.values()
+        console.print(f"[green]{mode}:[/green] {sum(len(site['posts']) for site in sites)} posts on {len(sites)} sites in {elapsed:.2f}s; "
+                      f"media uploads per site: {max(site['media'] for site in sites)}; max in flight per site: {max(site['max_in_flight'] for site in sites)}")
+        standin.shutdown()
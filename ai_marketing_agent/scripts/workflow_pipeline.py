@@ -0,0 +1,158 @@
+import os
+import json
+import time
+import hashlib
+from datetime import datetime
+
+# Rich library imports
+from rich.console import Console
+from rich.rule import Rule
+from rich.table import Table
+
+# Initialize Rich Console
+console = Console()
+
+CHECKPOINT_DIR = os.path.join(os.path.dirname(__file__), '../checkpoints')
+
+class PipelineStep:
+    """
+    One declared step of the agent workflow.
+
+    `inputs` name the context values the step depends on. Names starting with "config." are looked up in the
+    settings dict (e.g. "config.agent_workflow.enable_autonomous_posting"). Their content hash decides whether a
+    checkpointed result can be reused. `outputs` name the context values the step produces.
+    Non-cacheable steps (cheap loaders whose job is to observe files on disk) always run.
+    """
+    def __init__(self, name, title, func, inputs=(), outputs=(), cacheable=True, version=1):
+        self.name = name
+        self.title = title
+        self.func = func
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.cacheable = cacheable
+        self.version = version # Bump when the step's logic changes so old checkpoints are not reused
+
+def content_hash(value):
+    """Stable SHA-256 of any JSON-serialisable value (dict key order does not matter)."""
+    encoded = json.dumps(value, sort_keys=True, default=str, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+def resolve_input(context, input_name):
+    if input_name.startswith("config."):
+        value = context.get('config', {})
+        for key in input_name[len("config."):].split('.'):
+            value = value.get(key) if isinstance(value, dict) else None
+        return value
+    return context.get(input_name)
+
+def load_checkpoints(pipeline_name, checkpoint_dir=CHECKPOINT_DIR):
+    path = os.path.join(checkpoint_dir, f"{pipeline_name}.json")
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r') as f:
+            return json.load(f).get('steps', {})
+    except Exception as e:
+        console.print(f"[yellow]PIPELINE WARN:[/yellow] Could not read checkpoint file {path}: {e}. Starting without checkpoints.")
+        return {}
+
+def save_checkpoints(pipeline_name, step_records, checkpoint_dir=CHECKPOINT_DIR):
+    """Writes all step records atomically, so a crash mid-write never leaves a corrupt checkpoint file."""
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    path = os.path.join(checkpoint_dir, f"{pipeline_name}.json")
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump({'pipeline': pipeline_name, 'updated_at': datetime.now().isoformat(timespec='seconds'), 'steps': step_records}, f, indent=2, default=str)
+        os.replace(tmp_path, path)
+    except (IOError, TypeError, ValueError) as e:
+        console.print(f"[yellow]PIPELINE WARN:[/yellow] Could not save checkpoints to {path}: {e}")
+
+def clear_checkpoints(pipeline_name, checkpoint_dir=CHECKPOINT_DIR):
+    path = os.path.join(checkpoint_dir, f"{pipeline_name}.json")
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        console.print(f"[yellow]PIPELINE WARN:[/yellow] Could not clear checkpoints at {path}: {e}")
+
+def run_pipeline(steps, context, pipeline_name="agent_workflow", checkpoint_dir=CHECKPOINT_DIR, fresh=False):
+    """
+    Runs `steps` in order against the shared `context` dict.
+
+    Each step's inputs are content-hashed. A cacheable step whose input hash (and version) matches its last
+    successful checkpoint is not executed; its persisted outputs are loaded into the context instead. Because
+    outputs feed later steps' inputs, a step that re-runs with a different result automatically invalidates
+    every downstream step that depends on it, while unaffected steps keep reusing their checkpoints.
+
+    A step function receives the context and returns a dict of outputs. Returning `'_checkpoint': False` in that
+    dict (e.g. when it fell back to defaults after an error) applies the outputs without persisting them.
+    Exceptions are reported and the pipeline continues, matching the agent's per-step error handling.
+    Checkpoints only span one attempt: once every step has succeeded (ran and was checkpointed, or was reused),
+    they are cleared, so the next run starts from scratch and resuming only happens after a failure.
+    Returns a list of per-step report dicts.
+    """
+    step_records = {} if fresh else load_checkpoints(pipeline_name, checkpoint_dir)
+    report = []
+
+    for step in steps:
+        console.print(Rule(f"[b bright_cyan]{step.title}[/b bright_cyan]"))
+        input_values = {name: resolve_input(context, name) for name in step.inputs}
+        input_hash = content_hash({'version': step.version, 'inputs': input_values})
+        record = step_records.get(step.name)
+
+        if step.cacheable and record and record.get('input_hash') == input_hash:
+            context.update(record.get('outputs', {}))
+            console.print(f"[green]PIPELINE:[/green] Inputs unchanged (hash {input_hash[:12]}); reusing checkpoint from {record.get('completed_at', 'unknown time')}.")
+            report.append({'step': step.name, 'status': 'reused', 'seconds': 0.0, 'output_hash': record.get('output_hash', '')})
+            continue
+
+        start_time = time.perf_counter()
+        try:
+            outputs = step.func(context) or {}
+        except Exception as e:
+            console.print(f"[red]ERROR in pipeline step '{step.name}':[/red] {e}")
+            report.append({'step': step.name, 'status': 'failed', 'seconds': time.perf_counter() - start_time, 'output_hash': ''})
+            continue
+        elapsed = time.perf_counter() - start_time
+
+        should_checkpoint = outputs.pop('_checkpoint', True)
+        context.update(outputs)
+        declared_outputs = {name: outputs.get(name) for name in step.outputs}
+        output_hash = content_hash(declared_outputs)
+
+        if step.cacheable and should_checkpoint:
+            step_records[step.name] = {
+                'input_hash': input_hash,
+                'output_hash': output_hash,
+                'outputs': declared_outputs,
+                'completed_at': datetime.now().isoformat(timespec='seconds'),
+                'seconds': round(elapsed, 3),
+            }
+            save_checkpoints(pipeline_name, step_records, checkpoint_dir)
+            status = 'ran'
+        elif step.cacheable:
+            step_records.pop(step.name, None) # Never resume from an incomplete result
+            save_checkpoints(pipeline_name, step_records, checkpoint_dir)
+            status = 'ran (not checkpointed)'
+        else:
+            status = 'ran (always)'
+        report.append({'step': step.name, 'status': status, 'seconds': elapsed, 'output_hash': output_hash})
+
+    if all(entry['status'] in ('reused', 'ran', 'ran (always)') for entry in report):
+        clear_checkpoints(pipeline_name, checkpoint_dir)
+        console.print("[green]PIPELINE:[/green] Every step succeeded; checkpoints cleared so the next run starts fresh.")
+    return report
+
+def print_pipeline_report(report):
+    table = Table(title="[bold blue]Workflow Step Summary[/bold blue]", show_lines=False)
+    table.add_column("Step", style="cyan")
+    table.add_column("Status", no_wrap=True)
+    table.add_column("Seconds", justify="right", no_wrap=True)
+    table.add_column("Output hash", style="dim", no_wrap=True)
+    status_styles = {'reused': "green", 'failed': "red"}
+    for entry in report:
+        style = status_styles.get(entry['status'], "white")
+        table.add_row(entry['step'], f"[{style}]{entry['status']}[/{style}]", f"{entry['seconds']:.2f}", entry['output_hash'][:12])
+    console.print(table)